@@ -1,25 +1,150 @@
 """OGB Dev Environment."""
+import asyncio
 import logging
+import os
+import pickle
+import time
 from datetime import timedelta
-from homeassistant.core import HomeAssistant, callback
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr, area_registry as ar
+from homeassistant.helpers.entity import CONTEXT_RECENT_TIME_SECONDS
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.restore_state import RestoreEntity
+import homeassistant.helpers.config_validation as cv
+import homeassistant.util.dt as dt_util
 from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
-from .const import DOMAIN
-from .devices import TEST_DEVICES
+from .const import (
+    DOMAIN,
+    SIMULATION_INTERVAL,
+    CONF_SIMULATION_EXECUTOR,
+    EXECUTOR_EVENT_LOOP,
+    EXECUTOR_PROCESS,
+    WORKER_POOL,
+    CONF_PHOTOPERIOD_START,
+    DEFAULT_PHOTOPERIOD_START,
+    CONF_CONTROLLER_ALGORITHM,
+    CONF_TENT_PROFILE,
+    PROFILES_FILE,
+    CATALOG_FILE,
+    SNAPSHOT_DIR,
+    PLATFORMS,
+    CONF_PLATFORMS,
+    CONF_DEVICE_GROUPS,
+    CONF_STATE_WRITE_WINDOW,
+    CONF_STATE_WRITE_INTERVAL,
+    CONTROL_DEVICES,
+)
+from .catalog import load_catalog
+from .controllers import GAINS, MODE_OFF, MODE_PID
+from .devices import TEST_DEVICES, CONTROLLERS, DEVICE_GROUPS
 from .environment import EnvironmentSimulator
+from .faults import FAULTS
+from .latency import LatencyTracker, new_correlation_id
+from .profiles import TENT_PROFILES, load_profiles, tent_profile
+from .snapshot import Snapshot, fork, run_branches
+from .loadgen import LoadGenerator, DISTRIBUTIONS, DISTRIBUTION_UNIFORM
+from .state import DeviceStateTable
+from .worker import SimulationWorkerPool
+from .writer import StateWriter, async_schedule_write
 
 _LOGGER = logging.getLogger(__name__)
 
 STORAGE_VERSION = 1
 STORAGE_KEY = DOMAIN
 
+SERVICE_FAST_FORWARD = "fast_forward"
+SERVICE_RUN_LOAD_TEST = "run_load_test"
+SERVICE_INJECT_FAULTS = "inject_faults"
+SERVICE_CLEAR_FAULTS = "clear_faults"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE_SNAPSHOT = "restore_snapshot"
+SERVICE_FORK_SNAPSHOT = "fork_snapshot"
+SERVICES = (
+    SERVICE_FAST_FORWARD,
+    SERVICE_RUN_LOAD_TEST,
+    SERVICE_INJECT_FAULTS,
+    SERVICE_CLEAR_FAULTS,
+    SERVICE_SNAPSHOT,
+    SERVICE_RESTORE_SNAPSHOT,
+    SERVICE_FORK_SNAPSHOT,
+)
+
+FAST_FORWARD_SCHEMA = vol.Schema({
+    vol.Required("steps"): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+    vol.Optional("entry_id"): cv.string,
+})
+
+RUN_LOAD_TEST_SCHEMA = vol.Schema({
+    vol.Required("rate"): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10000)),
+    vol.Required("duration"): vol.All(vol.Coerce(float), vol.Range(min=1, max=86400)),
+    vol.Optional("seed"): vol.Coerce(int),
+    vol.Optional("weights"): {cv.string: vol.All(vol.Coerce(float), vol.Range(min=0))},
+    vol.Optional("distribution", default=DISTRIBUTION_UNIFORM): vol.In(DISTRIBUTIONS),
+    vol.Optional("mean", default=50.0): vol.Coerce(float),
+    vol.Optional("sigma", default=25.0): vol.Coerce(float),
+    vol.Optional("entry_id"): cv.string,
+})
+
+FAULT_SCHEMA = vol.Schema({
+    vol.Required("fault"): vol.In(FAULTS),
+    vol.Required("target"): cv.string,
+    vol.Optional("field", default="power"): cv.string,
+    vol.Optional("value"): vol.Any(vol.Coerce(float), cv.boolean),
+    vol.Optional("start", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional("duration"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional("rate"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+})
+
+INJECT_FAULTS_SCHEMA = vol.Schema({
+    vol.Required("faults"): vol.All(cv.ensure_list, [FAULT_SCHEMA]),
+    vol.Optional("entry_id"): cv.string,
+})
+
+CLEAR_FAULTS_SCHEMA = vol.Schema({
+    vol.Optional("ids"): vol.All(cv.ensure_list, [vol.Coerce(int)]),
+    vol.Optional("entry_id"): cv.string,
+})
+
+SNAPSHOT_SCHEMA = vol.Schema({
+    vol.Required("name"): cv.string,
+    vol.Optional("path"): cv.string,
+    vol.Optional("entry_id"): cv.string,
+})
+
+RESTORE_SNAPSHOT_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Optional("name"): cv.string,
+        vol.Optional("path"): cv.string,
+        vol.Optional("entry_id"): cv.string,
+    }),
+    cv.has_at_least_one_key("name", "path"),
+)
+
+BRANCH_SCHEMA = vol.Schema({
+    vol.Optional("name"): cv.string,
+    vol.Optional("controllers"): {cv.string: dict},
+    vol.Optional("commands"): {cv.string: dict},
+})
+
+FORK_SNAPSHOT_SCHEMA = vol.Schema({
+    vol.Required("name"): cv.string,
+    vol.Required("branches"): vol.Any(
+        vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+        vol.All(cv.ensure_list, [BRANCH_SCHEMA]),
+    ),
+    vol.Required("steps"): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+    vol.Optional("dt", default=SIMULATION_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=1)),
+    vol.Optional("bands"): {cv.string: vol.All(cv.ensure_list, [vol.Coerce(float)], vol.Length(min=2, max=2))},
+    vol.Optional("entry_id"): cv.string,
+})
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up OGB Dev from a config entry."""
@@ -33,39 +158,275 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         else:
             del hass.data[DOMAIN][entry.entry_id]
 
+    try:
+        profiles = await hass.async_add_executor_job(load_profiles, hass.config.path(PROFILES_FILE))
+    except (ValueError, OSError) as err:
+        _LOGGER.error(f"Invalid tent profiles {PROFILES_FILE}, using the bundled ones: {err}")
+        profiles = TENT_PROFILES
+    try:
+        catalog = await hass.async_add_executor_job(
+            load_catalog, hass.config.path(CATALOG_FILE), hass.config.path(".storage")
+        )
+    except ValueError as err:
+        _LOGGER.error(f"Invalid device catalog {CATALOG_FILE}: {err}")
+        return False
+    if catalog is None:
+        catalog = TEST_DEVICES
     state_store = OGBDevStore(hass, entry.entry_id)
-    state_manager = DevStateManager(hass, entry, state_store)
+    state_manager = DevStateManager(hass, entry, state_store, catalog, profiles)
+    # Days follow Home Assistant's configured time zone, not the host's.
+    state_manager.environment_simulator.set_time_zone(dt_util.get_default_time_zone())
+    photoperiod_start = dt_util.parse_time(
+        entry.options.get(CONF_PHOTOPERIOD_START, DEFAULT_PHOTOPERIOD_START)
+    )
+    if photoperiod_start is not None:
+        state_manager.environment_simulator.set_photoperiod_start(
+            photoperiod_start.hour * 3600 + photoperiod_start.minute * 60 + photoperiod_start.second
+        )
 
-    hass.data[DOMAIN][entry.entry_id] = {"state_manager": state_manager}
+    for loop in CONTROLLERS:
+        state_manager.environment_simulator.set_controller(
+            loop, **{gain: entry.options.get(f"{loop}_{gain}") for gain in GAINS}
+        )
 
-    device_manager = DevDeviceManager(hass, entry)
+    executor = entry.options.get(CONF_SIMULATION_EXECUTOR, EXECUTOR_EVENT_LOOP)
+    if executor == EXECUTOR_PROCESS:
+        worker_pool = hass.data[DOMAIN].get(WORKER_POOL)
+        if worker_pool is None:
+            worker_pool = SimulationWorkerPool()
+            hass.data[DOMAIN][WORKER_POOL] = worker_pool
+        state_manager.worker_pool = worker_pool
+
+    # Only enabled platforms are forwarded (and so imported), and only
+    # devices of enabled groups get registry devices and entities; the
+    # simulation itself still covers the whole catalog.
+    platforms = [platform for platform in PLATFORMS if platform in entry.options.get(CONF_PLATFORMS, PLATFORMS)]
+    groups = entry.options.get(CONF_DEVICE_GROUPS, DEVICE_GROUPS)
+    devices = {key: config for key, config in catalog.items() if config.get("group") in groups}
+    hass.data[DOMAIN][entry.entry_id] = {
+        "state_manager": state_manager,
+        "platforms": platforms,
+        "devices": devices,
+        "state_writer": StateWriter(
+            hass,
+            window=entry.options.get(CONF_STATE_WRITE_WINDOW, 0.0),
+            interval=entry.options.get(CONF_STATE_WRITE_INTERVAL, 0.0),
+        ),
+    }
+
+    device_manager = DevDeviceManager(hass, entry, devices)
     await device_manager.async_setup_devices()
 
     coordinator = OGBDevCoordinator(hass, entry, state_manager)
     await coordinator.async_load_stored_states()
     hass.data[DOMAIN][entry.entry_id]["coordinator"] = coordinator
 
-    await hass.config_entries.async_forward_entry_setups(
-        entry, ["sensor", "switch", "light", "fan", "climate", "humidifier", "select"]
-    )
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    _async_register_services(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _data_entries(hass: HomeAssistant, entry_id: str | None = None):
+    """Return the entry data targeted by a service call."""
+    data_entries = []
+    for key, data_entry in hass.data.get(DOMAIN, {}).items():
+        if not isinstance(data_entry, dict) or "state_manager" not in data_entry:
+            continue
+        if entry_id and key != entry_id:
+            continue
+        data_entries.append(data_entry)
+    return data_entries
+
+
+def _state_managers(hass: HomeAssistant, entry_id: str | None = None):
+    """Return the state managers targeted by a service call."""
+    return [data_entry["state_manager"] for data_entry in _data_entries(hass, entry_id)]
+
+
+def _snapshot_path(hass: HomeAssistant, path: str, entry_id: str) -> str:
+    """Return the file of a snapshot path inside the snapshot directory.
+
+    Snapshots are pickles, so only files under SNAPSHOT_DIR are read or
+    written: absolute paths and ".." components are rejected.
+    """
+    path = path.replace("{entry_id}", entry_id)
+    if os.path.isabs(path) or ".." in path.replace("\\", "/").split("/"):
+        raise HomeAssistantError(f"Snapshot path {path!r} must be relative to {SNAPSHOT_DIR}")
+    directory = os.path.realpath(hass.config.path(SNAPSHOT_DIR))
+    full_path = os.path.realpath(os.path.join(directory, path))
+    if os.path.commonpath([directory, full_path]) != directory or full_path == directory:
+        raise HomeAssistantError(f"Snapshot path {path!r} must be a file in {SNAPSHOT_DIR}")
+    return full_path
+
+
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register integration services once."""
+    if hass.services.has_service(DOMAIN, SERVICE_FAST_FORWARD):
+        return
+
+    async def async_fast_forward(call: ServiceCall) -> None:
+        """Advance the simulation by a number of steps."""
+        await asyncio.gather(
+            *(
+                state_manager.async_fast_forward(call.data["steps"])
+                for state_manager in _state_managers(hass, call.data.get("entry_id"))
+            )
+        )
+
+    async def async_run_load_test(call: ServiceCall) -> ServiceResponse:
+        """Drive synthetic commands against the simulated entities."""
+        entities = []
+        for data_entry in _data_entries(hass, call.data.get("entry_id")):
+            entities.extend(data_entry.get("entities", []))
+
+        generator = LoadGenerator(
+            entities,
+            rate=call.data["rate"],
+            duration=call.data["duration"],
+            seed=call.data.get("seed"),
+            weights=call.data.get("weights"),
+            distribution=call.data["distribution"],
+            mean=call.data["mean"],
+            sigma=call.data["sigma"],
+        )
+        report = await generator.async_run()
+        report["state_writes"] = {
+            data_entry["state_manager"].entry.entry_id: data_entry["state_writer"].as_dict()
+            for data_entry in _data_entries(hass, call.data.get("entry_id"))
+        }
+        hass.bus.async_fire(f"{DOMAIN}_load_test_finished", report)
+        return report
+
+    async def async_inject_faults(call: ServiceCall) -> ServiceResponse:
+        """Schedule faults on the simulated devices and sensors."""
+        scheduled = {}
+        for state_manager in _state_managers(hass, call.data.get("entry_id")):
+            try:
+                scheduled[state_manager.entry.entry_id] = await state_manager.async_inject_faults(
+                    call.data["faults"]
+                )
+            except ValueError as err:
+                raise HomeAssistantError(str(err)) from err
+        return {"faults": scheduled}
+
+    async def async_clear_faults(call: ServiceCall) -> None:
+        """Remove injected faults."""
+        for state_manager in _state_managers(hass, call.data.get("entry_id")):
+            await state_manager.async_clear_faults(call.data.get("ids"))
+
+    async def async_snapshot(call: ServiceCall) -> ServiceResponse:
+        """Checkpoint the simulation of each targeted entry."""
+        path = call.data.get("path")
+        snapshots = {}
+        for state_manager in _state_managers(hass, call.data.get("entry_id")):
+            entry_path = None
+            if path:
+                entry_path = _snapshot_path(hass, path, state_manager.entry.entry_id)
+            snapshots[state_manager.entry.entry_id] = await state_manager.async_snapshot(call.data["name"], entry_path)
+        return {"snapshots": snapshots}
+
+    async def async_restore_snapshot(call: ServiceCall) -> None:
+        """Return each targeted entry to a checkpoint."""
+        path = call.data.get("path")
+        for data_entry in _data_entries(hass, call.data.get("entry_id")):
+            state_manager = data_entry["state_manager"]
+            entry_path = None
+            if path:
+                entry_path = _snapshot_path(hass, path, state_manager.entry.entry_id)
+            await state_manager.async_restore_snapshot(call.data.get("name"), entry_path)
+            for entity in data_entry.get("entities", []):
+                async_schedule_write(entity)
+
+    async def async_fork_snapshot(call: ServiceCall) -> ServiceResponse:
+        """Run branches from a checkpoint without touching the live simulation."""
+        branches = {}
+        for state_manager in _state_managers(hass, call.data.get("entry_id")):
+            branches[state_manager.entry.entry_id] = await state_manager.async_fork_snapshot(
+                call.data["name"],
+                call.data["branches"],
+                call.data["steps"],
+                call.data["dt"],
+                call.data.get("bands"),
+            )
+        return {"branches": branches}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_FAST_FORWARD, async_fast_forward, schema=FAST_FORWARD_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_INJECT_FAULTS,
+        async_inject_faults,
+        schema=INJECT_FAULTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_CLEAR_FAULTS, async_clear_faults, schema=CLEAR_FAULTS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        async_snapshot,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RESTORE_SNAPSHOT, async_restore_snapshot, schema=RESTORE_SNAPSHOT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FORK_SNAPSHOT,
+        async_fork_snapshot,
+        schema=FORK_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RUN_LOAD_TEST,
+        async_run_load_test,
+        schema=RUN_LOAD_TEST_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     data_entry = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    platforms = PLATFORMS
     if isinstance(data_entry, dict):
+        platforms = data_entry.get("platforms", PLATFORMS)
         state_manager = data_entry.get("state_manager")
         if state_manager:
             await state_manager.async_save_states()
         coordinator = data_entry.get("coordinator")
         if coordinator:
             await coordinator.async_shutdown()
+        state_writer = data_entry.get("state_writer")
+        if state_writer:
+            state_writer.async_shutdown()
         del hass.data[DOMAIN][entry.entry_id]
-    return await hass.config_entries.async_unload_platforms(
-        entry, ["sensor", "switch", "light", "fan", "climate", "humidifier", "select"]
-    )
+
+    worker_pool = hass.data.get(DOMAIN, {}).get(WORKER_POOL)
+    if worker_pool is not None:
+        worker_pool.release(entry.entry_id)
+        if not worker_pool.zones:
+            worker_pool.shutdown()
+            del hass.data[DOMAIN][WORKER_POOL]
+
+    if not _state_managers(hass):
+        for service in SERVICES:
+            hass.services.async_remove(DOMAIN, service)
+
+    return await hass.config_entries.async_unload_platforms(entry, platforms)
 
 
 class OGBDevStore:
@@ -99,55 +460,100 @@ class OGBDevStore:
 class DevDeviceManager:
     """Manages OGB Dev devices."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, devices: dict):
         self.hass = hass
         self.entry = entry
+        self.devices = devices
         self.device_registry = dr.async_get(hass)
         self.area_registry = ar.async_get(hass)
         self.area_name = entry.data.get("area_name", "Grow Room")
         self.area = self.area_registry.async_get_or_create(name=self.area_name)
 
     async def async_setup_devices(self):
-        """Create all test devices."""
-        for device_key, device_config in TEST_DEVICES.items():
+        """Register the test devices of the enabled groups.
+
+        The catalog is diffed against this entry's registry devices: new
+        devices are created already in the zone's area, existing ones are
+        only updated when a field changed, and devices no longer in the
+        catalog (or in a disabled group) are detached in the same pass.
+        The control devices the platforms create from entity device_info
+        are not catalog devices and are never touched here.
+        """
+        registry = self.device_registry
+        existing = {}
+        for device in dr.async_entries_for_config_entry(registry, self.entry.entry_id):
+            for domain, identifier in device.identifiers:
+                # The platforms own the control devices; leave them alone.
+                if domain == DOMAIN and identifier not in CONTROL_DEVICES:
+                    existing[identifier] = device
+
+        created = updated = 0
+        for device_key, device_config in self.devices.items():
             device_id = device_config["name"].lower()
-
-            device = self.device_registry.async_get_or_create(
-                config_entry_id=self.entry.entry_id,
-                identifiers={(DOMAIN, device_id)},
-                name=device_config["name"],
-                manufacturer=device_config.get("manufacturer", "OpenGrowBox"),
-                model=device_config.get("model", "Dev Environment"),
-                sw_version="1.0.0",
-            )
-
-            self.device_registry.async_update_device(device.id, area_id=self.area.id)
+            fields = {
+                "name": device_config["name"],
+                "manufacturer": device_config.get("manufacturer", "OpenGrowBox"),
+                "model": device_config.get("model", "Dev Environment"),
+                "sw_version": "1.0.0",
+            }
+
+            device = existing.pop(device_id, None)
+            if device is None:
+                device = registry.async_get_or_create(
+                    config_entry_id=self.entry.entry_id,
+                    identifiers={(DOMAIN, device_id)},
+                    suggested_area=self.area_name,
+                    **fields,
+                )
+                created += 1
+                changes = {}
+            else:
+                changes = {field: value for field, value in fields.items() if getattr(device, field) != value}
+            # Devices shared with another zone keep their area on creation.
+            if device.area_id != self.area.id:
+                changes["area_id"] = self.area.id
+            if changes:
+                device = registry.async_update_device(device.id, **changes)
+                updated += 1
 
             device_config["device_id"] = device_id
             device_config["registry_device"] = device
 
-            _LOGGER.debug(f"Created device: {device_config['name']} ({device_id})")
+        for device in existing.values():
+            registry.async_update_device(device.id, remove_config_entry_id=self.entry.entry_id)
+
+        _LOGGER.debug(
+            f"Registered devices: {created} created, {updated} updated, {len(existing)} removed"
+        )
 
 
 class DevStateManager:
     """Manages state and simulation for OGB Dev devices."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, store: OGBDevStore):
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, store: OGBDevStore, catalog: dict, profiles: dict):
         self.hass = hass
         self.entry = entry
         self.store = store
-        self.device_states = {}
-        self.environment_simulator = EnvironmentSimulator()
+        self.catalog = catalog
+        self.device_states = DeviceStateTable(catalog)
+        self.environment_simulator = EnvironmentSimulator(
+            catalog,
+            profile=tent_profile(entry.options.get(CONF_TENT_PROFILE, entry.data.get(CONF_TENT_PROFILE)), profiles),
+        )
         self.environment = self.environment_simulator.environment
+        self.worker_pool = None
+        # True while the simulator is resident in a worker process.
+        self._resident = False
+        self.snapshots = {}
+        self.latency = LatencyTracker()
         self._simulation_task = None
+        self._simulation_lock = asyncio.Lock()
+        self._last_step = time.monotonic()
 
     async def async_setup(self):
         """Initialize state manager."""
-        for device_key, device_config in TEST_DEVICES.items():
-            self.device_states[device_key] = dict(device_config["state"])
-
         self._simulation_task = async_track_time_interval(
-            self.hass, self._async_update_simulation, timedelta(seconds=30)
+            self.hass, self._async_update_simulation, timedelta(seconds=SIMULATION_INTERVAL)
         )
 
     async def async_unload(self):
@@ -156,11 +562,30 @@ class DevStateManager:
             self._simulation_task()
             self._simulation_task = None
 
+    async def _async_simulator(self, change=False):
+        """Return the simulator with all of its model state.
+
+        In process mode the simulator stays in its worker and the event
+        loop only holds its outputs, so it is fetched back first. Callers
+        that change it hold the simulation lock and pass change=True; the
+        changed simulator is then shipped back with the next step.
+        """
+        if self._resident:
+            simulator = await self.worker_pool.async_fetch(self.hass, self.entry.entry_id)
+            if not change:
+                return simulator
+            self.environment_simulator = simulator
+            self._resident = False
+        return self.environment_simulator
+
     async def async_save_states(self):
         """Save current device states to storage."""
+        async with self._simulation_lock:
+            simulator = await self._async_simulator()
         data = {
-            "device_states": self.device_states,
+            "device_states": self.device_states.as_dict(),
             "environment": self.environment,
+            "simulator": simulator.as_dict(),
         }
         await self.store.async_save(data)
 
@@ -171,39 +596,195 @@ class DevStateManager:
             if "device_states" in data:
                 for key, state in data["device_states"].items():
                     if key in self.device_states:
-                        self.device_states[key].update(state)
+                        self.device_states.view(key).update(state)
             if "environment" in data and isinstance(data["environment"], dict):
-                self.environment = data["environment"]
-                self.environment_simulator.environment = data["environment"]
+                self.environment_simulator.environment.update(data["environment"])
+            if "simulator" in data and isinstance(data["simulator"], dict):
+                self.environment_simulator.restore(data["simulator"])
+            self.environment = self.environment_simulator.environment.copy()
             _LOGGER.debug("Restored device states from storage")
         return self.device_states
 
     def get_device_state(self, device_key):
         """Get state for a device."""
-        return self.device_states.get(device_key, {})
-
-    async def set_device_state(self, device_key, key, value):
-        """Set state for a device."""
-        if device_key in self.device_states:
-            self.device_states[device_key][key] = value
+        if device_key not in self.device_states:
+            return {}
+        return self.device_states.view(device_key)
+
+    async def set_device_state(self, device_key, key, value, correlation_id=None):
+        """Set state for a device.
+
+        Commands pass a correlation id so the time until sensors reflect
+        the change can be measured.
+        """
+        if device_key in self.device_states and not self.environment_simulator.faults.is_stuck(device_key, key):
+            self.device_states.set(device_key, key, value)
+        if correlation_id is not None:
+            self.latency.record_command(device_key, correlation_id)
         await self._async_update_simulation(None)
 
-    @callback
-    async def _async_update_simulation(self, now=None):
-        """Periodic simulation update."""
+    async def async_set_season(self, season):
+        """Set the simulator season without racing an in-flight step."""
+        async with self._simulation_lock:
+            (await self._async_simulator(change=True)).set_season(season)
+
+    async def async_set_grow_stage(self, stage):
+        """Set the canopy grow stage without racing an in-flight step."""
+        async with self._simulation_lock:
+            (await self._async_simulator(change=True)).set_grow_stage(stage)
+
+    async def async_set_controller(self, loop, enabled=None, target=None):
+        """Switch a reference control loop or move its target.
+
+        Enabled loops run the algorithm chosen in the options.
+        """
+        mode = None
+        if enabled is not None:
+            mode = self.entry.options.get(CONF_CONTROLLER_ALGORITHM, MODE_PID) if enabled else MODE_OFF
+        async with self._simulation_lock:
+            (await self._async_simulator(change=True)).set_controller(loop, mode=mode, target=target)
+
+    def controller_output(self, loop):
+        """Return a reference control loop's duty (-1 to 1), or None while it is off."""
+        return self.environment_simulator.controllers.output(loop)
+
+    async def async_fast_forward(self, steps):
+        """Advance the simulation by several steps at once."""
+        await self._async_step(steps, SIMULATION_INTERVAL)
+        _LOGGER.debug(f"Fast-forwarded {self.entry.entry_id} by {steps} steps")
+
+    async def async_snapshot(self, name, path=None):
+        """Checkpoint the simulation in memory, and on disk when a path is given."""
+        async with self._simulation_lock:
+            snapshot = Snapshot.capture(await self._async_simulator(), self.device_states)
+        self.snapshots[name] = snapshot
+        if path:
+            await self.hass.async_add_executor_job(snapshot.save, path)
+        return {"clock": snapshot.clock, "bytes": len(snapshot)}
+
+    async def _async_get_snapshot(self, name=None, path=None):
+        """Return a snapshot held in memory, or read from a file."""
+        snapshot = self.snapshots.get(name) if name else None
+        if snapshot is None and path:
+            try:
+                snapshot = await self.hass.async_add_executor_job(Snapshot.load, path)
+            except (OSError, pickle.UnpicklingError, EOFError) as err:
+                raise HomeAssistantError(f"Cannot read snapshot {path}: {err}") from err
+            if name:
+                self.snapshots[name] = snapshot
+        if snapshot is None:
+            raise HomeAssistantError(f"Unknown snapshot {name or path}")
+        return snapshot
+
+    async def async_restore_snapshot(self, name=None, path=None):
+        """Replace the live simulation and device states with a checkpoint."""
+        snapshot = await self._async_get_snapshot(name, path)
+        async with self._simulation_lock:
+            self.environment_simulator, self.device_states = snapshot.restore()
+            self._resident = False
+            self._last_step = time.monotonic()
+        self._publish_environment()
+
+    async def async_fork_snapshot(self, name, branches, steps, dt, bands=None):
+        """Run branches forked from a checkpoint in the executor; returns their statistics."""
+        snapshot = await self._async_get_snapshot(name)
+        return await self.hass.async_add_executor_job(
+            run_branches, fork(snapshot, branches), steps, dt, bands, self._get_weather_data()
+        )
+
+    def _get_weather_data(self):
+        """Read outside conditions from the weather entity."""
         weather_data = {"temp": None, "hum": None}
         weather_entity = self.hass.states.get("weather.home")
         if weather_entity:
             weather_data["temp"] = weather_entity.attributes.get("temperature")
             weather_data["hum"] = weather_entity.attributes.get("humidity")
+        return weather_data
+
+    async def async_inject_faults(self, faults):
+        """Schedule faults on the simulation clock; returns their ids.
+
+        Every fault is validated first, so an unknown target schedules none.
+        """
+        async with self._simulation_lock:
+            simulator = await self._async_simulator(change=True)
+            for fault in faults:
+                simulator.faults.validate(fault["fault"], fault["target"])
+            return [
+                simulator.inject_fault(
+                    fault["fault"],
+                    fault["target"],
+                    **{key: value for key, value in fault.items() if key not in ("fault", "target")},
+                )
+                for fault in faults
+            ]
+
+    async def async_clear_faults(self, fault_ids=None):
+        """Remove injected faults, or all of them."""
+        async with self._simulation_lock:
+            (await self._async_simulator(change=True)).clear_faults(fault_ids)
+
+    def sensor_available(self, device_key, sensor_name):
+        """Return whether a modelled sensor is reachable."""
+        return self.environment_simulator.sensors.available(f"{device_key}.{sensor_name}")
+
+    def get_device_power(self, device_key):
+        """Return the power draw of an actuator in W."""
+        return self.environment_simulator.actuators.device_power(device_key)
+
+    def get_device_energy(self, device_key):
+        """Return the energy use of an actuator in kWh."""
+        return self.environment_simulator.meter.device_kwh(device_key)
+
+    def get_sensor_reading(self, device_key, sensor_name):
+        """Return the latest sample of a modelled sensor."""
+        return self.environment_simulator.sensors.reading(f"{device_key}.{sensor_name}")
+
+    async def _async_step(self, steps=1, dt=None):
+        """Run simulation steps on the event loop or the worker pool.
+
+        Live steps advance by the real time since the previous step;
+        fast-forward steps use the nominal simulation interval.
+        """
+        weather_data = self._get_weather_data()
+
+        async with self._simulation_lock:
+            command_seq = self.latency.seq
+            now = time.monotonic()
+            if dt is None:
+                dt = min(now - self._last_step, 2 * SIMULATION_INTERVAL)
+            self._last_step = now
+            if self.worker_pool is not None:
+                if not self._resident:
+                    await self.worker_pool.async_load(
+                        self.hass, self.entry.entry_id, self.environment_simulator, self.device_states
+                    )
+                    self._resident = True
+                outputs, changes = await self.worker_pool.async_run(
+                    self.hass, self.entry.entry_id, self.device_states, weather_data, steps, dt
+                )
+                self.environment_simulator.apply_outputs(outputs)
+                self.device_states.apply_changes(changes)
+            else:
+                for _ in range(steps):
+                    self.environment_simulator.update_environment(
+                        self.device_states, weather_data, dt
+                    )
 
-        self.environment = self.environment_simulator.update_environment(
-            self.device_states, weather_data
-        )
+        self.latency.mark_applied(command_seq)
+        self._publish_environment()
 
+    def _publish_environment(self):
+        """Expose a rounded copy of the simulator's environment."""
+        self.environment = self.environment_simulator.environment.copy()
         self.environment["air_temperature"] = round(self.environment["air_temperature"], 1)
         self.environment["air_humidity"] = round(self.environment["air_humidity"], 1)
 
+    @callback
+    async def _async_update_simulation(self, now=None):
+        """Periodic simulation update."""
+        await self._async_step()
+
 
 class OGBDevCoordinator:
     """Coordinator for OGB Dev Environment simulation."""
@@ -239,6 +820,22 @@ class OGBDevCoordinator:
 class OGBDevRestoreEntity(RestoreEntity):
     """Mixin for restoring entity states."""
 
+    def _correlation_id(self):
+        """Return the correlation id for the command being handled.
+
+        Home Assistant keeps an entity's context after the call that set
+        it, so only a context set within CONTEXT_RECENT_TIME_SECONDS is
+        taken as the current call's; otherwise the command gets a fresh id.
+        """
+        context_set = self._context_set
+        if (
+            self._context is not None
+            and context_set is not None
+            and time.time() - context_set <= CONTEXT_RECENT_TIME_SECONDS
+        ):
+            return self._context.id
+        return new_correlation_id()
+
     async def _async_restore_state(self, state_key: str, default=None):
         """Restore state from HA storage."""
         if state := await self.async_get_last_state():
@@ -0,0 +1,108 @@
+"""Incremental per-photoperiod accumulators for OGB Dev Environment."""
+from datetime import datetime, timedelta
+
+
+def next_boundary(clock, start, time_zone=None):
+    """Return the first time-of-day ``start`` (s after midnight) after clock.
+
+    Days follow ``time_zone``, or the process's local time when None.
+    """
+    local = datetime.fromtimestamp(clock, time_zone)
+    boundary = local.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(seconds=start)
+    if boundary.timestamp() <= clock:
+        boundary += timedelta(days=1)
+    return boundary.timestamp()
+
+
+class PeriodAccumulator:
+    """Time-weighted integral, mean, minimum and maximum of one value."""
+
+    __slots__ = ("total", "seconds", "minimum", "maximum")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Start a new period."""
+        self.total = 0.0
+        self.seconds = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value, dt):
+        """Add a value held for dt seconds."""
+        self.total += value * dt
+        self.seconds += dt
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self):
+        """Return the time-weighted mean, or None before the first sample."""
+        return self.total / self.seconds if self.seconds else None
+
+    def as_dict(self):
+        """Return the accumulated state."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def restore(self, data):
+        """Restore state saved with as_dict."""
+        for slot in self.__slots__:
+            if slot in data:
+                setattr(self, slot, data[slot])
+
+
+class Photoperiod:
+    """Resets a set of accumulators at a daily time-of-day boundary.
+
+    The next boundary is computed once per period, so each step costs a
+    single comparison.
+    """
+
+    __slots__ = ("start", "time_zone", "period_start", "next_reset", "accumulators")
+
+    def __init__(self, clock, accumulators, start=0, time_zone=None):
+        self.start = start
+        self.time_zone = time_zone
+        self.accumulators = accumulators
+        self.next_reset = next_boundary(clock, start, time_zone)
+        self.period_start = self.next_reset - 86400
+
+    def set_start(self, clock, start):
+        """Move the daily boundary; the running period continues."""
+        self.start = start
+        self.next_reset = next_boundary(clock, start, self.time_zone)
+
+    def set_time_zone(self, clock, time_zone):
+        """Count days in another time zone; the running period continues."""
+        self.time_zone = time_zone
+        self.next_reset = next_boundary(clock, self.start, time_zone)
+
+    def advance(self, clock):
+        """Reset every accumulator when clock passed the boundary."""
+        if clock < self.next_reset:
+            return False
+        self.period_start = self.next_reset
+        for accumulator in self.accumulators.values():
+            accumulator.reset()
+        self.next_reset = next_boundary(clock, self.start, self.time_zone)
+        return True
+
+    def as_dict(self):
+        """Return the accumulated state of the running period."""
+        return {
+            "period_start": self.period_start,
+            **{name: accumulator.as_dict() for name, accumulator in self.accumulators.items()},
+        }
+
+    def restore(self, clock, data):
+        """Restore a saved period, unless its boundary has passed since."""
+        period_start = data.get("period_start")
+        if period_start is None or clock >= next_boundary(period_start, self.start, self.time_zone):
+            return
+        self.period_start = period_start
+        for name, accumulator in self.accumulators.items():
+            if name in data:
+                accumulator.restore(data[name])
@@ -0,0 +1,169 @@
+"""Actuator dynamics and power draw for OGB Dev Environment."""
+
+# State field holding the actual 0-1 output of a device with an actuator.
+OUTPUT_FIELD = "output"
+
+ACTUATOR_DEFAULTS = {
+    "watts": 0.0,  # W drawn at full output
+    "standby": 0.0,  # W drawn while off
+    "ramp": 0.0,  # % of full output per second, 0 jumps to the target
+    "min_on": 0.0,  # s a device stays on once switched on
+    "min_off": 0.0,  # s a device stays off once switched off
+    "inrush": 1.0,  # multiple of rated power drawn at switch-on
+    "inrush_time": 0.0,  # s the inrush current lasts
+}
+
+
+def actuator_fields(device_config, block):
+    """Return the (switch, level) fields driving a catalog block.
+
+    Devices with an actuator are driven by its actual output instead of
+    the commanded state fields.
+    """
+    if "actuator" in device_config:
+        return OUTPUT_FIELD, None
+    return block.get("switch", "power"), block.get("level")
+
+
+class ActuatorBank:
+    """Ramped, cycle-limited outputs and power draw of every actuator.
+
+    The commanded state (switch times 0-100 level), or the duty of a
+    reference controller driving the device, is the target. Each
+    step one pass over parallel lists enforces minimum on/off times,
+    ramps the actual output toward the target, writes it to the
+    ``output`` state field the effect and lighting models read, and
+    records each device's power draw.
+    """
+
+    def __init__(self, catalog):
+        self.devices = []
+        self.switches = []
+        self.levels = []
+        self.watts = []
+        self.standby = []
+        self.ramp = []
+        self.min_on = []
+        self.min_off = []
+        self.inrush = []
+        self.inrush_time = []
+
+        for device_key, device_config in catalog.items():
+            actuator = device_config.get("actuator")
+            if actuator is None:
+                continue
+            block = device_config.get("effects") or device_config.get("fixture") or {}
+            params = {**ACTUATOR_DEFAULTS, **actuator}
+            self.devices.append(device_key)
+            self.switches.append(actuator.get("switch", block.get("switch", "power")))
+            self.levels.append(actuator.get("level", block.get("level")))
+            self.watts.append(float(params["watts"]))
+            self.standby.append(float(params["standby"]))
+            self.ramp.append(float(params["ramp"]) / 100)
+            self.min_on.append(float(params["min_on"]))
+            self.min_off.append(float(params["min_off"]))
+            self.inrush.append(float(params["inrush"]))
+            self.inrush_time.append(float(params["inrush_time"]))
+
+        count = len(self.devices)
+        self.index = {key: index for index, key in enumerate(self.devices)}
+        self.on = [False] * count
+        self.changed = [float("-inf")] * count
+        self.power = [0.0] * count
+        self.outputs = [0.0] * count
+        self.total_power = 0.0
+        self._resumed = False
+        self._rows = None
+
+    def __getstate__(self):
+        """Drop the device table binding when shipped to a worker."""
+        state = self.__dict__.copy()
+        state["_rows"] = None
+        for name in ("_switch_columns", "_level_columns", "_output"):
+            state.pop(name, None)
+        return state
+
+    def bind(self, device_states):
+        """Resolve table rows and columns.
+
+        The first binding resumes from the outputs stored in the table;
+        later ones (a table shipped to a worker) get the bank's outputs.
+        """
+        self._rows = [device_states.index.get(key) for key in self.devices]
+        self._switch_columns = [device_states.column(field) for field in self.switches]
+        self._level_columns = [
+            device_states.column(field) if field else None for field in self.levels
+        ]
+        self._output = device_states.column(OUTPUT_FIELD)
+        for index, row in enumerate(self._rows):
+            if row is None:
+                continue
+            if self._resumed:
+                self._output[row] = self.outputs[index]
+            else:
+                if self._output[row] is None:
+                    self._output[row] = 0.0
+                self.outputs[index] = self._output[row]
+                self.on[index] = self._output[row] > 0
+        self._resumed = True
+
+    def update(self, dt, clock, duty=None):
+        """Advance every actuator by dt seconds.
+
+        ``duty`` holds a 0-1 target per actuator overriding the
+        commanded state, or None where the commands apply.
+        """
+        output = self._output
+        total = 0.0
+        for index, row in enumerate(self._rows):
+            if row is None:
+                continue
+            switch = self._switch_columns[index][row]
+            target = 0.0
+            override = duty[index] if duty is not None else None
+            if override is not None:
+                target = override
+            elif switch:
+                level_column = self._level_columns[index]
+                level = level_column[row] if level_column is not None else None
+                target = float(switch) * (level / 100 if level is not None else 1.0)
+
+            on = self.on[index]
+            inrush = 0.0
+            if (target > 0) != on:
+                hold = self.min_on[index] if on else self.min_off[index]
+                if clock - self.changed[index] >= hold:
+                    on = self.on[index] = not on
+                    self.changed[index] = clock
+                    if on:
+                        inrush = (self.inrush[index] - 1) * min(self.inrush_time[index], dt)
+
+            current = output[row]
+            if not on:
+                goal = 0.0
+            elif target > 0:
+                goal = target
+            else:
+                goal = current  # held on by the minimum on time
+            rate = self.ramp[index]
+            if rate and goal != current:
+                step = rate * dt
+                current += max(-step, min(step, goal - current))
+            else:
+                current = goal
+            output[row] = self.outputs[index] = current
+
+            watts = self.watts[index]
+            power = self.standby[index] + watts * current
+            if inrush and dt > 0:
+                power += watts * inrush / dt
+            self.power[index] = power
+            total += power
+
+        self.total_power = total
+        return output
+
+    def device_power(self, device_key):
+        """Return the power draw of a device in W, or None."""
+        index = self.index.get(device_key)
+        return None if index is None else self.power[index]
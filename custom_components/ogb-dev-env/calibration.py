@@ -0,0 +1,298 @@
+"""Fit simulator coefficients to recorded grow data.
+
+Reads a CSV (or Parquet, with pyarrow) of real tent logs and writes a
+calibrated tent profile, without Home Assistant:
+
+    python custom_components/ogb-dev-env/calibration.py log.csv --name my_tent --output profiles.json
+
+Each row holds a ``timestamp`` (epoch seconds or ISO 8601),
+``air_temperature``, ``air_humidity``, ``outside_temperature``,
+``outside_humidity``, optional ``room_temperature``, ``co2_level`` and
+``ppfd``, and device states as ``<device>.<field>`` columns (for example
+``heater.power`` or ``light_main.intensity``).
+"""
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+
+# Columns a row needs to take part in a fitting step; the next row needs
+# the first three.
+REQUIRED_COLUMNS = ("timestamp", "air_temperature", "air_humidity", "outside_temperature", "outside_humidity")
+
+
+def read_log(path):
+    """Return the rows of a CSV or Parquet log as dicts."""
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as parquet
+        except ImportError as err:
+            raise SystemExit("Reading Parquet logs needs pyarrow") from err
+        return parquet.read_table(path).to_pylist()
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def _timestamp(value):
+    """Return epoch seconds from a number or an ISO 8601 string."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value)).timestamp()
+
+
+def _number(value, default=None):
+    """Return a float, or the default for empty cells."""
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def _state(value):
+    """Return a device state cell as a bool or a number."""
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "on"):
+            return True
+        if lowered in ("false", "off", ""):
+            return False
+        return float(lowered)
+    return value
+
+
+def solve(gram, moment):
+    """Solve the normal equations by Gaussian elimination with pivoting."""
+    size = len(moment)
+    matrix = [row[:] + [moment[index]] for index, row in enumerate(gram)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(matrix[row][column]))
+        if abs(matrix[pivot][column]) < 1e-18:
+            matrix[pivot][column] = 1e-18
+        matrix[column], matrix[pivot] = matrix[pivot], matrix[column]
+        for row in range(column + 1, size):
+            factor = matrix[row][column] / matrix[column][column]
+            for index in range(column, size + 1):
+                matrix[row][index] -= factor * matrix[column][index]
+    solution = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        total = matrix[row][size] - sum(matrix[row][index] * solution[index] for index in range(row + 1, size))
+        solution[row] = total / matrix[row][row]
+    return solution
+
+
+def least_squares(features, targets):
+    """Fit non-negative coefficients to feature rows by least squares.
+
+    The normal equations are accumulated in one pass, so any candidate
+    coefficient set is then scored by a dot product instead of a
+    simulation run. Coefficients that come out negative are pinned to
+    zero and the rest refitted.
+    """
+    size = len(features[0]) if features else 0
+    gram = [[0.0] * size for _ in range(size)]
+    moment = [0.0] * size
+    for row, target in zip(features, targets):
+        for i in range(size):
+            moment[i] += row[i] * target
+            gram_row = gram[i]
+            for j in range(size):
+                gram_row[j] += row[i] * row[j]
+
+    active = list(range(size))
+    while active:
+        solution = solve([[gram[i][j] for j in active] for i in active], [moment[i] for i in active])
+        negative = [index for index, value in zip(active, solution) if value < 0]
+        if not negative:
+            coefficients = [0.0] * size
+            for index, value in zip(active, solution):
+                coefficients[index] = value
+            return coefficients
+        active = [index for index in active if index not in negative]
+    return [0.0] * size
+
+
+def rmse(features, targets, coefficients):
+    """Return the one-step prediction error of a coefficient set."""
+    if not targets:
+        return 0.0
+    total = 0.0
+    for row, target in zip(features, targets):
+        error = target - sum(value * coefficient for value, coefficient in zip(row, coefficients))
+        total += error * error
+    return (total / len(targets)) ** 0.5
+
+
+def fit(rows, base_profile=None, catalog=None):
+    """Fit the coefficients of a tent to logged rows.
+
+    The logged device states are replayed through the effect, lighting
+    and canopy models once; the simulator's temperature and humidity
+    updates are linear in the fitted coefficients, so both are solved
+    by least squares over all steps. Returns the fitted coefficients
+    and the one-step RMSE of temperature and humidity before (base
+    profile) and after fitting. Steps with a gap in a required column
+    are skipped and counted.
+    """
+    from .const import SIMULATION_INTERVAL
+    from .devices import TEST_DEVICES, CANOPY
+    from .effects import EffectMatrix, HEAT, EXHAUST, INTAKE, MOISTURE
+    from .lighting import LightingModel
+    from .plant import Canopy
+    from .profiles import tent_coefficients
+    from .psychrometrics import vapor_pressure_deficit
+    from .state import DeviceStateTable
+
+    reference = tent_coefficients(base_profile)
+    catalog = catalog if catalog is not None else TEST_DEVICES
+    # Logs record commanded states, so devices are driven by them directly.
+    catalog = {
+        key: {name: value for name, value in config.items() if name != "actuator"}
+        for key, config in catalog.items()
+    }
+    effects = EffectMatrix(catalog)
+    lighting = LightingModel(catalog, reference["area"])
+    canopy = Canopy({**CANOPY, "area": reference["area"]})
+    table = DeviceStateTable(catalog)
+    effects.bind(table)
+    lighting.bind(table)
+    state_columns = [
+        (column, *column.split(".", 1)) for column in (rows[0] if rows else {})
+        if "." in column and column.split(".", 1)[0] in table
+    ]
+
+    steps = []
+    skipped = 0
+    for current, following in zip(rows, rows[1:]):
+        for column, device_key, field in state_columns:
+            table.set(device_key, field, _state(current[column]))
+        # Logs have gaps; a step needs both ends of every fitted value.
+        if any(current.get(key) in (None, "") for key in REQUIRED_COLUMNS) or any(
+            following.get(key) in (None, "") for key in REQUIRED_COLUMNS[:3]
+        ):
+            skipped += 1
+            continue
+        dt = _timestamp(following["timestamp"]) - _timestamp(current["timestamp"])
+        if dt <= 0:
+            skipped += 1
+            continue
+        effects.update_drive()
+        influence = effects.multiply()
+        lighting.update()
+
+        temperature = _number(current["air_temperature"])
+        humidity = _number(current["air_humidity"])
+        outside_temperature = _number(current["outside_temperature"])
+        steps.append((
+            dt / SIMULATION_INTERVAL,
+            temperature,
+            humidity,
+            _number(following["air_temperature"]),
+            _number(following["air_humidity"]),
+            _number(current.get("room_temperature"), outside_temperature),
+            outside_temperature,
+            _number(current["outside_humidity"]),
+            influence[HEAT] + lighting.heat,
+            influence[EXHAUST],
+            influence[INTAKE],
+            influence[MOISTURE],
+            canopy.step(
+                _number(current.get("ppfd"), lighting.ppfd),
+                vapor_pressure_deficit(temperature, humidity),
+                _number(current.get("co2_level"), 600.0),
+            )[0],
+        ))
+
+    # Temperature: dT = heat_per_watt * H - insulation * max(0, T - room) - exchange * airflow terms.
+    temperature_features = []
+    temperature_targets = []
+    for scale, temp, _, next_temp, _, room, outside, _, heat, exhaust, intake, _, _ in steps:
+        temperature_features.append((
+            heat * scale,
+            -max(0.0, temp - room) * scale,
+            -(exhaust * (temp - room) + intake * (temp - outside)) * scale,
+        ))
+        temperature_targets.append(next_temp - temp)
+    heat_per_watt, insulation, exchange = least_squares(temperature_features, temperature_targets)
+
+    # Humidity, given the fitted heat and exchange terms.
+    humidity_features = []
+    humidity_targets = []
+    for scale, temp, hum, _, next_hum, _, outside, outside_hum, heat, exhaust, intake, moisture, transpiration in steps:
+        intake_loss = (temp - outside) * intake * exchange * scale
+        known = -heat * heat_per_watt * scale * 0.2 + intake_loss * (outside_hum - hum) / 100 - 0.1 * scale
+        humidity_features.append((-exhaust * scale, (moisture + transpiration * 1000) * scale))
+        humidity_targets.append(next_hum - hum - known)
+    drying, humidity_per_gram = least_squares(humidity_features, humidity_targets)
+
+    coefficients = {
+        "heat_per_watt": heat_per_watt,
+        "insulation": insulation,
+        "exchange_per_m3h": exchange,
+        "drying_per_m3h": drying,
+        "humidity_per_gram": humidity_per_gram,
+    }
+    reference_humidity_targets = []
+    for scale, temp, hum, _, next_hum, _, outside, outside_hum, heat, _, intake, _, _ in steps:
+        intake_loss = (temp - outside) * intake * reference["exchange_per_m3h"] * scale
+        known = -heat * reference["heat_per_watt"] * scale * 0.2 + intake_loss * (outside_hum - hum) / 100 - 0.1 * scale
+        reference_humidity_targets.append(next_hum - hum - known)
+    report = {
+        "steps": len(steps),
+        "skipped": skipped,
+        "temperature_rmse_before": rmse(
+            temperature_features, temperature_targets,
+            [reference["heat_per_watt"], reference["insulation"], reference["exchange_per_m3h"]],
+        ),
+        "temperature_rmse_after": rmse(temperature_features, temperature_targets, [heat_per_watt, insulation, exchange]),
+        "humidity_rmse_before": rmse(
+            humidity_features, reference_humidity_targets,
+            [reference["drying_per_m3h"], reference["humidity_per_gram"]],
+        ),
+        "humidity_rmse_after": rmse(humidity_features, humidity_targets, [drying, humidity_per_gram]),
+    }
+    return coefficients, report
+
+
+def main(argv=None):
+    """Fit a log and write the calibrated tent profile as JSON."""
+    import argparse
+
+    from .profiles import DEFAULT_TENT_PROFILE, tent_profile
+
+    parser = argparse.ArgumentParser(description="Calibrate OGB Dev Environment coefficients to a grow log.")
+    parser.add_argument("log", help="CSV or Parquet log")
+    parser.add_argument("--profile", default=DEFAULT_TENT_PROFILE, help="tent profile the log was recorded in")
+    parser.add_argument("--name", default="calibrated", help="name of the calibrated profile")
+    parser.add_argument("--output", default=None, help="profiles JSON file to add the profile to (default: stdout)")
+    args = parser.parse_args(argv)
+
+    coefficients, report = fit(read_log(args.log), args.profile)
+    for key, value in report.items():
+        print(f"{key}: {value:.6g}", file=sys.stderr)
+
+    profile = {**tent_profile(args.profile), "coefficients": coefficients}
+    profiles = {}
+    if args.output and os.path.exists(args.output):
+        with open(args.output, encoding="utf-8") as file:
+            profiles = json.load(file)
+    profiles[args.name] = profile
+    text = json.dumps(profiles, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if not __package__:
+    # Run as a script: load this directory as a package, skipping the
+    # Home Assistant integration in __init__.py.
+    from sweep import HEADLESS_PACKAGE, bootstrap_headless
+
+    bootstrap_headless(os.path.dirname(os.path.abspath(__file__)))
+    if __name__ == "__main__":
+        import importlib
+
+        sys.exit(importlib.import_module(f"{HEADLESS_PACKAGE}.calibration").main())
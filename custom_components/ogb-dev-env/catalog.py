@@ -0,0 +1,273 @@
+"""Device catalogs loaded from YAML or JSON files for OGB Dev Environment.
+
+A catalog file lists devices in the same shape as ``devices.TEST_DEVICES``:
+
+    builtin: true  # start from the bundled catalog
+    devices:
+      air_sensor_{zone}_{n}:
+        extends: air_sensor  # copy a bundled or earlier device
+        for_each: {zone: [north, south], n: 8}  # lists, or 1..n for integers
+        name: DevAirSensor{zone}{n}
+
+Every ``{variable}`` in a templated device's key and strings is replaced
+for each combination of its ``for_each`` values. The expanded catalog is
+validated once and compiled into a pickle cache named by the file's
+hash, so restarts skip parsing, expansion and validation.
+"""
+import copy
+import hashlib
+import itertools
+import json
+import os
+import pickle
+
+from .actuators import ACTUATOR_DEFAULTS
+from .const import VERSION
+from .devices import DEVICE_GROUPS, TEST_DEVICES
+from .effects import CHANNELS
+from .lighting import FIXTURE_DEFAULTS
+from .measurement import MODEL_DEFAULTS, SIGNIFICANCE_DEFAULTS
+from .reservoir import CHANNEL_DEFAULTS, RESERVOIR_DEFAULTS
+from .substrate import IRRIGATION_DEFAULTS, SUBSTRATE_DEFAULTS
+
+CACHE_VERSION = 1
+CACHE_PREFIX = "ogb_dev_env_catalog"
+
+# Keys the integration adds to catalog entries at runtime.
+RUNTIME_KEYS = ("registry_device",)
+TEMPLATE_KEYS = ("extends", "for_each")
+GATING_KEYS = ("switch", "level")
+# Keys of model blocks that hold a name rather than a number.
+NAME_KEYS = ("prefix", "substrate", "reservoir")
+
+
+def _parse(path, text):
+    """Parse catalog text as YAML (.yaml/.yml) or JSON."""
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError as err:
+            raise ValueError("Reading YAML catalogs needs PyYAML") from err
+        try:
+            return yaml.safe_load(text) or {}
+        except yaml.YAMLError as err:
+            raise ValueError(f"Malformed YAML: {err}") from err
+    return json.loads(text)
+
+
+def _merge(base, overrides):
+    """Return base with overrides merged in; nested dicts merge, the rest replaces."""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _substitute(value, variables):
+    """Replace ``{variable}`` in every string of a nested value."""
+    if isinstance(value, str):
+        for name, replacement in variables.items():
+            value = value.replace(f"{{{name}}}", replacement)
+        return value
+    if isinstance(value, dict):
+        return {_substitute(key, variables): _substitute(item, variables) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, variables) for item in value]
+    return value
+
+
+def expand(spec):
+    """Expand a parsed catalog file into a flat catalog dict.
+
+    Devices defined later replace earlier (or bundled) devices of the
+    same key.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("catalog must be a mapping")
+    if not isinstance(spec.get("devices") or {}, dict):
+        raise ValueError("devices: must be a mapping")
+    catalog = {}
+    if spec.get("builtin"):
+        for key, config in TEST_DEVICES.items():
+            catalog[key] = copy.deepcopy({name: value for name, value in config.items() if name not in RUNTIME_KEYS})
+
+    for key, template in (spec.get("devices") or {}).items():
+        if not isinstance(template, dict):
+            raise ValueError(f"{key}: device must be a mapping")
+        config = template
+        base = template.get("extends")
+        if base is not None:
+            if base not in catalog:
+                raise ValueError(f"{key}: extends unknown device {base!r}")
+            config = _merge(catalog[base], template)
+        config = {name: value for name, value in config.items() if name not in TEMPLATE_KEYS}
+
+        for_each = template.get("for_each") or {}
+        values = [
+            [str(n) for n in range(1, value + 1)] if isinstance(value, int) else [str(item) for item in value]
+            for value in for_each.values()
+        ]
+        for combination in itertools.product(*values):
+            variables = dict(zip(for_each, combination))
+            catalog[_substitute(key, variables)] = _substitute(copy.deepcopy(config), variables)
+    return catalog
+
+
+def _numbers(where, block, allowed):
+    """Check that a block only holds known keys with numeric values."""
+    if not isinstance(block, dict):
+        raise ValueError(f"{where}: must be a mapping")
+    for name, value in block.items():
+        if name in GATING_KEYS and name not in allowed:
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{where}.{name}: must be a state field name")
+            continue
+        if name not in allowed:
+            raise ValueError(f"{where}: unknown key {name!r}")
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise ValueError(f"{where}.{name}: must be a number")
+
+
+def _model(where, block, defaults):
+    """Check a model block: names where the defaults hold one, gating fields, numbers elsewhere."""
+    if not isinstance(block, dict):
+        raise ValueError(f"{where}: must be a mapping")
+    for name in NAME_KEYS:
+        if name in defaults and block.get(name) is not None and not isinstance(block[name], str):
+            raise ValueError(f"{where}.{name}: must be a name")
+    _numbers(where, {name: value for name, value in block.items() if name not in NAME_KEYS}, [
+        name for name in defaults if name not in NAME_KEYS and name not in GATING_KEYS
+    ])
+
+
+def _reference(where, catalog, target, block):
+    """Check that a device named by a model block exists and has that block."""
+    if target is not None and block not in catalog.get(target, {}):
+        raise ValueError(f"{where}: {target!r} is not a device with a {block} block")
+
+
+def validate(catalog):
+    """Raise ValueError for the first malformed device of a catalog."""
+    names = {}
+    for key, config in catalog.items():
+        for field in ("name", "type", "group"):
+            if not isinstance(config.get(field), str):
+                raise ValueError(f"{key}: missing {field}")
+        if config["group"] not in DEVICE_GROUPS:
+            raise ValueError(f"{key}: group must be one of {', '.join(DEVICE_GROUPS)}")
+        device_id = config["name"].lower()
+        if device_id in names:
+            raise ValueError(f"{key}: name {config['name']!r} already used by {names[device_id]}")
+        names[device_id] = key
+        if not isinstance(config.get("labels", []), list):
+            raise ValueError(f"{key}.labels: must be a list")
+        if not isinstance(config.get("state", {}), dict):
+            raise ValueError(f"{key}.state: must be a mapping")
+
+        for index, sensor in enumerate(config.get("sensors", [])):
+            if not isinstance(sensor, dict) or not isinstance(sensor.get("name"), str):
+                raise ValueError(f"{key}.sensors[{index}]: needs a name")
+            if "model" in sensor:
+                _numbers(f"{key}.sensors[{index}].model", sensor["model"], MODEL_DEFAULTS)
+            if "significance" in sensor:
+                _numbers(f"{key}.sensors[{index}].significance", sensor["significance"], SIGNIFICANCE_DEFAULTS)
+        if "cell" in config and not isinstance(config["cell"], str):
+            raise ValueError(f"{key}.cell: must be a cell name")
+        if "effects" in config:
+            _numbers(f"{key}.effects", config["effects"], CHANNELS)
+        if "actuator" in config:
+            _numbers(f"{key}.actuator", config["actuator"], ACTUATOR_DEFAULTS)
+        if "fixture" in config:
+            fixture = config["fixture"]
+            if not isinstance(fixture, dict):
+                raise ValueError(f"{key}.fixture: must be a mapping")
+            spectrum = fixture.get("spectrum", {})
+            _numbers(f"{key}.fixture.spectrum", spectrum, spectrum)
+            _numbers(
+                f"{key}.fixture",
+                {name: value for name, value in fixture.items() if name != "spectrum"},
+                [name for name in FIXTURE_DEFAULTS if name not in GATING_KEYS],
+            )
+        if "reservoir" in config:
+            reservoir = config["reservoir"]
+            if not isinstance(reservoir, dict):
+                raise ValueError(f"{key}.reservoir: must be a mapping")
+            dosed = reservoir.get("dosed", {})
+            _numbers(f"{key}.reservoir.dosed", dosed, dosed)
+            _model(
+                f"{key}.reservoir",
+                {name: value for name, value in reservoir.items() if name != "dosed"},
+                RESERVOIR_DEFAULTS,
+            )
+            _reference(f"{key}.reservoir.substrate", catalog, reservoir.get("substrate"), "substrate")
+        if "substrate" in config:
+            _model(f"{key}.substrate", config["substrate"], SUBSTRATE_DEFAULTS)
+        if "dosing" in config:
+            dosing = config["dosing"]
+            if not isinstance(dosing, dict):
+                raise ValueError(f"{key}.dosing: must be a mapping")
+            _reference(f"{key}.dosing.reservoir", catalog, dosing.get("reservoir", key), "reservoir")
+            channels = dosing.get("channels", {})
+            if not isinstance(channels, dict):
+                raise ValueError(f"{key}.dosing.channels: must be a mapping")
+            for field, channel in channels.items():
+                _numbers(f"{key}.dosing.channels.{field}", channel, CHANNEL_DEFAULTS)
+        if "irrigation" in config:
+            irrigation = config["irrigation"]
+            _model(f"{key}.irrigation", irrigation, {**IRRIGATION_DEFAULTS, "substrate": None})
+            _reference(f"{key}.irrigation.substrate", catalog, irrigation.get("substrate", key), "substrate")
+            _reference(f"{key}.irrigation.reservoir", catalog, irrigation.get("reservoir"), "reservoir")
+
+
+def _builtin_digest():
+    """Return a hash of the bundled catalog, so caches built on it expire with it."""
+    builtin = {
+        key: {name: value for name, value in config.items() if name not in RUNTIME_KEYS}
+        for key, config in TEST_DEVICES.items()
+    }
+    return hashlib.sha256(json.dumps(builtin, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def load_catalog(path, cache_dir=None):
+    """Return the catalog of a YAML/JSON file, or None when there is none.
+
+    The compiled catalog is cached in ``cache_dir`` (default: next to
+    the file) under the hash of the file's contents; older caches of
+    the same file are removed when a new one is written.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        raw = file.read()
+    digest = hashlib.sha256(raw + f"{VERSION}:{CACHE_VERSION}:{_builtin_digest()}".encode()).hexdigest()[:16]
+    cache_dir = cache_dir or os.path.dirname(os.path.abspath(path))
+    stem = f"{CACHE_PREFIX}.{os.path.basename(path)}"
+    cache_path = os.path.join(cache_dir, f"{stem}.{digest}.pickle")
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as file:
+                compiled = pickle.load(file)
+            if compiled.get("version") == CACHE_VERSION:
+                return compiled["devices"]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+
+    catalog = expand(_parse(path, raw.decode("utf-8")))
+    validate(catalog)
+    compiled = {"version": CACHE_VERSION, "devices": catalog}
+    os.makedirs(cache_dir, exist_ok=True)
+    for name in os.listdir(cache_dir):
+        if name.startswith(f"{stem}.") and name.endswith(".pickle") and name != os.path.basename(cache_path):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except FileNotFoundError:
+                pass
+    temporary = f"{cache_path}.tmp"
+    with open(temporary, "wb") as file:
+        pickle.dump(compiled, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, cache_path)
+    return catalog
@@ -5,6 +5,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import UnitOfTemperature
 from .const import DOMAIN
+from .writer import async_schedule_write
 from .devices import TEST_DEVICES
 from . import OGBDevRestoreEntity
 
@@ -48,7 +49,7 @@ class OGBDevClimate(OGBDevRestoreEntity, ClimateEntity):
         self._attr_target_temperature = 23.0
         self._attr_min_temp = 10
         self._attr_max_temp = 50
-        self._attr_hvac_modes = [HVACMode.OFF, HVACMode.HEAT, HVACMode.COOL, HVACMode.DRY]
+        self._attr_hvac_modes = [HVACMode.OFF, HVACMode.HEAT, HVACMode.COOL, HVACMode.DRY, HVACMode.AUTO]
         self._attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE
 
         self._attr_device_info = {
@@ -64,12 +65,15 @@ class OGBDevClimate(OGBDevRestoreEntity, ClimateEntity):
 
         restored_target = await self._async_restore_state("target_temperature", 23.0)
         self._attr_target_temperature = float(restored_target) if restored_target else 23.0
+        await self._state_manager.async_set_controller("temperature", target=self._attr_target_temperature)
 
         heater_on = await self._async_restore_device_state("heater", "power")
         cooler_on = await self._async_restore_device_state("cooler", "power")
         dehumid_on = await self._async_restore_device_state("dehumidifier", "power")
 
-        if heater_on:
+        if self._state_manager.controller_output("temperature") is not None:
+            self._attr_hvac_mode = HVACMode.AUTO
+        elif heater_on:
             self._attr_hvac_mode = HVACMode.HEAT
         elif cooler_on:
             self._attr_hvac_mode = HVACMode.COOL
@@ -78,8 +82,7 @@ class OGBDevClimate(OGBDevRestoreEntity, ClimateEntity):
         else:
             self._attr_hvac_mode = HVACMode.OFF
 
-        self._hass.states.async_set(self.entity_id, self._attr_hvac_mode)
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     @property
     def current_temperature(self):
@@ -96,6 +99,8 @@ class OGBDevClimate(OGBDevRestoreEntity, ClimateEntity):
     @property
     def hvac_mode(self):
         """Return hvac operation."""
+        if self._state_manager.controller_output("temperature") is not None:
+            return HVACMode.AUTO
         heater_state = self._state_manager.get_device_state("heater").get("power", False)
         cooler_state = self._state_manager.get_device_state("cooler").get("power", False)
         dehumidifier_state = self._state_manager.get_device_state("dehumidifier").get("power", False)
@@ -112,7 +117,14 @@ class OGBDevClimate(OGBDevRestoreEntity, ClimateEntity):
     def hvac_action(self):
         """Return the current running hvac operation."""
         mode = self.hvac_mode
-        if mode == HVACMode.HEAT:
+        if mode == HVACMode.AUTO:
+            duty = self._state_manager.controller_output("temperature") or 0.0
+            if duty > 0:
+                return HVACAction.HEATING
+            elif duty < 0:
+                return HVACAction.COOLING
+            return HVACAction.IDLE
+        elif mode == HVACMode.HEAT:
             return HVACAction.HEATING
         elif mode == HVACMode.COOL:
             return HVACAction.COOLING
@@ -125,26 +137,28 @@ class OGBDevClimate(OGBDevRestoreEntity, ClimateEntity):
         """Set new target temperature."""
         if "temperature" in kwargs:
             self._attr_target_temperature = kwargs["temperature"]
-            self.async_write_ha_state()
+            await self._state_manager.async_set_controller("temperature", target=self._attr_target_temperature)
+            async_schedule_write(self)
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new target hvac mode."""
-        if hvac_mode == HVACMode.OFF:
-            await self._state_manager.set_device_state("heater", "power", False)
-            await self._state_manager.set_device_state("cooler", "power", False)
-            await self._state_manager.set_device_state("dehumidifier", "power", False)
+        correlation_id = self._correlation_id()
+        await self._state_manager.async_set_controller("temperature", enabled=hvac_mode == HVACMode.AUTO)
+        if hvac_mode in (HVACMode.OFF, HVACMode.AUTO):
+            await self._state_manager.set_device_state("heater", "power", False, correlation_id)
+            await self._state_manager.set_device_state("cooler", "power", False, correlation_id)
+            await self._state_manager.set_device_state("dehumidifier", "power", False, correlation_id)
         elif hvac_mode == HVACMode.HEAT:
-            await self._state_manager.set_device_state("heater", "power", True)
-            await self._state_manager.set_device_state("cooler", "power", False)
-            await self._state_manager.set_device_state("dehumidifier", "power", False)
+            await self._state_manager.set_device_state("heater", "power", True, correlation_id)
+            await self._state_manager.set_device_state("cooler", "power", False, correlation_id)
+            await self._state_manager.set_device_state("dehumidifier", "power", False, correlation_id)
         elif hvac_mode == HVACMode.COOL:
-            await self._state_manager.set_device_state("heater", "power", False)
-            await self._state_manager.set_device_state("cooler", "power", True)
-            await self._state_manager.set_device_state("dehumidifier", "power", False)
+            await self._state_manager.set_device_state("heater", "power", False, correlation_id)
+            await self._state_manager.set_device_state("cooler", "power", True, correlation_id)
+            await self._state_manager.set_device_state("dehumidifier", "power", False, correlation_id)
         elif hvac_mode == HVACMode.DRY:
-            await self._state_manager.set_device_state("heater", "power", False)
-            await self._state_manager.set_device_state("cooler", "power", False)
-            await self._state_manager.set_device_state("dehumidifier", "power", True)
+            await self._state_manager.set_device_state("heater", "power", False, correlation_id)
+            await self._state_manager.set_device_state("cooler", "power", False, correlation_id)
+            await self._state_manager.set_device_state("dehumidifier", "power", True, correlation_id)
         self._attr_hvac_mode = hvac_mode
-        self._hass.states.async_set(self.entity_id, hvac_mode)
-        self.async_write_ha_state()
+        async_schedule_write(self)
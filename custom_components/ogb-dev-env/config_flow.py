@@ -3,13 +3,47 @@
 import logging
 import voluptuous as vol
 from homeassistant import config_entries
-from .const import DOMAIN
+from homeassistant.core import callback
+from .const import (
+    DOMAIN,
+    CONF_SIMULATION_EXECUTOR,
+    EXECUTOR_EVENT_LOOP,
+    EXECUTORS,
+    CONF_PHOTOPERIOD_START,
+    DEFAULT_PHOTOPERIOD_START,
+    CONF_CONTROLLER_ALGORITHM,
+    CONF_TENT_PROFILE,
+    PROFILES_FILE,
+    PLATFORMS,
+    CONF_PLATFORMS,
+    CONF_DEVICE_GROUPS,
+    CONF_STATE_WRITE_WINDOW,
+    CONF_STATE_WRITE_INTERVAL,
+)
+from .controllers import ALGORITHMS, GAINS, MODE_PID
+from .devices import CONTROLLERS, DEVICE_GROUPS
+from .profiles import DEFAULT_TENT_PROFILE, TENT_PROFILES, load_profiles
 _LOGGER = logging.getLogger(__name__)
 from homeassistant.helpers import selector
 
-AREA_SCHEMA = vol.Schema({
-    vol.Optional("area_name", default="Demo Room"): str,
-})
+
+async def _async_load_profiles(hass):
+    """Return the bundled and calibrated tent profiles, or the bundled ones on error."""
+    try:
+        return await hass.async_add_executor_job(load_profiles, hass.config.path(PROFILES_FILE))
+    except (ValueError, OSError) as err:
+        _LOGGER.warning(f"Invalid tent profiles {PROFILES_FILE}: {err}")
+        return TENT_PROFILES
+
+
+def _area_schema(profiles):
+    """Return the zone schema, listing bundled and calibrated tent profiles."""
+    return vol.Schema({
+        vol.Optional("area_name", default="Demo Room"): str,
+        vol.Optional(CONF_TENT_PROFILE, default=DEFAULT_TENT_PROFILE): selector.SelectSelector(
+            selector.SelectSelectorConfig(options=list(profiles))
+        ),
+    })
 
 
 class ConfigFlow(config_entries.ConfigFlow,domain=DOMAIN):
@@ -17,13 +51,20 @@ class ConfigFlow(config_entries.ConfigFlow,domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow."""
+        return OptionsFlowHandler()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         _LOGGER.debug("OGB Dev ConfigFlow step_user called")
         if user_input is None:
+            profiles = await _async_load_profiles(self.hass)
             return self.async_show_form(
                 step_id="user",
-                data_schema=AREA_SCHEMA,
+                data_schema=_area_schema(profiles),
             )
 
         return self.async_create_entry(
@@ -44,4 +85,74 @@ class ConfigFlow(config_entries.ConfigFlow,domain=DOMAIN):
         return self.async_show_form(
             step_id="user",
             data_schema=data_schema,
-        )
\ No newline at end of file
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for OGB Dev Environment."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage simulation options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        profiles = await _async_load_profiles(self.hass)
+        options = self.config_entry.options
+        data_schema = vol.Schema({
+            vol.Optional(
+                CONF_TENT_PROFILE,
+                default=options.get(CONF_TENT_PROFILE, self.config_entry.data.get(CONF_TENT_PROFILE, DEFAULT_TENT_PROFILE)),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=list(profiles))
+            ),
+            vol.Optional(
+                CONF_SIMULATION_EXECUTOR,
+                default=options.get(CONF_SIMULATION_EXECUTOR, EXECUTOR_EVENT_LOOP),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=EXECUTORS)
+            ),
+            vol.Optional(
+                CONF_PHOTOPERIOD_START,
+                default=options.get(CONF_PHOTOPERIOD_START, DEFAULT_PHOTOPERIOD_START),
+            ): selector.TimeSelector(),
+            vol.Optional(
+                CONF_CONTROLLER_ALGORITHM,
+                default=options.get(CONF_CONTROLLER_ALGORITHM, MODE_PID),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=ALGORITHMS)
+            ),
+            vol.Optional(
+                CONF_PLATFORMS,
+                default=options.get(CONF_PLATFORMS, PLATFORMS),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=PLATFORMS, multiple=True)
+            ),
+            vol.Optional(
+                CONF_DEVICE_GROUPS,
+                default=options.get(CONF_DEVICE_GROUPS, DEVICE_GROUPS),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=DEVICE_GROUPS, multiple=True)
+            ),
+            vol.Optional(
+                CONF_STATE_WRITE_WINDOW,
+                default=options.get(CONF_STATE_WRITE_WINDOW, 0.0),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=60, step="any", unit_of_measurement="s", mode=selector.NumberSelectorMode.BOX)
+            ),
+            vol.Optional(
+                CONF_STATE_WRITE_INTERVAL,
+                default=options.get(CONF_STATE_WRITE_INTERVAL, 0.0),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=3600, step="any", unit_of_measurement="s", mode=selector.NumberSelectorMode.BOX)
+            ),
+        })
+        for loop, config in CONTROLLERS.items():
+            for gain in GAINS:
+                key = f"{loop}_{gain}"
+                data_schema = data_schema.extend({
+                    vol.Optional(key, default=options.get(key, config[gain])): selector.NumberSelector(
+                        selector.NumberSelectorConfig(min=0, max=100, step="any", mode=selector.NumberSelectorMode.BOX)
+                    ),
+                })
+
+        return self.async_show_form(step_id="init", data_schema=data_schema)
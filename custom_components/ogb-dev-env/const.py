@@ -1,2 +1,37 @@
 DOMAIN = "ogb-dev-env"
-VERSION = "0.0.1"
\ No newline at end of file
+VERSION = "0.0.1"
+
+SIMULATION_INTERVAL = 30
+
+CONF_SIMULATION_EXECUTOR = "simulation_executor"
+EXECUTOR_EVENT_LOOP = "event_loop"
+EXECUTOR_PROCESS = "process"
+EXECUTORS = [EXECUTOR_EVENT_LOOP, EXECUTOR_PROCESS]
+
+CONF_PHOTOPERIOD_START = "photoperiod_start"
+DEFAULT_PHOTOPERIOD_START = "00:00:00"
+
+CONF_TENT_PROFILE = "tent_profile"
+# Calibrated tent profiles (see calibration.py) in the Home Assistant config directory.
+PROFILES_FILE = "ogb_dev_env_profiles.json"
+# Device catalog (YAML or JSON, see catalog.py) replacing the bundled one.
+CATALOG_FILE = "ogb_dev_env_devices.yaml"
+# Directory in the config directory that snapshot files are written to and read from.
+SNAPSHOT_DIR = "ogb_dev_env_snapshots"
+
+# Algorithm of the reference controllers; gains are "<loop>_<gain>" options.
+CONF_CONTROLLER_ALGORITHM = "controller_algorithm"
+
+# Platforms forwarded when enabled; device groups are the catalog "group" values.
+PLATFORMS = ["sensor", "switch", "light", "fan", "climate", "humidifier", "select"]
+CONF_PLATFORMS = "platforms"
+CONF_DEVICE_GROUPS = "device_groups"
+
+# Entity state writes: flush window (s) and minimum seconds between writes of one entity.
+CONF_STATE_WRITE_WINDOW = "state_write_window"
+CONF_STATE_WRITE_INTERVAL = "state_write_interval"
+
+# Registry devices created from entity device_info rather than the catalog.
+CONTROL_DEVICES = ("climate_control", "humidity_control", "environment_control")
+
+WORKER_POOL = "worker_pool"
@@ -0,0 +1,155 @@
+"""Reference climate controllers for OGB Dev Environment."""
+
+MODE_OFF = "off"
+MODE_PID = "pid"
+MODE_HYSTERESIS = "hysteresis"
+MODES = [MODE_OFF, MODE_PID, MODE_HYSTERESIS]
+ALGORITHMS = [MODE_PID, MODE_HYSTERESIS]
+
+# Tunable parameters exposed as options.
+GAINS = ("kp", "ki", "kd", "band")
+
+CONTROLLER_DEFAULTS = {
+    "mode": MODE_OFF,
+    "target": 0.0,
+    "kp": 0.5,  # duty per unit of error
+    "ki": 0.001,  # duty per unit of error and second
+    "kd": 0.0,  # duty per unit per second the measurement changes
+    "band": 0.5,  # hysteresis: switch on this far from the target
+    "cycle": 0.0,  # s of a time-proportioning window, 0 drives the duty directly
+}
+
+
+class Controller:
+    """One closed loop driving a ``raise`` and a ``lower`` actuator.
+
+    The output is a duty from -1 (``lower`` at full output) to 1
+    (``raise`` at full output). PID takes the derivative on the
+    measurement and stops integrating while the output saturates;
+    hysteresis switches fully on beyond ``band`` and off again once the
+    measurement crosses the target.
+    """
+
+    __slots__ = (
+        "key", "measure", "raise_device", "lower_device", "mode", "target",
+        "kp", "ki", "kd", "band", "cycle", "integral", "previous", "output",
+    )
+
+    def __init__(self, key, config):
+        params = {**CONTROLLER_DEFAULTS, **config}
+        self.key = key
+        self.measure = params["measure"]
+        self.raise_device = params.get("raise")
+        self.lower_device = params.get("lower")
+        self.mode = params["mode"]
+        self.target = float(params["target"])
+        self.kp = float(params["kp"])
+        self.ki = float(params["ki"])
+        self.kd = float(params["kd"])
+        self.band = float(params["band"])
+        self.cycle = float(params["cycle"])
+        self.reset()
+
+    def reset(self):
+        """Forget the integral and derivative history."""
+        self.integral = 0.0
+        self.previous = None
+        self.output = 0.0
+
+    def step(self, value, dt):
+        """Return the duty for a measurement taken dt seconds after the last."""
+        error = self.target - value
+        if self.mode == MODE_HYSTERESIS:
+            output = self.output
+            if error > self.band:
+                output = 1.0
+            elif error < -self.band:
+                output = -1.0
+            elif (output > 0 and error <= 0) or (output < 0 and error >= 0):
+                output = 0.0
+        else:
+            derivative = 0.0
+            if self.previous is not None and dt > 0:
+                derivative = (value - self.previous) / dt
+            integral = self.integral + error * dt
+            output = self.kp * error + self.ki * integral - self.kd * derivative
+            if -1.0 < output < 1.0:
+                self.integral = integral
+            output = max(-1.0, min(1.0, output))
+        self.previous = value
+        self.output = output
+        return output
+
+
+class ControllerBank:
+    """Closed loops evaluated inside the simulation step.
+
+    Active loops write a duty per actuator that replaces the commanded
+    state, so the loop runs at the simulation rate with no Home
+    Assistant round trip per decision. Loops that are off cost nothing
+    and leave their actuators to the entities.
+    """
+
+    def __init__(self, configs, devices):
+        self.controllers = {key: Controller(key, config) for key, config in (configs or {}).items()}
+        index = {key: position for position, key in enumerate(devices)}
+        self._outputs = [
+            (controller, index.get(controller.raise_device), index.get(controller.lower_device))
+            for controller in self.controllers.values()
+        ]
+        self.duty = [None] * len(devices)
+
+    def configure(self, key, **params):
+        """Change a loop's mode, target or gains."""
+        controller = self.controllers[key]
+        mode = params.pop("mode", None)
+        if mode is not None and mode != controller.mode:
+            controller.mode = mode
+            controller.reset()
+        for name, value in params.items():
+            if value is not None and name in CONTROLLER_DEFAULTS and name != "mode":
+                setattr(controller, name, float(value))
+        if controller.mode == MODE_OFF:
+            for output in self._outputs:
+                if output[0] is controller:
+                    for index in output[1:]:
+                        if index is not None:
+                            self.duty[index] = None
+
+    def update(self, environment, dt, clock):
+        """Step every active loop and return the per-actuator duty."""
+        duty = self.duty
+        for controller, raise_index, lower_index in self._outputs:
+            if controller.mode == MODE_OFF:
+                continue
+            value = environment.get(controller.measure)
+            output = controller.output if value is None else controller.step(value, dt)
+            cycle = controller.cycle
+            if cycle and output:
+                magnitude = 1.0 if clock % cycle < abs(output) * cycle else 0.0
+                output = magnitude if output > 0 else -magnitude
+            if raise_index is not None:
+                duty[raise_index] = max(0.0, output)
+            if lower_index is not None:
+                duty[lower_index] = max(0.0, -output)
+        return duty
+
+    def output(self, key):
+        """Return a loop's duty, or None while it is off."""
+        controller = self.controllers.get(key)
+        if controller is None or controller.mode == MODE_OFF:
+            return None
+        return controller.output
+
+    def as_dict(self):
+        """Return the mode and target of every loop."""
+        return {
+            key: {"mode": controller.mode, "target": controller.target}
+            for key, controller in self.controllers.items()
+        }
+
+    def restore(self, data):
+        """Restore loops saved with as_dict."""
+        for key, params in data.items():
+            if key in self.controllers:
+                self.configure(key, **params)
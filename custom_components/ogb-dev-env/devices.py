@@ -10,11 +10,82 @@ ENVIRONMENT = {
     "water_temperature": 18.0,
 }
 
+# Electricity tariff of the zone: a default price per kWh plus time-of-use
+# periods ("HH:MM" start/end, optional weekdays with 0 as Monday).
+TARIFF = {
+    "name": "standard",
+    "price": 0.30,
+    "periods": [
+        {"name": "off_peak", "price": 0.20, "start": "22:00", "end": "06:00"},
+        {"name": "peak", "price": 0.42, "start": "17:00", "end": "20:00", "days": [0, 1, 2, 3, 4]},
+    ],
+}
+
+# Reference control loops: each drives a "raise" and a "lower" actuator
+# toward a target for an environment key while its mode is not "off".
+CONTROLLERS = {
+    "temperature": {
+        "measure": "air_temperature", "target": 23.0, "raise": "heater", "lower": "cooler",
+        "kp": 0.5, "ki": 0.0005, "kd": 0.0, "band": 0.5,
+    },
+    "humidity": {
+        "measure": "air_humidity", "target": 60.0, "raise": "humidifier", "lower": "dehumidifier",
+        "kp": 0.1, "ki": 0.0001, "kd": 0.0, "band": 3.0,
+    },
+}
+
+# Air cells of the tent, bottom to top; devices with a "cell" deposit their
+# heat, moisture and intake air there (see spatial.SPATIAL_DEFAULTS, or
+# spatial.grid_cells for a 3D grid). Each cell publishes
+# air_temperature_<cell> and air_humidity_<cell> for sensors to read.
+SPATIAL = {
+    "cells": ["bottom", "canopy", "top"],
+    "links": [["bottom", "canopy"], ["canopy", "top"]],
+    "canopy_cell": "canopy",
+}
+
+# Plant canopy of the zone; see plant.CANOPY_DEFAULTS for every parameter.
+# Its area defaults to the floor of the selected tent profile.
+CANOPY = {
+    "stage": "vegetative",
+}
+
+# Every device belongs to one "group"; the zone's options enable groups
+# selectively, and disabled groups get no registry devices or entities.
+DEVICE_GROUPS = ["lights", "climate", "ventilation", "sensors", "water"]
+
+# Sensors with a "source" read that environment value through a measurement
+# "model": lag (s), bias, drift (per hour), noise (sigma), quantization,
+# sample_interval (s) and dropout (probability per sample).
+# A sensor's "write_interval" (s) rate-limits its state writes, and its
+# "significance" rule (absolute, relative, max_age) overrides the default
+# of its unit (see measurement.UNIT_SIGNIFICANCE).
+# "effects" declare what a device does to the tent while it is switched on:
+# heat (W), exhaust/intake/mixing airflow (m³/h), moisture (g/h), co2 (L/h),
+# water uptake (L/h) and ppfd (µmol/m²/s at the canopy).
+# Values scale with the optional 0-100 "level" state field; "switch" names
+# the gating field (default "power").
+# A "fixture" block describes a light: watts, efficacy (µmol/J), photon
+# fraction per spectral bin (uv, blue, green, red, far_red), utilization
+# and the optional "level" dimming field; its heat and photons are added
+# to the heat and ppfd channels.
+# An "actuator" block gives a device dynamics and a power draw: watts at
+# full output, standby W, ramp (%/s), min_on/min_off (s) and inrush
+# (multiple of rated power for inrush_time s). Its effects and fixture
+# then follow the ramped output instead of the commanded state.
+# A "reservoir" block makes a device a nutrient reservoir; "dosing" blocks
+# map switch fields to dosing channels (flow mL/s, ec per mL/L, alkalinity
+# meq/mL) of a reservoir.
+# A "substrate" block makes a device's medium a water balance; "irrigation"
+# blocks declare emitters (flow L/h, gating "switch") feeding a substrate,
+# drawn from a "reservoir" when one is named.
 TEST_DEVICES = {
     "light_main": {
+        "cell": "top",
         "name": "DevMainLight",
         "type": "Light",
         "labels": ["Light"],
+        "group": "lights",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {
@@ -24,28 +95,50 @@ TEST_DEVICES = {
             "power": False,
             "intensity": 20
         },
+        "fixture": {
+            "watts": 600,
+            "efficacy": 2.7,
+            "spectrum": {"uv": 0.01, "blue": 0.17, "green": 0.2, "red": 0.54, "far_red": 0.08},
+            "level": "intensity"
+        },
+        "actuator": {"watts": 600, "standby": 1, "ramp": 5, "inrush": 3, "inrush_time": 0.5},
         "sensors": [
             {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"},
-            {"name": "par", "unit": "µmol/m²/s", "icon": "mdi:white-balance-sunny"},
-            {"name": "duty", "unit": "%", "icon": "mdi:lightbulb"}
+            {"name": "par", "unit": "µmol/m²/s", "icon": "mdi:white-balance-sunny", "source": "ppfd",
+             "model": {"noise": 2, "quantization": 1}},
+            {"name": "duty", "unit": "%", "icon": "mdi:lightbulb"},
+            {"name": "red_far_red_ratio", "unit": "", "icon": "mdi:chart-bell-curve", "source": "red_far_red_ratio",
+             "model": {"quantization": 0.01}},
+            {"name": "blue_red_ratio", "unit": "", "icon": "mdi:chart-bell-curve", "source": "blue_red_ratio",
+             "model": {"quantization": 0.01}}
         ]
     },
     "dumb_light": {
+        "cell": "top",
         "name": "DevDumbLight",
         "type": "Light",
         "labels": ["Light"],
+        "group": "lights",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "fixture": {
+            "watts": 300,
+            "efficacy": 2.2,
+            "spectrum": {"blue": 0.2, "green": 0.25, "red": 0.5, "far_red": 0.05}
+        },
+        "actuator": {"watts": 300, "inrush": 5, "inrush_time": 0.2},
         "sensors": []
     },
     "light_ir": {
+        "cell": "top",
         "name": "DevFarRedLight",
         "type": "Light",
         "labels": ["LightFarRed"],
+        "group": "lights",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
@@ -53,14 +146,19 @@ TEST_DEVICES = {
             "power": False,
             "intensity": 0
         },
+        "fixture": {"watts": 60, "efficacy": 2.0, "spectrum": {"far_red": 1.0}, "level": "intensity"},
+        "actuator": {"watts": 60, "ramp": 10},
         "sensors": [
-            {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"}
+            {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"},
+            {"name": "Far Red PPFD", "unit": "µmol/m²/s", "icon": "mdi:white-balance-sunny", "source": "ppfd_far_red",
+             "model": {"noise": 0.5, "quantization": 0.1}}
         ]
     },
     "switch_light_ir": {
         "name": "DevFarRedLightSwitch",
         "type": "Switch",
         "labels": ["Switch"],
+        "group": "lights",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
@@ -70,9 +168,11 @@ TEST_DEVICES = {
         "sensors": []
     },
     "light_red": {
+        "cell": "top",
         "name": "DevRedLight",
         "type": "Light",
         "labels": ["LightRed"],
+        "group": "lights",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
@@ -80,14 +180,20 @@ TEST_DEVICES = {
             "power": False,
             "intensity": 0
         },
+        "fixture": {"watts": 80, "efficacy": 3.0, "spectrum": {"red": 1.0}, "level": "intensity"},
+        "actuator": {"watts": 80, "ramp": 10},
         "sensors": [
-            {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"}
+            {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"},
+            {"name": "Red PPFD", "unit": "µmol/m²/s", "icon": "mdi:white-balance-sunny", "source": "ppfd_red",
+             "model": {"noise": 0.5, "quantization": 0.1}}
         ]
     },
     "light_blue": {
+        "cell": "top",
         "name": "DevBlueLight",
         "type": "Light",
         "labels": ["LightBlue"],
+        "group": "lights",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
@@ -95,14 +201,20 @@ TEST_DEVICES = {
             "power": False,
             "intensity": 0
         },
+        "fixture": {"watts": 80, "efficacy": 2.4, "spectrum": {"blue": 1.0}, "level": "intensity"},
+        "actuator": {"watts": 80, "ramp": 10},
         "sensors": [
-            {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"}
+            {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"},
+            {"name": "Blue PPFD", "unit": "µmol/m²/s", "icon": "mdi:white-balance-sunny", "source": "ppfd_blue",
+             "model": {"noise": 0.5, "quantization": 0.1}}
         ]
     },
     "light_uv": {
+        "cell": "top",
         "name": "DevUVLight",
         "type": "Light",
         "labels": ["LightUV"],
+        "group": "lights",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
@@ -110,100 +222,140 @@ TEST_DEVICES = {
             "power": False,
             "intensity": 0
         },
+        "fixture": {"watts": 40, "efficacy": 0.8, "spectrum": {"uv": 1.0}, "level": "intensity"},
+        "actuator": {"watts": 40, "ramp": 10},
         "sensors": [
-            {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"}
+            {"name": "intensity", "unit": "%", "icon": "mdi:brightness-6"},
+            {"name": "UV Intensity", "unit": "µmol/m²/s", "icon": "mdi:white-balance-sunny", "source": "uv_intensity",
+             "model": {"noise": 0.1, "quantization": 0.1}}
         ]
     },
     "sensor_main": {
         "name": "DevSoilSensor",
         "type": "Sensor",
         "labels": ["Sensor"],
+        "group": "sensors",
         "manufacturer": "OpenGrowBox",
         "model": "Dev Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "substrate": {
+            "volume": 11.0,
+            "moisture": 55.0,
+            "ec": 1.2,
+            "field_capacity": 60.0
+        },
         "sensors": [
-            {"name": "moisture", "unit": "%", "value": 55.0},
-            {"name": "conductivity", "unit": "µS/cm", "value": 1200.0},
-            {"name": "temperature", "unit": "°C", "value": 22.0},
-            {"name": "soil_temperature", "unit": "°C", "value": 22.0},
-            {"name": "illuminance", "unit": "lx", "value": 200.0}
+            {"name": "moisture", "unit": "%", "value": 55.0, "source": "substrate_moisture",
+             "model": {"lag": 120, "noise": 0.3, "quantization": 0.1}},
+            {"name": "conductivity", "unit": "µS/cm", "value": 1200.0, "source": "substrate_ec",
+             "model": {"lag": 120, "noise": 8, "quantization": 1}},
+            {"name": "temperature", "unit": "°C", "value": 22.0, "source": "air_temperature",
+             "model": {"lag": 60, "noise": 0.05, "quantization": 0.1}},
+            {"name": "soil_temperature", "unit": "°C", "value": 22.0, "source": "soil_temperature",
+             "model": {"lag": 300, "noise": 0.02, "quantization": 0.1}},
+            {"name": "illuminance", "unit": "lx", "value": 200.0, "source": "illuminance",
+             "model": {"noise": 20, "quantization": 1}}
         ]
     },
     "heater": {
+        "cell": "bottom",
         "name": "DevHeater",
         "type": "Heater",
         "labels": ["Heater"],
+        "group": "climate",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"heat": 600},
+        "actuator": {"watts": 600, "min_on": 60, "min_off": 60},
         "sensors": []  # No sensors for heater
     },
     "cooler": {
+        "cell": "bottom",
         "name": "DevCooler",
         "type": "Cooler",
         "labels": ["Cooler"],
+        "group": "climate",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"heat": -300},
+        "actuator": {"watts": 350, "min_on": 180, "min_off": 300, "inrush": 6, "inrush_time": 1},
         "sensors": []  # No sensors for cooler
     },
     "humidifier": {
+        "cell": "canopy",
         "name": "DevHumidifier",
         "type": "Humidifier",
         "labels": ["Humidifier"],
+        "group": "climate",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"moisture": 400},
+        "actuator": {"watts": 30, "min_off": 30},
         "sensors": []  # No sensors for humidifier
     },
     "dehumidifier": {
+        "cell": "canopy",
         "name": "DevDehumidifier",
         "type": "Dehumidifier",
         "labels": ["Dehumidifier"],
+        "group": "climate",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"moisture": -640},
+        "actuator": {"watts": 300, "min_on": 120, "min_off": 180, "inrush": 5, "inrush_time": 1},
         "sensors": []  # No sensors for dehumidifier
     },
     "exhaust": {
+        "cell": "top",
         "name": "DevExhaustFan",
         "type": "Exhaust",
         "labels": ["Exhaust"],
+        "group": "ventilation",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"exhaust": 200, "level": "percentage"},
+        "actuator": {"watts": 45, "ramp": 2, "inrush": 2, "inrush_time": 1},
         "sensors": [
             {"name": "duty", "unit": "%", "icon": "mdi:fan"}
         ]
     },
     "intake": {
+        "cell": "bottom",
         "name": "DevIntakeFan",
         "type": "Intake",
         "labels": ["Intake"],
+        "group": "ventilation",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"intake": 240, "level": "percentage"},
+        "actuator": {"watts": 45, "ramp": 2, "inrush": 2, "inrush_time": 1},
         "sensors": [
             {"name": "duty", "unit": "%", "icon": "mdi:fan"}
         ]
@@ -212,6 +364,7 @@ TEST_DEVICES = {
         "name": "DevVentilationSwitch",
         "type": "Ventilation",
         "labels": ["Ventilation"],
+        "group": "ventilation",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
@@ -224,12 +377,15 @@ TEST_DEVICES = {
         "name": "DevVentilationFan",
         "type": "Ventilation",
         "labels": ["Ventilation"],
+        "group": "ventilation",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"mixing": 300, "level": "percentage"},
+        "actuator": {"watts": 20, "ramp": 5},
         "sensors": [
             {"name": "duty", "unit": "%", "icon": "mdi:fan"}
         ]
@@ -238,6 +394,7 @@ TEST_DEVICES = {
         "name": "DevCO2Device",
         "type": "Sensor",
         "labels": ["CO2"],
+        "group": "climate",
         "manufacturer": "OpenGrowBox",
         "model": "Dev Environment",
         "device_id": "devco2device",
@@ -248,104 +405,146 @@ TEST_DEVICES = {
             "power": False,
             "co2": False
         },
+        "effects": {"co2": 5.0, "switch": "co2"},
+        "actuator": {"watts": 8},
         "sensors": [
-            {"name": "co2", "unit": "ppm", "value": 950.0}
+            {"name": "co2", "unit": "ppm", "value": 950.0, "source": "co2_level",
+             "model": {"lag": 60, "noise": 8, "quantization": 1, "sample_interval": 15},
+             "significance": {"absolute": 25.0}}
         ]
     },
     "dumb_exhaust": {
         "name": "DevDumbExhaustFan",
         "type": "Dumb Exhaust",
         "labels": ["Fan"],
+        "group": "ventilation",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"exhaust": 200},
+        "actuator": {"watts": 40, "inrush": 2, "inrush_time": 1},
         "sensors": []
     },
     "dumb_intake": {
         "name": "DevDumbIntakeFan",
         "type": "Dumb Intake",
         "labels": ["Fan"],
+        "group": "ventilation",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "effects": {"intake": 240},
+        "actuator": {"watts": 40, "inrush": 2, "inrush_time": 1},
         "sensors": []
     },
     "air_sensor": {
         "name": "DevSensor1",
         "type": "Air Sensor",
         "labels": ["Sensor"],
+        "group": "sensors",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
+        "cell": "canopy",
         "setters": {},
         "state": {
             "power": False
         },
         "sensors": [
-            {"name": "temperature", "unit": "°C", "value": 23.5},
-            {"name": "humidity", "unit": "%", "value": 60.0}
+            {"name": "temperature", "unit": "°C", "value": 23.5, "source": "air_temperature_canopy",
+             "model": {"lag": 30, "noise": 0.05, "quantization": 0.1}},
+            {"name": "humidity", "unit": "%", "value": 60.0, "source": "air_humidity_canopy",
+             "model": {"lag": 45, "noise": 0.2, "quantization": 0.1}}
         ]
     },
     "air_sensor_2": {
         "name": "DevSensor2",
         "type": "Air Sensor",
         "labels": ["Sensor"],
+        "group": "sensors",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
+        "cell": "top",
         "setters": {},
         "state": {
             "power": False
         },
         "sensors": [
-            {"name": "temperature", "unit": "°C", "value": 23.5},
-            {"name": "humidity", "unit": "%", "value": 60.0}
+            {"name": "temperature", "unit": "°C", "value": 23.5, "source": "air_temperature_top",
+             "model": {"lag": 30, "noise": 0.05, "quantization": 0.1}},
+            {"name": "humidity", "unit": "%", "value": 60.0, "source": "air_humidity_top",
+             "model": {"lag": 45, "noise": 0.2, "quantization": 0.1}}
         ]
     },
     "air_sensor_3": {
         "name": "DevSensor3",
         "type": "Air Sensor",
         "labels": ["Sensor"],
+        "group": "sensors",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
+        "cell": "bottom",
         "setters": {},
         "state": {
             "power": False
         },
         "sensors": [
-            {"name": "temperature", "unit": "°C", "value": 23.5},
-            {"name": "humidity", "unit": "%", "value": 60.0}
+            {"name": "temperature", "unit": "°C", "value": 23.5, "source": "air_temperature_bottom",
+             "model": {"lag": 30, "drift": 0.002, "noise": 0.05, "quantization": 0.1}},
+            {"name": "humidity", "unit": "%", "value": 60.0, "source": "air_humidity_bottom",
+             "model": {"lag": 45, "drift": 0.01, "noise": 0.2, "quantization": 0.1}}
         ]
     },
     "water_pump": {
         "name": "DevWaterPump",
         "type": "Water Pump",
         "labels": ["Pump"],
+        "group": "water",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
         "state": {
             "power": False
         },
+        "reservoir": {
+            "capacity": 50.0,
+            "volume": 37.5,
+            "alkalinity": -60.0,
+            "dosed": {"feedpump_a": 30.0, "feedpump_b": 30.0},
+            "pump_flow": 120.0,
+            "substrate": "sensor_main"
+        },
+        "actuator": {"watts": 35, "inrush": 3, "inrush_time": 0.5},
         "sensors": [
-            {"name": "level", "unit": "%", "value": 75.0},
-            {"name": "temperature", "unit": "°C", "value": 18.0},
-            {"name": "ppm", "unit": "ppm", "value": 700.0},
-            {"name": "ec", "unit": "us", "value": 1.5},
-            {"name": "ph", "unit": "", "value": 7.0},
-            {"name": "tds", "unit": "ppm", "value": 500.0},
-            {"name": "sal", "unit": "ppt", "value": 0.5},
-            {"name": "orp", "unit": "mV", "value": 300.0}
+            {"name": "level", "unit": "%", "value": 75.0, "source": "water_level",
+             "model": {"noise": 0.1, "quantization": 0.5}},
+            {"name": "temperature", "unit": "°C", "value": 18.0, "source": "water_temperature",
+             "model": {"lag": 120, "noise": 0.05, "quantization": 0.1}},
+            {"name": "ppm", "unit": "ppm", "value": 700.0, "source": "water_ppm",
+             "model": {"lag": 30, "noise": 3, "quantization": 1}},
+            {"name": "ec", "unit": "us", "value": 1.5, "source": "water_ec",
+             "model": {"lag": 30, "noise": 0.005, "quantization": 0.01}},
+            {"name": "ph", "unit": "", "value": 7.0, "source": "water_ph",
+             "model": {"lag": 60, "noise": 0.01, "drift": 0.001, "quantization": 0.01},
+             "significance": {"absolute": 0.05, "relative": 0.0}},
+            {"name": "tds", "unit": "ppm", "value": 500.0, "source": "water_tds",
+             "model": {"lag": 30, "noise": 2, "quantization": 1}},
+            {"name": "sal", "unit": "ppt", "value": 0.5, "source": "water_sal",
+             "model": {"lag": 30, "noise": 0.002, "quantization": 0.01}},
+            {"name": "orp", "unit": "mV", "value": 300.0, "source": "water_orp",
+             "model": {"lag": 120, "noise": 2, "quantization": 1}}
         ]
     },
     "feed": {
         "name": "DevFeedSystem",
         "type": "Feed",
         "labels": ["Feed"],
+        "group": "water",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {},
@@ -359,12 +558,26 @@ TEST_DEVICES = {
             "feedpump_pp": False,
             "feedpump_pm": False
         },
+        "dosing": {
+            "reservoir": "water_pump",
+            "channels": {
+                "feedpump_a": {"flow": 1.0, "ec": 0.75, "alkalinity": -0.02},
+                "feedpump_b": {"flow": 1.0, "ec": 0.75, "alkalinity": -0.02},
+                "feedpump_c": {"flow": 1.0, "ec": 0.5},
+                "feedpump_w": {"flow": 50.0},
+                "feedpump_x": {"flow": 0.5, "ec": 0.2},
+                "feedpump_y": {"flow": 0.5, "ec": 0.05},
+                "feedpump_pp": {"flow": 0.5, "alkalinity": 1.0},
+                "feedpump_pm": {"flow": 0.5, "alkalinity": -1.0}
+            }
+        },
         "sensors": []
     },
     "dripper": {
         "name": "Irrigation Dripper",
         "type": "Generic",
         "labels": ["Dripper"],
+        "group": "water",
         "manufacturer": "OpenGrowBox",
         "model": "Dev OGB Environment",
         "setters": {
@@ -374,6 +587,13 @@ TEST_DEVICES = {
             "power": False,
             "dripper": False
         },
+        "irrigation": {
+            "substrate": "sensor_main",
+            "reservoir": "water_pump",
+            "switch": "dripper",
+            "flow": 4.0
+        },
+        "actuator": {"watts": 10, "switch": "dripper"},
         "sensors": []
     }
 }
\ No newline at end of file
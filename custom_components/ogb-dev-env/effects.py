@@ -0,0 +1,133 @@
+"""Declarative device effects for OGB Dev Environment."""
+from array import array
+
+from .actuators import actuator_fields
+
+# Effect channels and the units catalog entries declare them in.
+HEAT = 0  # W
+EXHAUST = 1  # m³/h pulled out of the tent
+INTAKE = 2  # m³/h of outside air brought in
+MIXING = 3  # m³/h circulated inside the tent
+MOISTURE = 4  # g/h of water vapour
+CO2 = 5  # L/h of CO2
+WATER = 6  # L/h of water taken up from the reservoir
+PPFD = 7  # µmol/m²/s of photosynthetic light at the canopy
+
+CHANNELS = {
+    "heat": HEAT,
+    "exhaust": EXHAUST,
+    "intake": INTAKE,
+    "mixing": MIXING,
+    "moisture": MOISTURE,
+    "co2": CO2,
+    "water": WATER,
+    "ppfd": PPFD,
+}
+
+
+class EffectMatrix:
+    """Sparse channel-by-device matrix compiled from catalog effects.
+
+    Every catalog entry with an ``effects`` block becomes one matrix
+    column. Its drive is the gating state field (``switch``, default
+    ``power``) times an optional 0-100 ``level`` field, or the actual
+    output of the device's actuator when it has one, and the total
+    influence on each channel is one sparse matrix-vector product over
+    those drives.
+    """
+
+    def __init__(self, catalog):
+        self.devices = []
+        self.switches = []
+        self.levels = []
+        entries = [[] for _ in CHANNELS]
+
+        for device_key, device_config in catalog.items():
+            effects = device_config.get("effects")
+            if not effects:
+                continue
+            column = len(self.devices)
+            switch, level = actuator_fields(device_config, effects)
+            self.devices.append(device_key)
+            self.switches.append(switch)
+            self.levels.append(level)
+            for name, value in effects.items():
+                if name in CHANNELS and value:
+                    entries[CHANNELS[name]].append((column, float(value)))
+        self.index = {key: column for column, key in enumerate(self.devices)}
+
+        # Compressed sparse rows: channel c owns indices[indptr[c]:indptr[c + 1]].
+        self.indptr = array("i", [0])
+        self.indices = array("i")
+        self.data = array("d")
+        for channel_entries in entries:
+            for column, value in channel_entries:
+                self.indices.append(column)
+                self.data.append(value)
+            self.indptr.append(len(self.indices))
+
+        self.drive = array("d", bytes(8 * len(self.devices)))
+        self.influence = array("d", bytes(8 * len(CHANNELS)))
+        # Upper drive limits per column, set by faults.
+        self.limits = {}
+        self._rows = None
+
+    def __getstate__(self):
+        """Drop the device table binding when shipped to a worker."""
+        state = self.__dict__.copy()
+        state["_rows"] = None
+        state.pop("_switch_columns", None)
+        state.pop("_level_columns", None)
+        return state
+
+    def column(self, device_key):
+        """Return the matrix column of a device, or None."""
+        return self.index.get(device_key)
+
+    def value(self, device_key, channel):
+        """Return a device's coefficient on a channel, 0 when it has none."""
+        column = self.index.get(device_key)
+        for position in range(self.indptr[channel], self.indptr[channel + 1]):
+            if self.indices[position] == column:
+                return self.data[position]
+        return 0.0
+
+    def bind(self, device_states):
+        """Resolve table rows and state columns for every matrix column."""
+        self._rows = [device_states.index.get(key) for key in self.devices]
+        self._switch_columns = [device_states.column(field) for field in self.switches]
+        self._level_columns = [
+            device_states.column(field) if field else None for field in self.levels
+        ]
+
+    def update_drive(self):
+        """Read the drive of every device from the bound table."""
+        drive = self.drive
+        switch_columns = self._switch_columns
+        level_columns = self._level_columns
+        for column, row in enumerate(self._rows):
+            switch = switch_columns[column][row] if row is not None else None
+            if not switch:
+                drive[column] = 0.0
+                continue
+            level_column = level_columns[column]
+            level = level_column[row] if level_column is not None else None
+            drive[column] = float(switch) * (level / 100 if level is not None else 1.0)
+        for column, limit in self.limits.items():
+            if drive[column] > limit:
+                drive[column] = limit
+        return drive
+
+    def multiply(self):
+        """Compute the influence on every channel from the current drive."""
+        indptr = self.indptr
+        indices = self.indices
+        data = self.data
+        drive = self.drive
+        influence = self.influence
+        for channel in range(len(influence)):
+            total = 0.0
+            for position in range(indptr[channel], indptr[channel + 1]):
+                total += data[position] * drive[indices[position]]
+            influence[channel] = total
+        return influence
@@ -0,0 +1,131 @@
+"""Energy and cost accounting for OGB Dev Environment."""
+from datetime import datetime
+
+TARIFF_SLOT = 900  # s per tariff lookup slot
+SLOTS_PER_WEEK = 7 * 24 * 3600 // TARIFF_SLOT
+MILLIJOULES_PER_KWH = 3_600_000_000
+MICROS = 1_000_000
+
+TARIFF_DEFAULTS = {
+    "name": "standard",
+    "price": 0.30,  # currency per kWh outside every period
+    "periods": [],
+}
+
+
+def _slot_of(value):
+    """Return the slot of a day holding an "HH:MM" time."""
+    hours, minutes = (int(part) for part in value.split(":")[:2])
+    return (hours * 3600 + minutes * 60) // TARIFF_SLOT
+
+
+def compile_tariff(tariff):
+    """Precompute the period of every slot of the week.
+
+    Periods have a name, a price and a daily "start"/"end" ("HH:MM",
+    wrapping past midnight) on the given "days" (0 is Monday, default
+    every day); later periods override earlier ones. Returns the period
+    names, their prices in micro-units per kWh and the slot table.
+    """
+    params = {**TARIFF_DEFAULTS, **(tariff or {})}
+    names = [params["name"]]
+    prices = [round(float(params["price"]) * MICROS)]
+    table = [0] * SLOTS_PER_WEEK
+    slots_per_day = SLOTS_PER_WEEK // 7
+
+    for period in params["periods"]:
+        index = len(names)
+        names.append(period["name"])
+        prices.append(round(float(period["price"]) * MICROS))
+        start = _slot_of(period.get("start", "00:00"))
+        end = _slot_of(period.get("end", "00:00"))
+        length = (end - start) % slots_per_day or slots_per_day
+        for day in period.get("days", range(7)):
+            for offset in range(length):
+                table[(day * slots_per_day + start + offset) % SLOTS_PER_WEEK] = index
+    return names, prices, table
+
+
+class EnergyMeter:
+    """Per-device energy and per-period cost counters for one zone.
+
+    Energy is counted in integer millijoules and cost in millijoules
+    times micro-units per kWh, so months of fast-forwarded steps add up
+    exactly. The tariff period is one table lookup per step.
+    """
+
+    def __init__(self, devices, tariff=None):
+        self.devices = list(devices)
+        self.index = {key: index for index, key in enumerate(self.devices)}
+        self.names, self.prices, self.table = compile_tariff(tariff)
+        self.device_energy = [0] * len(self.devices)
+        self.period_energy = [0] * len(self.names)
+        self.cost = 0
+        self.period = 0
+        self.time_zone = None  # None: the process's local time
+
+    def _slot(self, clock):
+        """Return the slot of the week holding a timestamp in the meter's time zone."""
+        local = datetime.fromtimestamp(clock, self.time_zone)
+        seconds = ((local.weekday() * 24 + local.hour) * 60 + local.minute) * 60 + local.second
+        return seconds // TARIFF_SLOT
+
+    def add(self, powers, dt, clock):
+        """Account one step of every device's power draw (W) over dt seconds."""
+        period = self.period = self.table[self._slot(clock)]
+        device_energy = self.device_energy
+        total = 0
+        for index, power in enumerate(powers):
+            millijoules = round(power * dt * 1000)
+            device_energy[index] += millijoules
+            total += millijoules
+        self.period_energy[period] += total
+        self.cost += total * self.prices[period]
+
+    @property
+    def energy(self):
+        """Return the zone's energy use in kWh."""
+        return sum(self.period_energy) / MILLIJOULES_PER_KWH
+
+    @property
+    def total_cost(self):
+        """Return the zone's energy cost in currency units."""
+        return self.cost / MILLIJOULES_PER_KWH / MICROS
+
+    @property
+    def price(self):
+        """Return the current price per kWh."""
+        return self.prices[self.period] / MICROS
+
+    def device_kwh(self, device_key):
+        """Return a device's energy use in kWh, or None."""
+        index = self.index.get(device_key)
+        return None if index is None else self.device_energy[index] / MILLIJOULES_PER_KWH
+
+    def publish(self, environment):
+        """Write the zone totals into the environment."""
+        environment["energy"] = self.energy
+        environment["energy_cost"] = self.total_cost
+        environment["energy_price"] = self.price
+        environment["tariff_period"] = self.names[self.period]
+        for name, millijoules in zip(self.names, self.period_energy):
+            environment[f"energy_{name}"] = millijoules / MILLIJOULES_PER_KWH
+
+    def as_dict(self):
+        """Return the counters."""
+        return {
+            "devices": dict(zip(self.devices, self.device_energy)),
+            "periods": dict(zip(self.names, self.period_energy)),
+            "cost": self.cost,
+        }
+
+    def restore(self, data):
+        """Restore counters saved with as_dict."""
+        for key, millijoules in data.get("devices", {}).items():
+            if key in self.index:
+                self.device_energy[self.index[key]] = int(millijoules)
+        periods = data.get("periods", {})
+        for index, name in enumerate(self.names):
+            if name in periods:
+                self.period_energy[index] = int(periods[name])
+        self.cost = int(data.get("cost", self.cost))
@@ -1,5 +1,23 @@
 """OGB Dev Environment Simulation."""
-from random import uniform
+import time
+from random import Random
+
+from .accumulators import PeriodAccumulator, Photoperiod
+from .actuators import ActuatorBank
+from .const import SIMULATION_INTERVAL
+from .controllers import ControllerBank
+from .devices import TEST_DEVICES, CANOPY, CONTROLLERS, SPATIAL, TARIFF
+from .faults import FaultEngine
+from .energy import EnergyMeter
+from .effects import EffectMatrix, HEAT, EXHAUST, INTAKE, MIXING, MOISTURE, CO2, WATER, PPFD
+from .lighting import LightingModel
+from .measurement import SensorBank
+from .plant import Canopy
+from .profiles import DEFAULT_TENT_PROFILE, tent_coefficients
+from .psychrometrics import vapor_pressure_deficit
+from .reservoir import Reservoir
+from .spatial import AirCells
+from .substrate import Substrate
 
 
 class EnvironmentSimulator:
@@ -20,19 +38,144 @@ class EnvironmentSimulator:
         "winter_wet": {"room_temp": 15.0, "room_hum": 100.0, "outside_temp": 3.0, "outside_hum": 100.0},
     }
 
-    def __init__(self):
+    UPTAKE_VPD = 1.0  # kPa at which plants drink their declared water effect
+
+    def __init__(
+        self, catalog=None, seed=None, canopy=None, tariff=None, controllers=None, spatial=None, profile=None
+    ):
+        catalog = catalog if catalog is not None else TEST_DEVICES
+        self._random = Random(seed)
         self.season = "summer"
         self._apply_season()
+        # Conversions from declared device effects to changes per nominal
+        # step, precomputed from the tent profile (see profiles.tent_coefficients).
+        self.coefficients = tent_coefficients(profile if profile is not None else DEFAULT_TENT_PROFILE)
+        self.heat_per_watt = self.coefficients["heat_per_watt"]  # °C per W
+        self.insulation = self.coefficients["insulation"]  # fraction of the room difference lost
+        self.leak = self.coefficients["leak"]  # fraction of tent air leaking out
+        self.exchange_per_m3h = self.coefficients["exchange_per_m3h"]  # fraction of tent heat per m³/h
+        self.air_change_per_m3h = self.coefficients["air_change_per_m3h"]  # fraction of tent air per m³/h
+        self.drying_per_m3h = self.coefficients["drying_per_m3h"]  # % RH per m³/h of exhaust
+        self.humidity_per_gram = self.coefficients["humidity_per_gram"]  # % RH per g/h
+        self.co2_per_liter = self.coefficients["co2_per_liter"]  # ppm per L/h
+        self.actuators = ActuatorBank(catalog)
+        self.controllers = ControllerBank(
+            controllers if controllers is not None else CONTROLLERS, self.actuators.devices
+        )
+        self.meter = EnergyMeter(self.actuators.devices, tariff if tariff is not None else TARIFF)
+        self.effects = EffectMatrix(catalog)
+        self.canopy = Canopy(canopy if canopy is not None else {**CANOPY, "area": self.coefficients["area"]})
+        self.lighting = LightingModel(catalog, self.canopy.area)
+        self.cells = AirCells(
+            spatial if spatial is not None else SPATIAL,
+            catalog,
+            self.effects.devices,
+            self.lighting.devices,
+            (self.heat_per_watt, self.humidity_per_gram, self.exchange_per_m3h),
+        )
+        self.sensors = SensorBank(catalog, seed=self._random.getrandbits(32))
+        self.faults = FaultEngine(catalog, self.effects, self.sensors, seed=self._random.getrandbits(32))
+        self.reservoirs = [
+            Reservoir(key, config["reservoir"], catalog)
+            for key, config in catalog.items()
+            if "reservoir" in config
+        ]
+        self.substrates = [
+            Substrate(key, config["substrate"], catalog)
+            for key, config in catalog.items()
+            if "substrate" in config
+        ]
+        self.irrigation = 0.0
+        self.clock = time.time()
+        self.photoperiod = Photoperiod(
+            self.clock,
+            {"light": PeriodAccumulator(), "vpd_air": PeriodAccumulator(), "vpd_leaf": PeriodAccumulator()},
+        )
 
         self.environment = {
             "air_temperature": self.room_temp,
             "air_humidity": self.room_hum,
             "soil_temperature": self.room_temp,
             "co2_level": 600.0,
-            "water_level": 75.0,
-            "water_temperature": 18.0,
+            "ppfd": 0.0,
+            "dli": 0.0,
+            "vpd_air": 0.0,
+            "vpd_leaf": 0.0,
+            "leaf_temperature": self.room_temp,
+            "transpiration": 0.0,
+            "photosynthesis": 0.0,
+        }
+        for model in self.reservoirs + self.substrates:
+            model.publish(self.environment)
+        self.lighting.publish(self.environment)
+        if self.cells.enabled:
+            self.cells.publish(self.environment)
+        self._table = None
+
+    def __getstate__(self):
+        """Drop the device table binding when shipped to a worker."""
+        state = self.__dict__.copy()
+        state["_table"] = None
+        return state
+
+    def outputs(self):
+        """Return the values read from a simulator that is stepped elsewhere.
+
+        A process worker keeps the simulator and returns only these after
+        each step; apply_outputs copies them onto the event loop's copy.
+        """
+        return (
+            self.clock,
+            self.environment,
+            self.sensors.readings,
+            self.sensors.unavailable,
+            self.actuators.power,
+            self.meter.device_energy,
+            [controller.output for controller in self.controllers.controllers.values()],
+            self.faults.stuck,
+        )
+
+    def apply_outputs(self, outputs):
+        """Adopt the outputs of a copy of this simulator stepped elsewhere."""
+        (
+            self.clock,
+            self.environment,
+            self.sensors.readings,
+            self.sensors.unavailable,
+            self.actuators.power,
+            self.meter.device_energy,
+            controller_outputs,
+            self.faults.stuck,
+        ) = outputs
+        for controller, output in zip(self.controllers.controllers.values(), controller_outputs):
+            controller.output = output
+
+    def as_dict(self):
+        """Return model state that is not part of the environment readings."""
+        return {
+            "photoperiod": self.photoperiod.as_dict(),
+            "meter": self.meter.as_dict(),
+            "controllers": self.controllers.as_dict(),
+            "reservoirs": {reservoir.key: reservoir.as_dict() for reservoir in self.reservoirs},
+            "substrates": {substrate.key: substrate.as_dict() for substrate in self.substrates},
         }
 
+    def restore(self, data):
+        """Restore model state saved with as_dict."""
+        if "meter" in data:
+            self.meter.restore(data["meter"])
+            self.meter.publish(self.environment)
+        if "controllers" in data:
+            self.controllers.restore(data["controllers"])
+        if "photoperiod" in data:
+            self.photoperiod.restore(self.clock, data["photoperiod"])
+        for name, models in (("reservoirs", self.reservoirs), ("substrates", self.substrates)):
+            saved = data.get(name, {})
+            for model in models:
+                if model.key in saved:
+                    model.restore(saved[model.key])
+                    model.publish(self.environment)
+
     def _apply_season(self):
         """Apply season settings."""
         data = self.SEASONS.get(self.season, self.SEASONS["summer"])
@@ -46,232 +189,237 @@ class EnvironmentSimulator:
         self.season = season
         self._apply_season()
 
-    def _update_room_conditions(self):
+    def set_photoperiod_start(self, start):
+        """Set the time of day (s after midnight) when daily accumulators reset."""
+        self.photoperiod.set_start(self.clock, start)
+
+    def set_time_zone(self, time_zone):
+        """Set the time zone of photoperiod days and tariff periods."""
+        self.photoperiod.set_time_zone(self.clock, time_zone)
+        self.meter.time_zone = time_zone
+
+    def inject_fault(self, fault, target, **options):
+        """Schedule a fault relative to the simulation clock; returns its id."""
+        return self.faults.schedule(self.clock, fault, target, **options)
+
+    def clear_faults(self, fault_ids=None):
+        """Remove the given faults, or all of them."""
+        self.faults.clear(fault_ids)
+
+    def set_controller(self, loop, **params):
+        """Change a reference control loop's mode, target or gains."""
+        self.controllers.configure(loop, **params)
+
+    def set_grow_stage(self, stage):
+        """Set the grow stage of the canopy."""
+        self.canopy.set_stage(stage)
+
+    def _update_room_conditions(self, scale):
         """Update room temperature and humidity based on outside conditions."""
-        drift_factor = 0.01
+        drift_factor = 0.01 * scale
         self.room_temp += (self.outside_temp - self.room_temp) * drift_factor
         self.room_hum += (self.outside_hum - self.room_hum) * drift_factor
 
-    def update_environment(self, device_states, weather_data=None):
+    def update_environment(self, device_states, weather_data=None, dt=SIMULATION_INTERVAL):
         """
         Main update function - calculates new environment values based on:
         - Outside temperature (what intake fan brings in)
         - Room temperature (where the tent is located, drifts to outside)
         - Device heat input (light, heater) accumulates over time
         - Heat loss through insulation and fan air exchange
+        Device influence comes from the compiled effect matrix, so the step
+        does not depend on which devices exist or how many there are.
+        Changes scale with dt, the simulated seconds since the last step.
         """
+        if self._table is not device_states:
+            self.actuators.bind(device_states)
+            self.effects.bind(device_states)
+            self.lighting.bind(device_states)
+            self.faults.bind(device_states)
+            for model in self.reservoirs + self.substrates:
+                model.bind(device_states)
+            self._table = device_states
+
+        uniform = self._random.uniform
+        scale = dt / SIMULATION_INTERVAL
+        self.clock += dt
+        self.faults.advance(self.clock)
+        duty = self.controllers.update(self.environment, dt, self.clock)
+        for device_key, _ in self.faults.stuck:
+            # A stuck device ignores the controller as well as commands.
+            index = self.actuators.index.get(device_key)
+            if index is not None:
+                duty[index] = None
+        self.actuators.update(dt, self.clock, duty)
+
         if weather_data and weather_data.get("temp") is not None:
             self.outside_temp = weather_data["temp"] + uniform(-2.0, 2.0)
             self.outside_hum = max(20, min(100, weather_data.get("hum", 50) + uniform(-5.0, 5.0)))
 
-        self._update_room_conditions()
+        self._update_room_conditions(scale)
+
+        self.effects.update_drive()
+        influence = self.effects.multiply()
+        self.lighting.update()
 
         current_temp = self.environment["air_temperature"]
         current_hum = self.environment["air_humidity"]
 
-        light_heat = self._calculate_light_heat(device_states)
-        heater_heat = self._calculate_heater_heat(device_states)
-        cooler_heat = self._calculate_cooler_heat(device_states)
+        ppfd = max(0.0, influence[PPFD] + self.lighting.ppfd)
+        transpiration, photosynthesis = self.canopy.step(
+            ppfd, vapor_pressure_deficit(current_temp, current_hum), self.environment["co2_level"]
+        )
 
-        total_heat_input = light_heat + heater_heat + cooler_heat
+        total_heat_input = (influence[HEAT] + self.lighting.heat) * self.heat_per_watt * scale
 
-        insulation_loss = self._calculate_insulation_loss(current_temp)
-        exhaust_loss = self._calculate_exhaust_loss(device_states, current_temp)
-        intake_loss = self._calculate_intake_loss(device_states, current_temp)
+        insulation_loss = self._calculate_insulation_loss(current_temp) * scale
+        exhaust_loss = self._calculate_exhaust_loss(influence[EXHAUST], current_temp) * scale
+        intake_loss = self._calculate_intake_loss(influence[INTAKE], current_temp) * scale
 
         new_temp = current_temp + total_heat_input - insulation_loss - exhaust_loss - intake_loss
-        new_hum = current_hum + self._calculate_humidity_effects(device_states, total_heat_input, exhaust_loss, intake_loss)
-
-        self._apply_ventilation_mixing(device_states, new_temp, new_hum)
-        self._update_soil_temperature(new_temp)
-        self._update_water_level(device_states, light_heat)
+        new_hum = current_hum + self._calculate_humidity_effects(
+            influence, transpiration, total_heat_input, intake_loss, scale
+        )
 
-        new_temp = self.environment["air_temperature"]
-        new_hum = self.environment["air_humidity"]
+        self._update_soil_temperature(new_temp, scale)
 
-        new_temp = max(5, min(50, new_temp + uniform(-0.1, 0.1)))
-        new_hum = max(20, min(98, new_hum + uniform(-0.2, 0.2)))
+        new_temp = max(5, min(50, new_temp + uniform(-0.1, 0.1) * scale))
+        new_hum = max(20, min(98, new_hum + uniform(-0.2, 0.2) * scale))
 
         self.environment["air_temperature"] = new_temp
         self.environment["air_humidity"] = new_hum
-        self.environment["co2_level"] = self._update_co2_level(device_states)
+        if self.cells.enabled:
+            self.cells.step(
+                self.effects.drive, self.lighting.drive, transpiration, influence[MIXING],
+                (new_temp, new_hum), (self.outside_temp, self.outside_hum), scale, dt,
+            )
+            self.cells.publish(self.environment)
+        self._update_water(-influence[WATER], transpiration, new_temp, new_hum, dt)
+        self.environment["co2_level"] = self._update_co2_level(influence, photosynthesis, scale)
+        self.environment["ppfd"] = ppfd
+        self._update_daily_accumulators(ppfd, dt)
+        self.lighting.publish(self.environment)
+        self.environment["transpiration"] = transpiration
+        self.environment["photosynthesis"] = photosynthesis
+
+        self.meter.add(self.actuators.power, dt, self.clock)
+        self.meter.publish(self.environment)
+        self.environment["power"] = self.actuators.total_power
+        self.sensors.sample(self.environment, dt, self.clock)
+        self.faults.apply_sensor_faults()
 
         return self.environment.copy()
 
-    def _update_soil_temperature(self, air_temp):
+    def _update_daily_accumulators(self, ppfd, dt):
+        """Publish VPD and add this step to the photoperiod accumulators."""
+        environment = self.environment
+        air_temp = environment["air_temperature"]
+        air_hum = environment["air_humidity"]
+        vpd_air = vapor_pressure_deficit(air_temp, air_hum)
+        leaf_temp = self.canopy.leaf_temperature(air_temp, ppfd, vpd_air)
+        vpd_leaf = vapor_pressure_deficit(air_temp, air_hum, leaf_temp)
+
+        photoperiod = self.photoperiod
+        photoperiod.advance(self.clock)
+        accumulators = photoperiod.accumulators
+        accumulators["light"].add(ppfd, dt)
+        accumulators["vpd_air"].add(vpd_air, dt)
+        accumulators["vpd_leaf"].add(vpd_leaf, dt)
+
+        environment["leaf_temperature"] = leaf_temp
+        environment["vpd_air"] = vpd_air
+        environment["vpd_leaf"] = vpd_leaf
+        environment["dli"] = accumulators["light"].total / 1e6
+        for name in ("vpd_air", "vpd_leaf"):
+            accumulator = accumulators[name]
+            environment[f"{name}_mean"] = accumulator.mean
+            environment[f"{name}_min"] = accumulator.minimum
+            environment[f"{name}_max"] = accumulator.maximum
+        environment["photoperiod_start"] = photoperiod.period_start
+
+    def _update_soil_temperature(self, air_temp, scale):
         """Soil temperature slowly follows air temperature."""
-        soil_change = (air_temp - self.environment["soil_temperature"]) * 0.02
+        soil_change = (air_temp - self.environment["soil_temperature"]) * 0.02 * scale
         self.environment["soil_temperature"] += soil_change
 
-    def _update_water_level(self, device_states, light_heat):
-        """Water level decreases slowly when lights are on (transpiration/evaporation)."""
-        light_state = device_states.get("light_main", {})
-        if light_state.get("power", False):
-            self.environment["water_level"] -= 0.05
+    def _update_water(self, uptake, transpiration, air_temp, air_hum, dt):
+        """Step reservoirs and substrates.
 
-    def _calculate_humidity_effects(self, device_states, heat_input, exhaust_loss, intake_loss):
+        Canopy transpiration plus declared water effects (scaled by VPD)
+        come from the first substrate, or from the first reservoir when
+        there is no substrate.
+        """
+        vpd = vapor_pressure_deficit(air_temp, air_hum)
+        uptake = uptake * vpd / self.UPTAKE_VPD + transpiration
+        reservoirs = {reservoir.key: reservoir for reservoir in self.reservoirs}
+        substrates = {substrate.key: substrate for substrate in self.substrates}
+
+        self.irrigation = 0.0
+        reservoir_uptake = 0.0 if self.substrates else uptake
+        for reservoir in self.reservoirs:
+            liters = reservoir.step(dt, air_temp, air_hum, reservoir_uptake)
+            reservoir_uptake = 0.0
+            self.irrigation += liters
+            target = substrates.get(reservoir.substrate)
+            if target is not None:
+                target.irrigate(liters, reservoir.ec)
+
+        for substrate in self.substrates:
+            for index, source, liters in substrate.demand(dt):
+                reservoir = reservoirs.get(source)
+                if reservoir is not None:
+                    substrate.irrigate(reservoir.draw(liters), reservoir.ec)
+                else:
+                    substrate.irrigate(liters, substrate.source_ec[index])
+            substrate.step(dt, vpd, uptake)
+            substrate.publish(self.environment)
+            uptake = 0.0
+
+        for reservoir in self.reservoirs:
+            reservoir.publish(self.environment)
+
+    def _calculate_humidity_effects(self, influence, transpiration, heat_input, intake_loss, scale):
         """Calculate humidity changes from devices."""
         current_hum = self.environment["air_humidity"]
 
         hum_change = 0.0
 
         hum_change -= heat_input * 0.2
-
-        exhaust_state = device_states.get("exhaust", {})
-        dumb_exhaust_state = device_states.get("dumb_exhaust", {})
-        exhaust_power = exhaust_state.get("power", False) or dumb_exhaust_state.get("power", False)
-        if exhaust_power:
-            exhaust_pct = exhaust_state.get("percentage") if exhaust_state.get("percentage") else 100
-            hum_change -= exhaust_pct * 0.003
-
+        hum_change -= influence[EXHAUST] * self.drying_per_m3h * scale
         hum_change += intake_loss * (self.outside_hum - current_hum) / 100
-        hum_change -= 0.1
-
-        humidifier_state = device_states.get("humidifier", {})
-        if humidifier_state.get("power", False):
-            hum_change += 0.5
-
-        dehumidifier_state = device_states.get("dehumidifier", {})
-        if dehumidifier_state.get("power", False):
-            hum_change -= 0.8
+        hum_change -= 0.1 * scale
+        hum_change += (influence[MOISTURE] + transpiration * 1000) * self.humidity_per_gram * scale
 
         return hum_change
 
-    def _calculate_light_heat(self, device_states):
-        """Calculate heat input from lights."""
-        light_state = device_states.get("light_main", {})
-        dumb_light_state = device_states.get("dumb_light", {})
-        light_ir_state = device_states.get("light_ir", {})
-        light_red_state = device_states.get("light_red", {})
-        light_blue_state = device_states.get("light_blue", {})
-        light_uv_state = device_states.get("light_uv", {})
-
-        any_light_on = (
-            light_state.get("power", False) or
-            dumb_light_state.get("power", False) or
-            light_ir_state.get("power", False) or
-            light_red_state.get("power", False) or
-            light_blue_state.get("power", False) or
-            light_uv_state.get("power", False)
-        )
-
-        if not any_light_on:
-            return 0.0
-
-        main_intensity = light_state.get("intensity", 100) if light_state.get("power", False) else 0
-
-        additional_lights = 0.0
-        if dumb_light_state.get("power", False):
-            additional_lights += 100.0
-        if light_ir_state.get("power", False):
-            additional_lights += 100.0
-        if light_red_state.get("power", False):
-            additional_lights += 100.0
-        if light_blue_state.get("power", False):
-            additional_lights += 100.0
-        if light_uv_state.get("power", False):
-            additional_lights += 100.0
-
-        total_intensity = main_intensity + additional_lights
-        intensity_factor = min(2.0, total_intensity / 100.0)
-
-        return 0.5 * intensity_factor
-
-    def _calculate_heater_heat(self, device_states):
-        """Calculate heat input from heater."""
-        heater_state = device_states.get("heater", {})
-        if not heater_state.get("power", False):
-            return 0.0
-
-        heater_power = heater_state.get("power", 1.0)
-        if isinstance(heater_power, bool):
-            heater_power = 1.0 if heater_power else 0.0
-
-        return 0.5 * heater_power
-
-    def _calculate_cooler_heat(self, device_states):
-        """Calculate cooling from cooler."""
-        cooler_state = device_states.get("cooler", {})
-        if not cooler_state.get("power", False):
-            return 0.0
-
-        cooler_power = cooler_state.get("power", 1.0)
-        if isinstance(cooler_power, bool):
-            cooler_power = 1.0 if cooler_power else 0.0
-
-        return -0.25 * cooler_power
-
     def _calculate_insulation_loss(self, current_temp):
         """Calculate heat loss through tent insulation (to room)."""
         diff = current_temp - self.room_temp
         if diff <= 0:
             return 0.0
-        return diff * 0.04
-
-    def _calculate_exhaust_loss(self, device_states, current_temp):
-        """Calculate heat loss from exhaust fan (pulls air out to room)."""
-        exhaust_state = device_states.get("exhaust", {})
-        dumb_exhaust_state = device_states.get("dumb_exhaust", {})
-        exhaust_power = exhaust_state.get("power", False) or dumb_exhaust_state.get("power", False)
-
-        if not exhaust_power:
-            return 0.0
+        return diff * self.insulation
 
-        exhaust_pct = exhaust_state.get("percentage") if exhaust_state.get("percentage") else 100
-        exhaust_factor = (exhaust_pct / 100) * 0.10
+    def _calculate_exhaust_loss(self, airflow, current_temp):
+        """Calculate heat loss from exhaust airflow (pulls air out to room)."""
         diff = current_temp - self.room_temp
-        return diff * exhaust_factor
-
-    def _calculate_intake_loss(self, device_states, current_temp):
-        """Calculate heat loss from intake fan (brings in outside air)."""
-        intake_state = device_states.get("intake", {})
-        dumb_intake_state = device_states.get("dumb_intake", {})
-        intake_power = intake_state.get("power", False) or dumb_intake_state.get("power", False)
+        return diff * airflow * self.exchange_per_m3h
 
-        if not intake_power:
-            return 0.0
-
-        intake_pct = intake_state.get("percentage") if intake_state.get("percentage") else 100
-        intake_factor = (intake_pct / 100) * 0.12
+    def _calculate_intake_loss(self, airflow, current_temp):
+        """Calculate heat loss from intake airflow (brings in outside air)."""
         diff = current_temp - self.outside_temp
-        return diff * intake_factor
-
-    def _apply_ventilation_mixing(self, device_states, current_temp, current_hum):
-        """Ventilation fan mixes air within tent - no heat loss, just even distribution."""
-        vent_state = device_states.get("ventilation_fan", {})
-        if not vent_state.get("power", False):
-            return
-
-        vent_pct = vent_state.get("percentage", 100)
-        mix_factor = (vent_pct / 100) * 0.3
-        self.environment["air_temperature"] = self.environment["air_temperature"] * (1 - mix_factor) + current_temp * mix_factor
-        self.environment["air_humidity"] = self.environment["air_humidity"] * (1 - mix_factor) + current_hum * mix_factor
+        return diff * airflow * self.exchange_per_m3h
 
-    def _update_co2_level(self, device_states):
+    def _update_co2_level(self, influence, photosynthesis, scale):
         """Update CO2 level based on plants and devices."""
         current_co2 = self.environment["co2_level"]
         outside_co2 = 400.0
 
-        light_state = device_states.get("light_main", {})
-        any_light_on = light_state.get("power", False)
-
-        if any_light_on:
-            main_intensity = light_state.get("intensity", 100)
-            intensity_factor = main_intensity / 100.0
-            current_co2 -= 5 * intensity_factor
-
-        co2_device_state = device_states.get("co2", {})
-        if co2_device_state.get("co2", False):
-            current_co2 += 15
+        current_co2 += (influence[CO2] - photosynthesis) * self.co2_per_liter * scale
 
-        intake_state = device_states.get("intake", {})
-        dumb_intake_state = device_states.get("dumb_intake", {})
-        intake_power = intake_state.get("power", False) or dumb_intake_state.get("power", False)
-        if intake_power:
-            intake_pct = intake_state.get("percentage") if intake_state.get("percentage") else 100
-            intake_factor = (intake_pct / 100) * 0.12
-            current_co2 = current_co2 * (1 - intake_factor) + outside_co2 * intake_factor
+        intake_factor = min(1.0, influence[INTAKE] * self.air_change_per_m3h * scale)
+        current_co2 = current_co2 * (1 - intake_factor) + outside_co2 * intake_factor
 
-        current_co2 = current_co2 * 0.99 + outside_co2 * 0.01
+        leak_factor = min(1.0, self.leak * scale)
+        current_co2 = current_co2 * (1 - leak_factor) + outside_co2 * leak_factor
 
-        return max(300, min(2000, current_co2 + uniform(-1, 1)))
+        return max(300, min(2000, current_co2 + self._random.uniform(-1, 1) * scale))
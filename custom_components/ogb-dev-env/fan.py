@@ -5,7 +5,7 @@ from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from .const import DOMAIN
-from .devices import TEST_DEVICES
+from .writer import async_schedule_write
 from . import OGBDevRestoreEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     """Set up OGB Dev fans."""
     entities = []
 
-    for device_key, device_config in TEST_DEVICES.items():
+    for device_key, device_config in hass.data[DOMAIN][entry.entry_id]["devices"].items():
         device_type = device_config.get("type")
         _LOGGER.debug(f"Checking device {device_key}: type={device_type}")
         if device_type in ["Exhaust", "Intake", "Ventilation"] and "sensors" in device_config and any(s.get("name") == "duty" for s in device_config["sensors"]):
@@ -29,6 +29,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             entities.append(fan)
 
     _LOGGER.debug(f"Created {len(entities)} fan entities")
+    data_entry = hass.data[DOMAIN][entry.entry_id]
+    data_entry.setdefault("entities", []).extend(entities)
+
     if entities:
         async_add_entities(entities)
 
@@ -98,12 +101,7 @@ class OGBDevFan(OGBDevRestoreEntity, FanEntity):
         self._attr_percentage = self._duty if is_on else 0
         self._attr_is_on = is_on
         self._attr_extra_state_attributes = {"duty": self._duty}
-        self._hass.states.async_set(
-            self.entity_id,
-            "on" if is_on else "off",
-            {"percentage": self._attr_percentage, "duty": self._duty}
-        )
-        self.async_write_ha_state()
+        async_schedule_write(self)
         
         _LOGGER.debug(f"Fan {self.entity_id} initialized: is_on={is_on}, percentage={self._attr_percentage}, duty={self._duty}")
 
@@ -119,19 +117,15 @@ class OGBDevFan(OGBDevRestoreEntity, FanEntity):
 
     async def async_set_percentage(self, percentage: int):
         """Set the speed of the fan."""
+        correlation_id = self._correlation_id()
         is_on = percentage > 0
         self._duty = percentage
         self._attr_extra_state_attributes = {"duty": self._duty}
-        await self._state_manager.set_device_state(self._device_key, "power", is_on)
-        await self._state_manager.set_device_state(self._device_key, "percentage", percentage)
+        await self._state_manager.set_device_state(self._device_key, "power", is_on, correlation_id)
+        await self._state_manager.set_device_state(self._device_key, "percentage", percentage, correlation_id)
         self._attr_percentage = percentage
         self._attr_is_on = is_on
-        self._hass.states.async_set(
-            self.entity_id,
-            "on" if is_on else "off",
-            {"percentage": percentage, "duty": self._duty}
-        )
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     async def async_turn_on(self, percentage: int = 100, **kwargs):
         """Turn the fan on."""
@@ -141,14 +135,14 @@ class OGBDevFan(OGBDevRestoreEntity, FanEntity):
 
     async def async_turn_off(self, **kwargs):
         """Turn the fan off."""
-        await self._state_manager.set_device_state(self._device_key, "power", False)
-        await self._state_manager.set_device_state(self._device_key, "percentage", 0)
+        correlation_id = self._correlation_id()
+        await self._state_manager.set_device_state(self._device_key, "power", False, correlation_id)
+        await self._state_manager.set_device_state(self._device_key, "percentage", 0, correlation_id)
         self._attr_percentage = 0
         self._attr_is_on = False
         self._duty = 0
         self._attr_extra_state_attributes = {"duty": self._duty}
-        self._hass.states.async_set(self.entity_id, "off", {"percentage": 0, "duty": 0})
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     async def async_toggle(self, **kwargs):
         """Toggle the fan."""
@@ -0,0 +1,231 @@
+"""Fault injection for OGB Dev Environment."""
+import heapq
+from itertools import count
+from random import Random
+
+from .effects import HEAT
+
+FAULT_STUCK_RELAY = "stuck_relay"
+FAULT_SENSOR_FREEZE = "sensor_freeze"
+FAULT_SENSOR_SPIKE = "sensor_spike"
+FAULT_SENSOR_DROPOUT = "sensor_dropout"
+FAULT_SENSOR_UNAVAILABLE = "sensor_unavailable"
+FAULT_FAN_CAP = "fan_cap"
+FAULT_HEATER_FAILURE = "heater_failure"
+
+SENSOR_FAULTS = [FAULT_SENSOR_FREEZE, FAULT_SENSOR_SPIKE, FAULT_SENSOR_DROPOUT, FAULT_SENSOR_UNAVAILABLE]
+DRIVE_FAULTS = [FAULT_FAN_CAP, FAULT_HEATER_FAILURE]
+FAULTS = [FAULT_STUCK_RELAY, *SENSOR_FAULTS, *DRIVE_FAULTS]
+
+
+class Fault:
+    """One scheduled or recurring fault.
+
+    ``target`` is a device key, or ``device.sensor`` for sensor faults.
+    ``value`` is the stuck state, spike offset, dropout probability or
+    fan cap in percent. A fault with a ``rate`` (per hour) recurs at
+    random intervals instead of firing once at ``start``. ``frozen`` is
+    the reading a freeze holds and ``sample`` the sample a spike last
+    offset.
+    """
+
+    __slots__ = ("id", "kind", "target", "field", "value", "start", "duration", "rate", "frozen", "sample")
+
+    def __init__(self, fault_id, kind, target, field="power", value=None, start=0.0, duration=None, rate=None):
+        self.id = fault_id
+        self.kind = kind
+        self.target = target
+        self.field = field
+        self.value = value
+        self.start = start
+        self.duration = duration
+        self.rate = rate
+        self.frozen = None
+        self.sample = None
+
+    def as_dict(self):
+        """Return a summary of the fault."""
+        return {
+            "id": self.id,
+            "fault": self.kind,
+            "target": self.target,
+            "value": self.value,
+            "start": self.start,
+            "duration": self.duration,
+            "rate": self.rate,
+        }
+
+
+class FaultEngine:
+    """Activates and expires faults on the simulation clock.
+
+    Pending faults wait in a heap keyed by start time and active faults
+    in a heap keyed by end time, so a step only touches faults that
+    start, end or are active: thousands of scheduled faults cost
+    nothing until they fire.
+    """
+
+    def __init__(self, devices, effects, sensors, seed=None):
+        self._random = Random(seed)
+        self._ids = count(1)
+        self._pending = []
+        self._expiring = []
+        self.active = {}
+        self.stuck = {}
+        self.sensor_faults = {}
+        self._devices = frozenset(devices)
+        self._table = None
+        self._effects = effects
+        self._sensors = sensors
+
+    def __getstate__(self):
+        """Drop the device table binding when shipped to a worker."""
+        state = self.__dict__.copy()
+        state["_table"] = None
+        state["_ids"] = next(self._ids)
+        return state
+
+    def __setstate__(self, state):
+        state["_ids"] = count(state["_ids"])
+        self.__dict__.update(state)
+
+    def bind(self, device_states):
+        """Bind the device table stuck relays act on."""
+        self._table = device_states
+
+    def validate(self, kind, target):
+        """Raise ValueError unless a fault of this kind can act on the target."""
+        if kind not in FAULTS:
+            raise ValueError(f"Unknown fault {kind!r}")
+        if kind == FAULT_STUCK_RELAY:
+            if target not in self._devices:
+                raise ValueError(f"{kind}: unknown device {target!r}")
+        elif kind == FAULT_HEATER_FAILURE:
+            if self._effects.value(target, HEAT) <= 0:
+                raise ValueError(f"{kind}: {target!r} is not a device with a heat effect")
+        elif kind in DRIVE_FAULTS:
+            if self._effects.column(target) is None:
+                raise ValueError(f"{kind}: {target!r} has no effects to limit")
+        elif target not in self._sensors.index:
+            raise ValueError(f"{kind}: unknown sensor {target!r}, expected device_key.sensor_name")
+
+    def schedule(self, clock, kind, target, field="power", value=None, start=0.0, duration=None, rate=None):
+        """Schedule a fault ``start`` seconds from the clock; returns its id.
+
+        Raises ValueError when the target does not exist, so a typo is
+        reported instead of scheduling a fault that never acts.
+        """
+        self.validate(kind, target)
+        fault = Fault(next(self._ids), kind, target, field, value, start, duration, rate)
+        if rate:
+            begin = clock + start + self._random.expovariate(rate / 3600)
+        else:
+            begin = clock + start
+        heapq.heappush(self._pending, (begin, fault.id, fault))
+        return fault.id
+
+    def clear(self, fault_ids=None):
+        """Remove scheduled and active faults, or all of them."""
+        def keep(fault):
+            return fault_ids is not None and fault.id not in fault_ids
+
+        for fault in list(self.active.values()):
+            if not keep(fault):
+                self._deactivate(fault)
+        self._pending = [entry for entry in self._pending if keep(entry[2])]
+        heapq.heapify(self._pending)
+        self._expiring = [entry for entry in self._expiring if entry[1] in self.active]
+        heapq.heapify(self._expiring)
+
+    def scheduled(self):
+        """Return summaries of pending and active faults."""
+        return {
+            "active": [fault.as_dict() for fault in self.active.values()],
+            "pending": [entry[2].as_dict() for entry in sorted(self._pending)],
+        }
+
+    def is_stuck(self, device_key, field):
+        """Return whether commands to a device field are ignored."""
+        return (device_key, field) in self.stuck
+
+    def advance(self, clock):
+        """Start and expire faults due by the clock."""
+        expiring = self._expiring
+        while expiring and expiring[0][0] <= clock:
+            _, fault_id, fault = heapq.heappop(expiring)
+            if self.active.get(fault_id) is fault:
+                self._deactivate(fault)
+                if fault.rate:
+                    begin = clock + self._random.expovariate(fault.rate / 3600)
+                    heapq.heappush(self._pending, (begin, fault.id, fault))
+
+        pending = self._pending
+        while pending and pending[0][0] <= clock:
+            begin, _, fault = heapq.heappop(pending)
+            self._activate(fault)
+            if fault.duration is not None:
+                heapq.heappush(expiring, (begin + fault.duration, fault.id, fault))
+
+        for (device_key, field), value in self.stuck.items():
+            if device_key in self._table:
+                self._table.set(device_key, field, value)
+
+    def _activate(self, fault):
+        """Apply a fault to the bound models."""
+        self.active[fault.id] = fault
+        kind = fault.kind
+        if kind == FAULT_STUCK_RELAY:
+            if fault.value is None:
+                value = self._table.get(fault.target, fault.field)
+            else:
+                value = bool(fault.value)
+            self.stuck[(fault.target, fault.field)] = value
+        elif kind in DRIVE_FAULTS:
+            column = self._effects.column(fault.target)
+            if column is not None:
+                limit = 0.0 if kind == FAULT_HEATER_FAILURE else float(fault.value or 0) / 100
+                self._effects.limits[column] = limit
+        else:
+            index = self._sensors.index.get(fault.target)
+            if index is not None:
+                fault.frozen = self._sensors.readings[index] if kind == FAULT_SENSOR_FREEZE else None
+                fault.sample = None
+                self.sensor_faults[index] = fault
+                if kind == FAULT_SENSOR_UNAVAILABLE:
+                    self._sensors.unavailable.add(index)
+
+    def _deactivate(self, fault):
+        """Undo a fault."""
+        self.active.pop(fault.id, None)
+        kind = fault.kind
+        if kind == FAULT_STUCK_RELAY:
+            self.stuck.pop((fault.target, fault.field), None)
+        elif kind in DRIVE_FAULTS:
+            self._effects.limits.pop(self._effects.column(fault.target), None)
+        else:
+            index = self._sensors.index.get(fault.target)
+            if self.sensor_faults.get(index) is fault:
+                del self.sensor_faults[index]
+                self._sensors.unavailable.discard(index)
+
+    def apply_sensor_faults(self):
+        """Corrupt the readings of sensors with an active fault."""
+        readings = self._sensors.readings
+        for index, fault in self.sensor_faults.items():
+            kind = fault.kind
+            if kind == FAULT_SENSOR_FREEZE:
+                readings[index] = fault.frozen
+            elif kind == FAULT_SENSOR_SPIKE:
+                # A new sample moves next_sample; held samples are already offset.
+                sample = self._sensors.next_sample[index]
+                if sample != fault.sample:
+                    fault.sample = sample
+                    value = readings[index]
+                    if value is not None:
+                        readings[index] = value + float(fault.value or 0)
+            elif kind == FAULT_SENSOR_DROPOUT:
+                probability = 1.0 if fault.value is None else float(fault.value)
+                if self._random.random() < probability:
+                    readings[index] = None
+            elif kind == FAULT_SENSOR_UNAVAILABLE:
+                readings[index] = None
@@ -1,12 +1,17 @@
 """OGB Dev humidifier."""
 import asyncio
-from homeassistant.components.humidifier import HumidifierEntity, HumidifierDeviceClass
+from homeassistant.components.humidifier import HumidifierEntity, HumidifierDeviceClass, HumidifierEntityFeature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from .const import DOMAIN
+from .writer import async_schedule_write
 from .devices import TEST_DEVICES
 from . import OGBDevRestoreEntity
 
+MODE_HUMIDIFY = "humidify"
+MODE_DEHUMIDIFY = "dehumidify"
+MODE_AUTO = "auto"
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up OGB Dev humidifier."""
@@ -47,6 +52,8 @@ class OGBDevHumidifier(OGBDevRestoreEntity, HumidifierEntity):
         self._attr_min_humidity = 20
         self._attr_max_humidity = 90
         self._attr_target_humidity = 60
+        self._attr_available_modes = [MODE_HUMIDIFY, MODE_DEHUMIDIFY, MODE_AUTO]
+        self._attr_supported_features = HumidifierEntityFeature.MODES
 
         self._attr_device_info = {
             "identifiers": {(DOMAIN, "humidity_control")},
@@ -61,26 +68,30 @@ class OGBDevHumidifier(OGBDevRestoreEntity, HumidifierEntity):
 
         restored_target = await self._async_restore_state("target_humidity", 60.0)
         self._attr_target_humidity = float(restored_target) if restored_target else 60.0
+        await self._state_manager.async_set_controller("humidity", target=self._attr_target_humidity)
 
         humidifier_on = await self._async_restore_device_state("humidifier", "power")
         dehumidifier_on = await self._async_restore_device_state("dehumidifier", "power")
 
-        if humidifier_on:
-            self._attr_mode = "humidify"
+        auto = self._state_manager.controller_output("humidity") is not None
+        if auto:
+            self._attr_mode = MODE_AUTO
+        elif humidifier_on:
+            self._attr_mode = MODE_HUMIDIFY
         elif dehumidifier_on:
-            self._attr_mode = "dehumidify"
+            self._attr_mode = MODE_DEHUMIDIFY
         else:
             self._attr_mode = None
 
-        self._hass.states.async_set(self.entity_id, "on" if (humidifier_on or dehumidifier_on) else "off")
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     @property
     def is_on(self):
         """Return true if humidifier is on."""
         humidifier_state = self._state_manager.get_device_state("humidifier").get("power", False)
         dehumidifier_state = self._state_manager.get_device_state("dehumidifier").get("power", False)
-        return humidifier_state or dehumidifier_state
+        auto = self._state_manager.controller_output("humidity") is not None
+        return humidifier_state or dehumidifier_state or auto
 
     @property
     def current_humidity(self):
@@ -97,27 +108,42 @@ class OGBDevHumidifier(OGBDevRestoreEntity, HumidifierEntity):
     async def async_set_humidity(self, humidity):
         """Set new target humidity."""
         self._attr_target_humidity = humidity
-        self.async_write_ha_state()
+        await self._state_manager.async_set_controller("humidity", target=humidity)
+        async_schedule_write(self)
+
+    async def async_set_mode(self, mode):
+        """Switch between manual humidifying, dehumidifying and closed-loop control."""
+        self._attr_mode = mode
+        if self.is_on:
+            await self.async_turn_on()
+        else:
+            async_schedule_write(self)
 
     async def async_turn_on(self, **kwargs):
         """Turn the humidifier on."""
+        correlation_id = self._correlation_id()
         target = self._attr_target_humidity
         current = self.current_humidity
-        if target > current:
-            await self._state_manager.set_device_state("humidifier", "power", True)
-            await self._state_manager.set_device_state("dehumidifier", "power", False)
-            self._attr_mode = "humidify"
+        await self._state_manager.async_set_controller("humidity", enabled=self._attr_mode == MODE_AUTO)
+        if self._attr_mode == MODE_AUTO:
+            await self._state_manager.set_device_state("humidifier", "power", False, correlation_id)
+            await self._state_manager.set_device_state("dehumidifier", "power", False, correlation_id)
+        elif target > current:
+            await self._state_manager.set_device_state("humidifier", "power", True, correlation_id)
+            await self._state_manager.set_device_state("dehumidifier", "power", False, correlation_id)
+            self._attr_mode = MODE_HUMIDIFY
         else:
-            await self._state_manager.set_device_state("humidifier", "power", False)
-            await self._state_manager.set_device_state("dehumidifier", "power", True)
-            self._attr_mode = "dehumidify"
-        self._hass.states.async_set(self.entity_id, "on")
-        self.async_write_ha_state()
+            await self._state_manager.set_device_state("humidifier", "power", False, correlation_id)
+            await self._state_manager.set_device_state("dehumidifier", "power", True, correlation_id)
+            self._attr_mode = MODE_DEHUMIDIFY
+        async_schedule_write(self)
 
     async def async_turn_off(self, **kwargs):
         """Turn the humidifier off."""
-        await self._state_manager.set_device_state("humidifier", "power", False)
-        await self._state_manager.set_device_state("dehumidifier", "power", False)
-        self._attr_mode = None
-        self._hass.states.async_set(self.entity_id, "off")
-        self.async_write_ha_state()
+        correlation_id = self._correlation_id()
+        await self._state_manager.async_set_controller("humidity", enabled=False)
+        await self._state_manager.set_device_state("humidifier", "power", False, correlation_id)
+        await self._state_manager.set_device_state("dehumidifier", "power", False, correlation_id)
+        if self._attr_mode != MODE_AUTO:
+            self._attr_mode = None
+        async_schedule_write(self)
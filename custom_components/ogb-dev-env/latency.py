@@ -0,0 +1,133 @@
+"""Command to sensor latency tracking for OGB Dev Environment."""
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+LATENCY_METRICS = ["intensity", "par", "duty", "illuminance", "temperature", "humidity", "co2"]
+
+
+def new_correlation_id():
+    """Return a fresh correlation id for a command."""
+    return uuid.uuid4().hex
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with O(1) observations."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, latency_ms):
+        """Add one latency sample."""
+        self.counts[bisect_left(BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total += latency_ms
+        if latency_ms > self.max:
+            self.max = latency_ms
+
+    def percentile(self, fraction):
+        """Return the bucket bound holding a percentile, capped at the maximum."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and index < len(BUCKETS_MS):
+                return min(BUCKETS_MS[index], round(self.max, 1))
+        return round(self.max, 1)
+
+    def summary(self):
+        """Return count, mean and percentile figures."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": round(self.max, 1),
+        }
+
+
+class LatencyTracker:
+    """Correlates device commands with the sensor writes that show their effect.
+
+    Every command carries a correlation id and a timestamp through
+    ``set_device_state``. A simulation step marks the commands it consumed
+    as applied, and when a sensor writes its state, every applied command
+    it has not seen yet is recorded on the ``device -> metric`` path.
+    """
+
+    def __init__(self, max_commands=4096):
+        self._commands = deque(maxlen=max_commands)
+        self._seq = 0
+        self._applied_seq = 0
+        self.histograms = {metric: {} for metric in LATENCY_METRICS}
+
+    @property
+    def seq(self):
+        """Return the sequence number of the latest command."""
+        return self._seq
+
+    def record_command(self, device_key, correlation_id):
+        """Record a command issued against a device."""
+        if self._commands:
+            last = self._commands[-1]
+            if last[1] == correlation_id and last[2] == device_key:
+                return last[0]
+        self._seq += 1
+        self._commands.append((self._seq, correlation_id, device_key, time.monotonic()))
+        return self._seq
+
+    def mark_applied(self, seq):
+        """Mark every command up to a sequence number as simulated."""
+        if seq > self._applied_seq:
+            self._applied_seq = seq
+
+    def observe(self, metric, last_seen, device_key=None):
+        """Record latencies for commands a sensor write now reflects.
+
+        Returns the new last-seen sequence number for the sensor.
+        """
+        applied = self._applied_seq
+        if applied <= last_seen:
+            return last_seen
+
+        histograms = self.histograms.get(metric)
+        if histograms is not None:
+            now = time.monotonic()
+            for seq, _, command_device, issued in reversed(self._commands):
+                if seq <= last_seen:
+                    break
+                if seq > applied:
+                    continue
+                if device_key is not None and command_device != device_key:
+                    continue
+                histogram = histograms.get(command_device)
+                if histogram is None:
+                    histogram = histograms[command_device] = LatencyHistogram()
+                histogram.observe((now - issued) * 1000)
+        return applied
+
+    def metric_summary(self, metric):
+        """Return a combined summary plus per-path summaries for a metric."""
+        combined = LatencyHistogram()
+        paths = {}
+        for device_key, histogram in self.histograms.get(metric, {}).items():
+            paths[device_key] = histogram.summary()
+            combined.count += histogram.count
+            combined.total += histogram.total
+            combined.max = max(combined.max, histogram.max)
+            combined.counts = [a + b for a, b in zip(combined.counts, histogram.counts)]
+        summary = combined.summary()
+        summary["paths"] = paths
+        return summary
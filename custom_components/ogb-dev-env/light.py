@@ -4,7 +4,7 @@ from homeassistant.components.light import LightEntity, ColorMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from .const import DOMAIN
-from .devices import TEST_DEVICES
+from .writer import async_schedule_write
 from . import OGBDevRestoreEntity
 
 
@@ -12,7 +12,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     """Set up OGB Dev lights."""
     entities = []
 
-    for device_key, device_config in TEST_DEVICES.items():
+    for device_key, device_config in hass.data[DOMAIN][entry.entry_id]["devices"].items():
         if device_config.get("type") != "Light":
             continue
 
@@ -33,6 +33,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             )
             entities.append(spectrum_light)
 
+    data_entry = hass.data[DOMAIN][entry.entry_id]
+    data_entry.setdefault("entities", []).extend(entities)
+
     if entities:
         async_add_entities(entities)
 
@@ -100,12 +103,7 @@ class OGBDevLight(OGBDevRestoreEntity, LightEntity):
         self._attr_is_on = is_on
         self._attr_brightness = int((self._intensity / 100) * 255)
         self._attr_extra_state_attributes = {"intensity": self._intensity}
-        self._hass.states.async_set(
-            self.entity_id,
-            "on" if is_on else "off",
-            {"brightness": self._attr_brightness, "intensity": self._intensity}
-        )
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     @property
     def is_on(self):
@@ -119,6 +117,7 @@ class OGBDevLight(OGBDevRestoreEntity, LightEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn the light on."""
+        correlation_id = self._correlation_id()
         if "brightness_pct" in kwargs:
             self._intensity = kwargs["brightness_pct"]
         elif "brightness" in kwargs:
@@ -130,26 +129,25 @@ class OGBDevLight(OGBDevRestoreEntity, LightEntity):
             await self.async_turn_off()
             return
 
-        await self._state_manager.set_device_state(self._device_key, "power", True)
-        await self._state_manager.set_device_state(self._device_key, "intensity", self._intensity)
+        await self._state_manager.set_device_state(self._device_key, "power", True, correlation_id)
+        await self._state_manager.set_device_state(self._device_key, "intensity", self._intensity, correlation_id)
         self._state = self._state_manager.get_device_state(self._device_key)
         self._attr_is_on = True
         self._attr_brightness = int((self._intensity / 100) * 255)
         self._attr_extra_state_attributes = {"intensity": self._intensity}
-        self._hass.states.async_set(self.entity_id, "on", {"brightness": self._attr_brightness, "intensity": self._intensity})
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     async def async_turn_off(self, **kwargs):
         """Turn the light off."""
-        await self._state_manager.set_device_state(self._device_key, "power", False)
-        await self._state_manager.set_device_state(self._device_key, "intensity", 0)
+        correlation_id = self._correlation_id()
+        await self._state_manager.set_device_state(self._device_key, "power", False, correlation_id)
+        await self._state_manager.set_device_state(self._device_key, "intensity", 0, correlation_id)
         self._state = self._state_manager.get_device_state(self._device_key)
         self._attr_is_on = False
         self._attr_brightness = 0
         self._intensity = 0
         self._attr_extra_state_attributes = {"intensity": 0}
-        self._hass.states.async_set(self.entity_id, "off", {"brightness": 0, "intensity": 0})
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     async def async_toggle(self, **kwargs):
         """Toggle the light."""
@@ -218,12 +216,7 @@ class OGBDevSpectrumLight(OGBDevRestoreEntity, LightEntity):
         self._attr_is_on = is_on
         self._attr_brightness = int((self._intensity / 100) * 255)
         self._attr_extra_state_attributes = {"intensity": self._intensity}
-        self._hass.states.async_set(
-            self.entity_id,
-            "on" if is_on else "off",
-            {"brightness": self._attr_brightness, "intensity": self._intensity}
-        )
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     @property
     def is_on(self):
@@ -237,6 +230,7 @@ class OGBDevSpectrumLight(OGBDevRestoreEntity, LightEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn the light on."""
+        correlation_id = self._correlation_id()
         if "brightness_pct" in kwargs:
             self._intensity = kwargs["brightness_pct"]
         elif "brightness" in kwargs:
@@ -248,26 +242,25 @@ class OGBDevSpectrumLight(OGBDevRestoreEntity, LightEntity):
             await self.async_turn_off()
             return
 
-        await self._state_manager.set_device_state(self._device_key, "power", True)
-        await self._state_manager.set_device_state(self._device_key, "intensity", self._intensity)
+        await self._state_manager.set_device_state(self._device_key, "power", True, correlation_id)
+        await self._state_manager.set_device_state(self._device_key, "intensity", self._intensity, correlation_id)
         self._state = self._state_manager.get_device_state(self._device_key)
         self._attr_is_on = True
         self._attr_brightness = int((self._intensity / 100) * 255)
         self._attr_extra_state_attributes = {"intensity": self._intensity}
-        self._hass.states.async_set(self.entity_id, "on", {"brightness": self._attr_brightness, "intensity": self._intensity})
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     async def async_turn_off(self, **kwargs):
         """Turn the light off."""
-        await self._state_manager.set_device_state(self._device_key, "power", False)
-        await self._state_manager.set_device_state(self._device_key, "intensity", 0)
+        correlation_id = self._correlation_id()
+        await self._state_manager.set_device_state(self._device_key, "power", False, correlation_id)
+        await self._state_manager.set_device_state(self._device_key, "intensity", 0, correlation_id)
         self._state = self._state_manager.get_device_state(self._device_key)
         self._attr_is_on = False
         self._attr_brightness = 0
         self._intensity = 0
         self._attr_extra_state_attributes = {"intensity": 0}
-        self._hass.states.async_set(self.entity_id, "off", {"brightness": 0, "intensity": 0})
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     async def async_toggle(self, **kwargs):
         """Toggle the light."""
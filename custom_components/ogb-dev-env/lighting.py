@@ -0,0 +1,113 @@
+"""Spectrum-aware lighting model for OGB Dev Environment."""
+from .actuators import actuator_fields
+
+# Spectral bins (photon output) and their wavelength ranges in nm.
+BINS = ("uv", "blue", "green", "red", "far_red")  # 280-400, 400-500, 500-600, 600-700, 700-800
+PAR_BINS = (1, 2, 3)
+
+# Approximate lux per µmol/m²/s in each bin.
+LUX_PER_PHOTON = (0.0, 20.0, 90.0, 45.0, 0.5)
+
+FIXTURE_DEFAULTS = {
+    "watts": 100.0,  # W drawn at full output
+    "efficacy": 2.5,  # µmol/J over all bins
+    "spectrum": {"red": 1.0},  # photon fraction per bin
+    "utilization": 0.85,  # fraction of photons reaching the canopy
+    "switch": "power",
+    "level": None,  # 0-100 state field dimming the fixture
+}
+
+
+class LightingModel:
+    """Photon and heat output of every light fixture in the catalog.
+
+    Each fixture's heat and per-bin canopy photon flux are precomputed at
+    full output. A step only reads each fixture's drive and recomputes
+    the zone totals when one of them changed, so the spectral sensors
+    cost nothing while the lights hold steady.
+    """
+
+    def __init__(self, catalog, area):
+        self.devices = []
+        self.switches = []
+        self.levels = []
+        self.watts = []
+        self.photons = []
+
+        for device_key, device_config in catalog.items():
+            fixture = device_config.get("fixture")
+            if not fixture:
+                continue
+            params = {**FIXTURE_DEFAULTS, **fixture}
+            flux = float(params["watts"]) * float(params["efficacy"]) * float(params["utilization"]) / area
+            spectrum = params["spectrum"]
+            switch, level = actuator_fields(device_config, params)
+            self.devices.append(device_key)
+            self.switches.append(switch)
+            self.levels.append(level)
+            self.watts.append(float(params["watts"]))
+            self.photons.append(tuple(flux * float(spectrum.get(name, 0.0)) for name in BINS))
+
+        self.drive = [0.0] * len(self.devices)
+        self.heat = 0.0
+        self.bins = [0.0] * len(BINS)
+        self._rows = None
+
+    def __getstate__(self):
+        """Drop the device table binding when shipped to a worker."""
+        state = self.__dict__.copy()
+        state["_rows"] = None
+        state.pop("_switch_columns", None)
+        state.pop("_level_columns", None)
+        return state
+
+    def bind(self, device_states):
+        """Resolve table rows and state columns for every fixture."""
+        self._rows = [device_states.index.get(key) for key in self.devices]
+        self._switch_columns = [device_states.column(field) for field in self.switches]
+        self._level_columns = [
+            device_states.column(field) if field else None for field in self.levels
+        ]
+        self.drive = [None] * len(self.devices)
+
+    def update(self):
+        """Refresh the totals when any fixture's drive changed."""
+        changed = False
+        drive = self.drive
+        for index, row in enumerate(self._rows):
+            value = 0.0
+            switch = self._switch_columns[index][row] if row is not None else None
+            if switch:
+                level_column = self._level_columns[index]
+                level = level_column[row] if level_column is not None else None
+                value = float(switch) * (level / 100 if level is not None else 1.0)
+            if value != drive[index]:
+                drive[index] = value
+                changed = True
+
+        if changed:
+            self.heat = 0.0
+            self.bins = [0.0] * len(BINS)
+            for value, watts, photons in zip(drive, self.watts, self.photons):
+                if value:
+                    self.heat += watts * value
+                    for index, flux in enumerate(photons):
+                        self.bins[index] += flux * value
+        return changed
+
+    @property
+    def ppfd(self):
+        """Return the photosynthetic photon flux density at the canopy."""
+        return sum(self.bins[index] for index in PAR_BINS)
+
+    def publish(self, environment):
+        """Write the spectral readings into the environment."""
+        uv, blue, green, red, far_red = self.bins
+        environment["uv_intensity"] = uv
+        environment["ppfd_blue"] = blue
+        environment["ppfd_green"] = green
+        environment["ppfd_red"] = red
+        environment["ppfd_far_red"] = far_red
+        environment["illuminance"] = sum(flux * lux for flux, lux in zip(self.bins, LUX_PER_PHOTON))
+        environment["red_far_red_ratio"] = red / far_red if far_red else None
+        environment["blue_red_ratio"] = blue / red if red else None
@@ -0,0 +1,158 @@
+"""Synthetic command load generator for OGB Dev Environment."""
+import asyncio
+import logging
+import time
+from random import Random
+
+from homeassistant.core import Context
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMAND_TURN_ON = "turn_on"
+COMMAND_TURN_OFF = "turn_off"
+COMMAND_INTENSITY = "intensity"
+COMMAND_PERCENTAGE = "percentage"
+
+DEFAULT_WEIGHTS = {
+    COMMAND_TURN_ON: 1.0,
+    COMMAND_TURN_OFF: 1.0,
+    COMMAND_INTENSITY: 1.0,
+    COMMAND_PERCENTAGE: 1.0,
+}
+
+DISTRIBUTION_UNIFORM = "uniform"
+DISTRIBUTION_NORMAL = "normal"
+DISTRIBUTIONS = [DISTRIBUTION_UNIFORM, DISTRIBUTION_NORMAL]
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LoadGenerator:
+    """Issues seeded random commands against simulated entities at a target rate.
+
+    Commands are scheduled open-loop at ``rate`` per second; when a command
+    takes longer than its slot the next one fires immediately, so the
+    achieved rate shows how much load the integration actually sustains.
+    """
+
+    def __init__(
+        self,
+        entities,
+        rate,
+        duration,
+        seed=None,
+        weights=None,
+        distribution=DISTRIBUTION_UNIFORM,
+        mean=50.0,
+        sigma=25.0,
+    ):
+        self.rate = rate
+        self.duration = duration
+        self.seed = seed
+        self.distribution = distribution
+        self.mean = mean
+        self.sigma = sigma
+        self._random = Random(seed)
+
+        self._targets = {command: [] for command in DEFAULT_WEIGHTS}
+        for entity in entities:
+            for command in self._commands_for(entity):
+                self._targets[command].append(entity)
+
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self._commands = [
+            command for command in DEFAULT_WEIGHTS
+            if self._targets[command] and weights.get(command, 0) > 0
+        ]
+        self._weights = [weights[command] for command in self._commands]
+
+    @staticmethod
+    def _commands_for(entity):
+        """Return the commands an entity accepts."""
+        commands = []
+        if hasattr(entity, "async_turn_on"):
+            commands.append(COMMAND_TURN_ON)
+        if hasattr(entity, "async_turn_off"):
+            commands.append(COMMAND_TURN_OFF)
+        if hasattr(entity, "brightness"):
+            commands.append(COMMAND_INTENSITY)
+        if hasattr(entity, "async_set_percentage"):
+            commands.append(COMMAND_PERCENTAGE)
+        return commands
+
+    def _value(self):
+        """Draw a 1-100 command value from the configured distribution."""
+        if self.distribution == DISTRIBUTION_NORMAL:
+            value = self._random.gauss(self.mean, self.sigma)
+        else:
+            value = self._random.uniform(1, 100)
+        return int(max(1, min(100, round(value))))
+
+    async def _async_issue(self, command, entity):
+        """Issue one command against an entity, under its own context."""
+        entity.async_set_context(Context())
+        if command == COMMAND_TURN_ON:
+            await entity.async_turn_on()
+        elif command == COMMAND_TURN_OFF:
+            await entity.async_turn_off()
+        elif command == COMMAND_INTENSITY:
+            await entity.async_turn_on(brightness_pct=self._value())
+        elif command == COMMAND_PERCENTAGE:
+            await entity.async_set_percentage(self._value())
+
+    async def async_run(self):
+        """Run the load test and return a throughput and latency report."""
+        if not self._commands:
+            raise HomeAssistantError("No entities accept the requested commands")
+
+        total = max(1, int(self.rate * self.duration))
+        interval = 1.0 / self.rate
+        latencies = []
+        counts = {command: 0 for command in self._commands}
+        errors = 0
+
+        start = time.monotonic()
+        for index in range(total):
+            delay = start + index * interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            command = self._random.choices(self._commands, self._weights)[0]
+            entity = self._random.choice(self._targets[command])
+
+            issued = time.perf_counter()
+            try:
+                await self._async_issue(command, entity)
+            except Exception as ex:
+                errors += 1
+                _LOGGER.debug(f"Load command {command} on {entity.entity_id} failed: {ex}")
+            latencies.append((time.perf_counter() - issued) * 1000)
+            counts[command] += 1
+
+        elapsed = time.monotonic() - start
+        latencies.sort()
+        report = {
+            "commands": total,
+            "errors": errors,
+            "duration": round(elapsed, 3),
+            "target_rate": self.rate,
+            "achieved_rate": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+            "seed": self.seed,
+            "by_command": counts,
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies), 3),
+                "p50": round(percentile(latencies, 0.50), 3),
+                "p90": round(percentile(latencies, 0.90), 3),
+                "p99": round(percentile(latencies, 0.99), 3),
+                "max": round(latencies[-1], 3),
+            },
+        }
+        _LOGGER.info(f"Load test finished: {report}")
+        return report
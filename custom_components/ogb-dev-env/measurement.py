@@ -0,0 +1,192 @@
+"""Sensor measurement models for OGB Dev Environment."""
+from math import exp
+from random import Random
+
+MODEL_DEFAULTS = {
+    "lag": 0.0,
+    "bias": 0.0,
+    "drift": 0.0,
+    "noise": 0.0,
+    "quantization": 0.0,
+    "sample_interval": 0.0,
+    "dropout": 0.0,
+}
+
+# Per-cell sources (<key>_<cell>) read the tent mean while the spatial
+# air model is off and publishes no cells.
+CELL_SOURCES = ("air_temperature", "air_humidity")
+
+# Significant-change rule of a sensor's published state: a reading is only
+# published once it moves more than absolute or relative * |last| away
+# from the last published value, or the last one is max_age seconds old.
+SIGNIFICANCE_DEFAULTS = {
+    "absolute": 0.0,
+    "relative": 0.0,
+    "max_age": 900.0,
+}
+# Per-unit rules, overridden by a sensor's "significance" block.
+UNIT_SIGNIFICANCE = {
+    "°C": {"absolute": 0.2},
+    "%": {"absolute": 0.5},
+    "ppm": {"relative": 0.02},
+    "µS/cm": {"relative": 0.02},
+    "us": {"absolute": 0.02},
+    "ppt": {"absolute": 0.02},
+    "mV": {"absolute": 5.0},
+    "µmol/m²/s": {"absolute": 1.0, "relative": 0.02},
+    "lx": {"absolute": 10.0, "relative": 0.02},
+    "": {"relative": 0.02},
+}
+
+
+def significance_rule(sensor_config):
+    """Return the significant-change rule of a catalog sensor."""
+    return {
+        **SIGNIFICANCE_DEFAULTS,
+        **UNIT_SIGNIFICANCE.get(sensor_config.get("unit"), {}),
+        **sensor_config.get("significance", {}),
+    }
+
+
+class ChangeFilter:
+    """Holds back readings that differ insignificantly from the last published one."""
+
+    __slots__ = ("absolute", "relative", "max_age", "value", "published_at", "published", "suppressed")
+
+    def __init__(self, rule):
+        self.absolute = float(rule["absolute"])
+        self.relative = float(rule["relative"])
+        self.max_age = float(rule["max_age"])
+        self.value = None
+        self.published_at = None
+        self.published = 0
+        self.suppressed = 0
+
+    def update(self, value, now):
+        """Offer a reading at time ``now`` (s); return the value to publish."""
+        last = self.value
+        if self.published_at is not None and value is not None and last is not None:
+            fresh = self.max_age <= 0 or now - self.published_at < self.max_age
+            if fresh and abs(value - last) <= max(self.absolute, self.relative * abs(last)):
+                self.suppressed += 1
+                return last
+        self.value = value
+        self.published_at = now
+        self.published += 1
+        return value
+
+
+class SensorBank:
+    """Measurement models for every simulated sensor, sampled in one pass.
+
+    Each sensor reads an environment value through a first-order response
+    lag (``lag`` seconds), then adds a fixed ``bias``, a ``drift`` that
+    grows per hour, gaussian ``noise`` and ``quantization``. A new sample
+    is taken every ``sample_interval`` seconds and dropped with probability
+    ``dropout``. Parameters live in parallel lists, so one loop per
+    simulation step updates all sensors and reads return the cached sample.
+    """
+
+    def __init__(self, catalog, seed=None):
+        self.keys = []
+        self.sources = []
+        self.fallbacks = []
+        self.lag = []
+        self.bias = []
+        self.drift = []
+        self.noise = []
+        self.quantization = []
+        self.sample_interval = []
+        self.dropout = []
+
+        for device_key, device_config in catalog.items():
+            for sensor_config in device_config.get("sensors", []):
+                if "source" in sensor_config:
+                    self._add(
+                        f"{device_key}.{sensor_config['name']}",
+                        sensor_config["source"],
+                        **sensor_config.get("model", {}),
+                    )
+
+        self._random = Random(seed)
+        self._reset()
+
+    def _add(self, key, source, **model):
+        """Register a sensor reading an environment value."""
+        params = {**MODEL_DEFAULTS, **model}
+        self.keys.append(key)
+        self.sources.append(source)
+        self.fallbacks.append(next((base for base in CELL_SOURCES if source.startswith(f"{base}_")), None))
+        self.lag.append(float(params["lag"]))
+        self.bias.append(float(params["bias"]))
+        self.drift.append(float(params["drift"]))
+        self.noise.append(float(params["noise"]))
+        self.quantization.append(float(params["quantization"]))
+        self.sample_interval.append(float(params["sample_interval"]))
+        self.dropout.append(float(params["dropout"]))
+
+    def _reset(self):
+        """Size the per-sensor state to the registered sensors."""
+        count = len(self.keys)
+        self.index = {key: index for index, key in enumerate(self.keys)}
+        self.filtered = [None] * count
+        self.offset = [0.0] * count
+        self.next_sample = [0.0] * count
+        self.readings = [None] * count
+        self.unavailable = set()
+        self._alpha_dt = None
+
+    def _alphas(self, dt):
+        """Return the lag filter gains for a step length, cached per dt."""
+        if dt != self._alpha_dt:
+            self._alpha = [1.0 - exp(-dt / lag) if lag > 0 else 1.0 for lag in self.lag]
+            self._alpha_dt = dt
+        return self._alpha
+
+    def sample(self, environment, dt, clock):
+        """Advance every sensor model by one simulation step."""
+        rng = self._random
+        alpha = self._alphas(dt)
+        hours = dt / 3600
+        filtered = self.filtered
+        readings = self.readings
+
+        for index, source in enumerate(self.sources):
+            true_value = environment.get(source)
+            if true_value is None and self.fallbacks[index] is not None:
+                true_value = environment.get(self.fallbacks[index])
+            if true_value is None:
+                filtered[index] = None
+                readings[index] = None
+                continue
+
+            value = filtered[index]
+            value = true_value if value is None else value + (true_value - value) * alpha[index]
+            filtered[index] = value
+            self.offset[index] += self.drift[index] * hours
+
+            if clock < self.next_sample[index]:
+                continue
+            self.next_sample[index] = clock + self.sample_interval[index]
+
+            if self.dropout[index] and rng.random() < self.dropout[index]:
+                readings[index] = None
+                continue
+
+            value += self.bias[index] + self.offset[index]
+            if self.noise[index]:
+                value += rng.gauss(0.0, self.noise[index])
+            quantum = self.quantization[index]
+            if quantum:
+                value = round(value / quantum) * quantum
+            readings[index] = value
+
+    def available(self, key):
+        """Return whether a sensor is reachable."""
+        index = self.index.get(key)
+        return index is None or index not in self.unavailable
+
+    def reading(self, key):
+        """Return the cached sample of a sensor, or None."""
+        index = self.index.get(key)
+        return None if index is None else self.readings[index]
@@ -4,14 +4,14 @@ from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from .const import DOMAIN 
-from .devices import TEST_DEVICES
+from .writer import async_schedule_write
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up OGB Dev numbers."""
     entities = []
 
-    for device_key, device_config in TEST_DEVICES.items():
+    for device_key, device_config in hass.data[DOMAIN][entry.entry_id]["devices"].items():
         # Skip devices that have dedicated entities
         if device_config.get("type") in ["Light", "Exhaust", "Intake"]:
             continue
@@ -81,4 +81,4 @@ class OGBDevNumber(NumberEntity):
     async def async_set_native_value(self, value):
         """Set the value."""
         self._state_manager.set_device_state(self._device_key, self._setter_key, value)
-        self.async_write_ha_state()
\ No newline at end of file
+        async_schedule_write(self)
\ No newline at end of file
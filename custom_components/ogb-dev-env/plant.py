@@ -0,0 +1,105 @@
+"""Plant canopy model for OGB Dev Environment."""
+from math import exp
+
+# Leaf area index of the canopy in each grow stage.
+GROW_STAGES = {
+    "germination": 0.05,
+    "seedling": 0.3,
+    "vegetative": 1.5,
+    "early_flower": 3.0,
+    "mid_flower": 3.5,
+    "late_flower": 2.5,
+}
+
+CANOPY_DEFAULTS = {
+    "area": 1.44,  # m² of canopy ground area
+    "stage": "vegetative",
+    "extinction": 0.65,  # light extinction coefficient of the leaves
+    "conductance": 0.15,  # L/h per m² per kPa of VPD with open stomata
+    "night_conductance": 0.1,  # fraction of conductance left in the dark
+    "stomatal_light": 600.0,  # µmol/m²/s where stomata are fully open
+    "radiation": 0.0001,  # L/h per m² per µmol/m²/s absorbed
+    "amax": 20.0,  # µmol CO2/m²/s light saturated at 400 ppm
+    "quantum_yield": 0.05,  # µmol CO2 per µmol photons
+    "co2_half": 400.0,  # ppm of half-saturated CO2 response
+    "respiration": 0.1,  # fraction of amax respired
+    "leaf_heating": 0.002,  # °C above air per µmol/m²/s absorbed
+    "leaf_cooling": 1.0,  # °C below air per kPa of VPD with open stomata
+}
+
+# L/h of CO2 per µmol/s at room conditions.
+LITERS_PER_MICROMOLE_SECOND = 3600 * 22.4e-6
+
+
+class Canopy:
+    """Big-leaf canopy coupling light, VPD and CO2.
+
+    Leaf area comes from the grow stage, so the light interception and
+    all per-area coefficients are precomputed once per stage and a step
+    is a handful of multiplications regardless of plant count.
+    Transpiration follows VPD through light-dependent stomatal opening
+    plus absorbed radiation; net CO2 uptake follows a saturating light
+    response scaled by CO2 minus maintenance respiration.
+    """
+
+    __slots__ = (
+        "area", "stage", "extinction", "conductance", "night_conductance",
+        "stomatal_light", "radiation", "amax", "quantum_yield", "co2_half",
+        "respiration", "leaf_heating", "leaf_cooling", "_stages", "_coefficients",
+    )
+
+    def __init__(self, config=None):
+        params = {**CANOPY_DEFAULTS, **(config or {})}
+        self.area = float(params["area"])
+        self.extinction = float(params["extinction"])
+        self.conductance = float(params["conductance"])
+        self.night_conductance = float(params["night_conductance"])
+        self.stomatal_light = float(params["stomatal_light"])
+        self.radiation = float(params["radiation"])
+        self.amax = float(params["amax"])
+        self.quantum_yield = float(params["quantum_yield"])
+        self.co2_half = float(params["co2_half"])
+        self.respiration = float(params["respiration"])
+        self.leaf_heating = float(params["leaf_heating"])
+        self.leaf_cooling = float(params["leaf_cooling"])
+        self._stages = {stage: self._precompute(lai) for stage, lai in GROW_STAGES.items()}
+        self.set_stage(params["stage"])
+
+    def _precompute(self, lai):
+        """Return the per-stage coefficients for a leaf area index."""
+        intercepted = self.area * (1 - exp(-self.extinction * lai))
+        return (
+            intercepted * self.conductance,
+            intercepted * self.radiation,
+            intercepted * self.amax,
+            intercepted * self.amax * self.respiration,
+        )
+
+    def set_stage(self, stage):
+        """Switch to the precomputed coefficients of a grow stage."""
+        if stage not in self._stages:
+            stage = CANOPY_DEFAULTS["stage"]
+        self.stage = stage
+        self._coefficients = self._stages[stage]
+
+    def _opening(self, ppfd):
+        """Return the stomatal opening fraction under a PPFD."""
+        return self.night_conductance + (1 - self.night_conductance) * min(1.0, ppfd / self.stomatal_light)
+
+    def leaf_temperature(self, air_temperature, ppfd, vpd):
+        """Return the leaf temperature from radiative heating and evaporative cooling."""
+        return air_temperature + self.leaf_heating * ppfd - self.leaf_cooling * max(0.0, vpd) * self._opening(ppfd)
+
+    def step(self, ppfd, vpd, co2):
+        """Return transpiration (L/h) and net CO2 uptake (L/h)."""
+        conductance, radiation, amax, respiration = self._coefficients
+
+        transpiration = conductance * max(0.0, vpd) * self._opening(ppfd) + radiation * ppfd
+
+        gross = 0.0
+        if ppfd > 0 and self.amax > 0:
+            light_response = 1 - exp(-self.quantum_yield * ppfd / self.amax)
+            co2_response = co2 / (co2 + self.co2_half) * (400 + self.co2_half) / 400
+            gross = amax * light_response * co2_response
+        uptake = (gross - respiration) * LITERS_PER_MICROMOLE_SECOND
+        return transpiration, uptake
@@ -0,0 +1,99 @@
+"""Tent profile library for OGB Dev Environment."""
+import json
+import os
+
+from .const import SIMULATION_INTERVAL
+
+AIR_HEAT_CAPACITY = 1206.0  # J/m³/K
+
+PROFILE_DEFAULTS = {
+    "width": 1.2,  # m
+    "depth": 1.2,  # m
+    "height": 2.0,  # m
+    "u_value": 3.85,  # W/m²/K through the walls
+    "thermal_mass": 32.5,  # kJ/K of frame, pots, substrate and plants besides the air
+    "leakage": 1.2,  # air changes per hour through seams and closed ports
+}
+
+TENT_PROFILES = {
+    "60x60x140": {"width": 0.6, "depth": 0.6, "height": 1.4, "thermal_mass": 8.0, "leakage": 1.6},
+    "80x80x160": {"width": 0.8, "depth": 0.8, "height": 1.6, "thermal_mass": 14.0, "leakage": 1.5},
+    "100x100x200": {"width": 1.0, "depth": 1.0, "height": 2.0, "thermal_mass": 23.0, "leakage": 1.3},
+    "120x120x200": {},
+    "150x150x200": {"width": 1.5, "depth": 1.5, "height": 2.0, "thermal_mass": 50.0, "leakage": 1.1},
+    "240x120x200": {"width": 2.4, "depth": 1.2, "height": 2.0, "thermal_mass": 65.0, "leakage": 1.1},
+    "grow_room": {"width": 3.0, "depth": 3.0, "height": 2.5, "u_value": 0.8, "thermal_mass": 400.0, "leakage": 0.5},
+}
+DEFAULT_TENT_PROFILE = "120x120x200"
+
+# Calibrated step coefficients of the default tent; other tents scale them.
+REFERENCE_COEFFICIENTS = {
+    "exchange_per_m3h": 0.0005,  # fraction of the tent's heat carried per m³/h
+    "air_change_per_m3h": 0.0005,  # fraction of the tent's CO2 replaced per m³/h
+    "drying_per_m3h": 0.0015,  # % RH per m³/h of exhaust
+    "humidity_per_gram": 0.5 / 400,  # % RH per g/h
+    "co2_per_liter": 3.0,  # ppm per L/h
+}
+
+
+def _physics(profile):
+    """Return the heat capacity (J/K), wall conductance (W/K) and air volume (m³)."""
+    width, depth, height = profile["width"], profile["depth"], profile["height"]
+    volume = width * depth * height
+    surface = 2 * (width * depth + width * height + depth * height)
+    capacity = volume * AIR_HEAT_CAPACITY + profile["thermal_mass"] * 1000
+    return capacity, profile["u_value"] * surface, volume
+
+
+def load_profiles(path):
+    """Return the bundled library with the profiles of a JSON file (name -> profile) added.
+
+    TENT_PROFILES itself is not changed. Raises ValueError for a
+    malformed file and OSError for an unreadable one.
+    """
+    if not os.path.exists(path):
+        return dict(TENT_PROFILES)
+    with open(path, encoding="utf-8") as file:
+        profiles = json.load(file)
+    if not isinstance(profiles, dict) or not all(isinstance(profile, dict) for profile in profiles.values()):
+        raise ValueError("must map profile names to profiles")
+    return {**TENT_PROFILES, **profiles}
+
+
+def tent_profile(profile, profiles=None):
+    """Return the full parameters of a profile dict or a profile name in a library.
+
+    Names are looked up in ``profiles``, default the bundled library.
+    """
+    if isinstance(profile, str):
+        library = TENT_PROFILES if profiles is None else profiles
+        profile = library.get(profile, TENT_PROFILES[DEFAULT_TENT_PROFILE])
+    return {**PROFILE_DEFAULTS, **(profile or {})}
+
+
+def tent_coefficients(profile):
+    """Precompute the per-step coefficients of a tent.
+
+    Heating, wall losses and leakage follow directly from the heat
+    capacity, wall conductance and air change rate. Airflow and moisture
+    terms keep the default tent's calibration, scaled by heat capacity
+    or air volume relative to it. Calibrated profiles override any of
+    them with a "coefficients" block.
+    """
+    params = tent_profile(profile)
+    capacity, conductance, volume = _physics(params)
+    reference_capacity, _, reference_volume = _physics(PROFILE_DEFAULTS)
+    per_volume = reference_volume / volume
+    coefficients = {
+        "heat_per_watt": SIMULATION_INTERVAL / capacity,
+        "insulation": conductance * SIMULATION_INTERVAL / capacity,
+        "leak": params["leakage"] * SIMULATION_INTERVAL / 3600,
+        "exchange_per_m3h": REFERENCE_COEFFICIENTS["exchange_per_m3h"] * reference_capacity / capacity,
+        "air_change_per_m3h": REFERENCE_COEFFICIENTS["air_change_per_m3h"] * per_volume,
+        "drying_per_m3h": REFERENCE_COEFFICIENTS["drying_per_m3h"] * per_volume,
+        "humidity_per_gram": REFERENCE_COEFFICIENTS["humidity_per_gram"] * per_volume,
+        "co2_per_liter": REFERENCE_COEFFICIENTS["co2_per_liter"] * per_volume,
+        "area": params["width"] * params["depth"],
+    }
+    coefficients.update(params.get("coefficients", {}))
+    return coefficients
@@ -0,0 +1,19 @@
+"""Psychrometric helpers for OGB Dev Environment."""
+from math import exp
+
+
+def saturation_vapor_pressure(temperature):
+    """Return the saturation vapour pressure in kPa (Tetens)."""
+    return 0.61078 * exp(17.27 * temperature / (temperature + 237.3))
+
+
+def vapor_pressure_deficit(air_temperature, humidity, leaf_temperature=None):
+    """Return the vapour pressure deficit in kPa.
+
+    Without a leaf temperature this is the air VPD; with one it is the
+    leaf VPD (leaf saturation pressure minus actual air vapour pressure).
+    """
+    actual = saturation_vapor_pressure(air_temperature) * humidity / 100
+    if leaf_temperature is None:
+        leaf_temperature = air_temperature
+    return max(0.0, saturation_vapor_pressure(leaf_temperature) - actual)
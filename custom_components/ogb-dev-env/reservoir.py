@@ -0,0 +1,208 @@
+"""Hydroponic reservoir chemistry for OGB Dev Environment."""
+from math import exp, tanh
+
+from .psychrometrics import vapor_pressure_deficit
+
+RESERVOIR_DEFAULTS = {
+    "capacity": 50.0,  # L
+    "volume": 37.5,  # L
+    "temperature": 18.0,  # °C
+    "base_ec": 0.3,  # mS/cm of the make-up water
+    "ph": 7.0,  # pH of the make-up water
+    "buffer": 2.0,  # meq/L per pH unit
+    "alkalinity": 0.0,  # meq dissolved at start (negative is acidic)
+    "uptake_ratio": 0.7,  # nutrient concentration taken up with water
+    "uptake_alkalinity": 0.5,  # meq released per L taken up (nitrate uptake)
+    "evaporation": 0.02,  # L/h per kPa of VPD from the open surface
+    "thermal_time": 400.0,  # s per L to follow air temperature
+    "pump_flow": 120.0,  # L/h drawn while the pump runs
+    "orp": 300.0,  # mV at pH 7
+    "substrate": None,  # substrate the pump irrigates
+    "prefix": "water",
+}
+
+CHANNEL_DEFAULTS = {
+    "flow": 1.0,  # mL/s while the pump runs
+    "ec": 0.0,  # mS/cm added per mL dosed into 1 L
+    "alkalinity": 0.0,  # meq per mL dosed
+}
+
+
+class Reservoir:
+    """Incremental nutrient solution model for one reservoir.
+
+    Tracks volume, the dosed amount of each channel (mL of concentrate),
+    alkalinity for pH buffering, and water temperature. Dosing pump
+    on-time adds concentrate, plants and evaporation remove water, and
+    the pump draws solution for irrigation. Channel coefficients are
+    resolved once, so a step costs O(dosing channels).
+    """
+
+    __slots__ = (
+        "key", "prefix", "substrate", "capacity", "volume", "temperature", "base_ec", "ph0",
+        "buffer", "uptake_ratio", "uptake_alkalinity", "evaporation",
+        "thermal_time", "pump_flow", "orp0", "alkalinity", "channels",
+        "dosed", "flows", "ec_factors", "alkalinities", "_gates", "_pump",
+    )
+
+    def __init__(self, key, config, catalog):
+        params = {**RESERVOIR_DEFAULTS, **config}
+        self.key = key
+        self.prefix = params["prefix"]
+        self.substrate = params["substrate"]
+        self.capacity = float(params["capacity"])
+        self.volume = float(params["volume"])
+        self.temperature = float(params["temperature"])
+        self.base_ec = float(params["base_ec"])
+        self.ph0 = float(params["ph"])
+        self.buffer = float(params["buffer"])
+        self.uptake_ratio = float(params["uptake_ratio"])
+        self.uptake_alkalinity = float(params["uptake_alkalinity"])
+        self.evaporation = float(params["evaporation"])
+        self.thermal_time = float(params["thermal_time"])
+        self.pump_flow = float(params["pump_flow"])
+        self.orp0 = float(params["orp"])
+        self.alkalinity = float(params["alkalinity"])
+
+        # Dosing channels: (device key, gating field) declared by feed devices.
+        self.channels = []
+        self.flows = []
+        self.ec_factors = []
+        self.alkalinities = []
+        for device_key, device_config in catalog.items():
+            dosing = device_config.get("dosing")
+            if not dosing or dosing.get("reservoir", key) != key:
+                continue
+            for field, channel_config in dosing.get("channels", {}).items():
+                channel = {**CHANNEL_DEFAULTS, **channel_config}
+                self.channels.append((device_key, field))
+                self.flows.append(float(channel["flow"]))
+                self.ec_factors.append(float(channel["ec"]))
+                self.alkalinities.append(float(channel["alkalinity"]))
+        initial = params.get("dosed", {})
+        self.dosed = [float(initial.get(field, 0.0)) for _, field in self.channels]
+        self._gates = None
+        self._pump = None
+
+    def __getstate__(self):
+        """Drop the device table binding when shipped to a worker."""
+        return {
+            slot: None if slot in ("_gates", "_pump") else getattr(self, slot)
+            for slot in self.__slots__
+        }
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def as_dict(self):
+        """Return the state that changes while simulating."""
+        return {
+            "volume": self.volume,
+            "temperature": self.temperature,
+            "alkalinity": self.alkalinity,
+            "dosed": {field: dosed for (_, field), dosed in zip(self.channels, self.dosed)},
+        }
+
+    def restore(self, data):
+        """Restore state saved with as_dict."""
+        self.volume = float(data.get("volume", self.volume))
+        self.temperature = float(data.get("temperature", self.temperature))
+        self.alkalinity = float(data.get("alkalinity", self.alkalinity))
+        dosed = data.get("dosed", {})
+        for index, (_, field) in enumerate(self.channels):
+            if field in dosed:
+                self.dosed[index] = float(dosed[field])
+
+    def bind(self, device_states):
+        """Resolve the table cells gating each dosing channel and the pump."""
+        self._gates = [
+            (device_states.column(field), device_states.index.get(device_key))
+            for device_key, field in self.channels
+        ]
+        self._pump = (device_states.column("power"), device_states.index.get(self.key))
+
+    @property
+    def pumping(self):
+        """Return whether the reservoir pump is running."""
+        column, row = self._pump
+        return row is not None and bool(column[row])
+
+    @property
+    def ec(self):
+        """Return the electrical conductivity in mS/cm."""
+        if self.volume <= 0:
+            return self.base_ec
+        total = 0.0
+        for dosed, factor in zip(self.dosed, self.ec_factors):
+            total += dosed * factor
+        return self.base_ec + total / self.volume
+
+    @property
+    def ph(self):
+        """Return the pH from alkalinity and buffer capacity."""
+        if self.volume <= 0:
+            return self.ph0
+        concentration = self.alkalinity / self.volume
+        return max(2.0, min(12.0, self.ph0 + 3.0 * tanh(concentration / (3.0 * self.buffer))))
+
+    def _remove(self, liters, ratio):
+        """Remove water carrying a fraction of the dissolved nutrients."""
+        liters = min(liters, self.volume)
+        if liters <= 0:
+            return 0.0
+        fraction = liters / self.volume * ratio
+        for index in range(len(self.dosed)):
+            self.dosed[index] -= self.dosed[index] * fraction
+        self.alkalinity -= self.alkalinity * fraction
+        self.volume -= liters
+        return liters
+
+    def draw(self, liters):
+        """Draw solution for an emitter; returns the litres delivered."""
+        return self._remove(liters, 1.0)
+
+    def step(self, dt, air_temperature, air_humidity, uptake):
+        """Advance the reservoir by dt seconds.
+
+        uptake is the water plants take from the reservoir in L/h. Returns
+        the litres drawn by the pump for irrigation.
+        """
+        for index, (column, row) in enumerate(self._gates):
+            if row is not None and column[row]:
+                milliliters = self.flows[index] * dt
+                self.dosed[index] += milliliters
+                self.alkalinity += self.alkalinities[index] * milliliters
+                self.volume += milliliters / 1000
+
+        if self.volume > self.capacity:
+            self._remove(self.volume - self.capacity, 1.0)
+
+        taken = self._remove(max(0.0, uptake) * dt / 3600, self.uptake_ratio)
+        self.alkalinity += taken * self.uptake_alkalinity
+
+        vpd = vapor_pressure_deficit(air_temperature, air_humidity)
+        self._remove(self.evaporation * vpd * dt / 3600, 0.0)
+
+        irrigation = 0.0
+        if self.pumping:
+            irrigation = self._remove(self.pump_flow * dt / 3600, 1.0)
+
+        time_constant = max(1.0, self.thermal_time * self.volume)
+        self.temperature += (air_temperature - self.temperature) * (1 - exp(-dt / time_constant))
+        return irrigation
+
+    def publish(self, environment):
+        """Write the reservoir readings into the environment."""
+        prefix = self.prefix
+        ec = self.ec
+        ph = self.ph
+        environment[f"{prefix}_volume"] = self.volume
+        environment[f"{prefix}_level"] = self.volume / self.capacity * 100
+        environment[f"{prefix}_temperature"] = self.temperature
+        environment[f"{prefix}_ec"] = ec
+        environment[f"{prefix}_ppm"] = ec * 700
+        environment[f"{prefix}_tds"] = ec * 500
+        environment[f"{prefix}_sal"] = ec * 0.5
+        environment[f"{prefix}_ph"] = ph
+        environment[f"{prefix}_orp"] = self.orp0 - 59.0 * (ph - 7.0)
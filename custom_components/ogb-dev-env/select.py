@@ -5,6 +5,8 @@ from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from .const import DOMAIN
+from .writer import async_schedule_write
+from .plant import GROW_STAGES
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -13,6 +15,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
     season_select = OGBDevSeasonSelect(hass, entry)
     entities.append(season_select)
+    entities.append(OGBDevGrowStageSelect(hass, entry))
 
     if entities:
         async_add_entities(entities)
@@ -57,10 +60,10 @@ class OGBDevSeasonSelect(SelectEntity, RestoreEntity):
         await super().async_added_to_hass()
         if (state := await self.async_get_last_state()) is not None:
             self._current_option = state.state
-            self._state_manager.environment_simulator.set_season(state.state)
+            await self._state_manager.async_set_season(state.state)
         else:
             self._current_option = self._state_manager.environment_simulator.season
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     @property
     def current_option(self):
@@ -71,9 +74,58 @@ class OGBDevSeasonSelect(SelectEntity, RestoreEntity):
         """Change the selected option."""
         try:
             self._current_option = option
-            self._state_manager.environment_simulator.set_season(option)
-            self.async_write_ha_state()
+            await self._state_manager.async_set_season(option)
+            async_schedule_write(self)
         except Exception as e:
             # Log error but don't fail the selection
             self._hass.logger.error("Error setting season to %s: %s", option, str(e))
-            raise
\ No newline at end of file
+            raise
+
+
+class OGBDevGrowStageSelect(SelectEntity, RestoreEntity):
+    """OGB Dev canopy grow stage select."""
+
+    def __init__(self, hass, entry):
+        self._hass = hass
+        self._entry = entry
+
+        data_entry = self._hass.data.get(DOMAIN, {}).get(self._entry.entry_id, {})
+        if isinstance(data_entry, dict):
+            self._state_manager = data_entry.get("state_manager")
+        else:
+            self._state_manager = data_entry
+
+        self._current_option = self._state_manager.environment_simulator.canopy.stage
+
+        # Entity properties
+        self._attr_unique_id = f"ogb_dev_env_grow_stage_{self._entry.entry_id}"
+        self._attr_name = "OGB Dev Grow Stage"
+        self._attr_options = list(GROW_STAGES)
+        self._attr_current_option = self._current_option
+
+        # Device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "environment_control")},
+            "name": "Environment Control",
+            "manufacturer": "OpenGrowBox",
+            "model": "Dev Environment",
+        }
+
+    async def async_added_to_hass(self):
+        """Restore the last grow stage."""
+        await super().async_added_to_hass()
+        if (state := await self.async_get_last_state()) is not None and state.state in GROW_STAGES:
+            self._current_option = state.state
+            await self._state_manager.async_set_grow_stage(state.state)
+        async_schedule_write(self)
+
+    @property
+    def current_option(self):
+        """Return the current selected option."""
+        return self._current_option
+
+    async def async_select_option(self, option):
+        """Change the selected option."""
+        self._current_option = option
+        await self._state_manager.async_set_grow_stage(option)
+        async_schedule_write(self)
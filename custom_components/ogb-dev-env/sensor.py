@@ -1,24 +1,36 @@
 """Sensor platform for OGB Dev Environment."""
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfEnergy, UnitOfPower, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_state_change_event
-from random import uniform
+import homeassistant.util.dt as dt_util
 from .const import DOMAIN
+from .writer import async_schedule_write
+from .latency import LATENCY_METRICS
+from .measurement import ChangeFilter, significance_rule
 import logging
+import time
 
 _LOGGER = logging.getLogger(__name__ + ".debug")
 
-# Import test devices
-from .devices import TEST_DEVICES
+# Values the simulator derives every step: (environment key, name, unit, icon, state class).
+# Totals restart at the photoperiod boundary, reported as their last_reset.
+ENVIRONMENT_SENSORS = [
+    ("vpd_air", "VPD Air", "kPa", "mdi:water-thermometer", SensorStateClass.MEASUREMENT),
+    ("vpd_leaf", "VPD Leaf", "kPa", "mdi:leaf", SensorStateClass.MEASUREMENT),
+    ("leaf_temperature", "Leaf Temperature", "°C", "mdi:thermometer", SensorStateClass.MEASUREMENT),
+    ("dli", "DLI", "mol/m²/d", "mdi:sun-clock", SensorStateClass.TOTAL),
+    ("power", "Power", UnitOfPower.WATT, "mdi:flash", SensorStateClass.MEASUREMENT),
+]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up OGB Dev sensors."""
     entities = []
 
-    for device_key, device_config in TEST_DEVICES.items():
+    for device_key, device_config in hass.data[DOMAIN][entry.entry_id]["devices"].items():
         if "sensors" in device_config:
             for sensor_config in device_config["sensors"]:
                 sensor = OGBDevSensor(
@@ -29,6 +41,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                     device_key=device_key
                 )
                 entities.append(sensor)
+        if "actuator" in device_config:
+            entities.append(OGBDevPowerSensor(hass=hass, entry=entry, device_config=device_config, device_key=device_key))
+            entities.append(OGBDevDeviceEnergySensor(hass=hass, entry=entry, device_config=device_config, device_key=device_key))
+
+    for key, name, unit, icon, state_class in ENVIRONMENT_SENSORS:
+        entities.append(OGBDevEnvironmentSensor(
+            hass=hass, entry=entry, key=key, name=name, unit=unit, icon=icon, state_class=state_class
+        ))
+
+    entities.append(OGBDevEnergySensor(hass=hass, entry=entry))
+    entities.append(OGBDevEnergyCostSensor(hass=hass, entry=entry))
+    entities.append(OGBDevEnergyPriceSensor(hass=hass, entry=entry))
+
+    for metric in LATENCY_METRICS:
+        entities.append(OGBDevLatencySensor(hass=hass, entry=entry, metric=metric))
 
     if entities:
         async_add_entities(entities)
@@ -49,6 +76,10 @@ class OGBDevSensor(SensorEntity):
         self._sensor_config = sensor_config
         self._device_key = device_key
         self._unsub_listener = None
+        self._latency_seen = 0
+        # Modelled sensors only publish significant changes (plus a heartbeat).
+        self._change_filter = ChangeFilter(significance_rule(sensor_config)) if "source" in sensor_config else None
+        self._value_changed = False
         
         data_entry = self._hass.data.get(DOMAIN, {}).get(self._entry.entry_id, {})
         if isinstance(data_entry, dict):
@@ -125,12 +156,75 @@ class OGBDevSensor(SensorEntity):
 
     async def _handle_state_change(self, event):
         """Handle state change events from tracked entities."""
-        self.async_write_ha_state()
+        if self._change_filter is None or self._filter_reading():
+            async_schedule_write(self, self._sensor_config.get("write_interval"))
+
+    @callback
+    def async_write_ha_state(self):
+        """Write state and record the latency of commands it reflects."""
+        super().async_write_ha_state()
+        self._attr_force_update = False
+        self._observe_change()
+
+    async def async_update(self):
+        """Filter the reading and record command latency ahead of a polled state write."""
+        self._attr_force_update = False
+        if self._change_filter is not None:
+            self._filter_reading()
+        # Polled writes bypass async_write_ha_state and follow this update.
+        self._observe_change()
+
+    def _filter_reading(self):
+        """Offer the latest sample to the significant-change filter.
+
+        Returns whether the filter publishes it. A heartbeat republishes
+        an unchanged value, which HA only records when forced.
+        """
+        change_filter = self._change_filter
+        previous, published = change_filter.value, change_filter.published
+        value = self._state_manager.get_sensor_reading(self._device_key, self._sensor_config["name"])
+        change_filter.update(round(value, 2) if value is not None else None, time.monotonic())
+        if change_filter.published == published:
+            return False
+        self._attr_force_update = True
+        if change_filter.value != previous:
+            self._value_changed = True
+        return True
+
+    def _observe_change(self):
+        """Record command latency when the written state carries a new value."""
+        if self._change_filter is None or self._value_changed:
+            self._value_changed = False
+            self._observe_latency()
+
+    def _observe_latency(self):
+        """Record latency for commands this sensor write now reflects."""
+        sensor_name = self._sensor_config["name"]
+        if sensor_name not in LATENCY_METRICS or self._state_manager is None:
+            return
+        if sensor_name == "illuminance":
+            device_key = "light_main"
+        elif sensor_name in ["intensity", "par", "duty"]:
+            device_key = self._device_key
+        else:
+            device_key = None
+        self._latency_seen = self._state_manager.latency.observe(
+            sensor_name, self._latency_seen, device_key
+        )
+
+    @property
+    def available(self):
+        """Return False while an injected fault makes the sensor unreachable."""
+        if "source" in self._sensor_config and self._state_manager is not None:
+            return self._state_manager.sensor_available(self._device_key, self._sensor_config["name"])
+        return True
 
     @property
     def should_poll(self):
         """Poll for environment sensors, not for light/fan attribute sensors."""
         sensor_name = self._sensor_config["name"]
+        if "source" in self._sensor_config:
+            return True
         if sensor_name in ["intensity", "par", "duty", "illuminance", "Far Red PPFD", "Red PPFD", "Blue PPFD", "UV Intensity"]:
             return False
         return True
@@ -148,95 +242,289 @@ class OGBDevSensor(SensorEntity):
         device_key = self._device_key
         state_manager = self._state_manager
 
-        if sensor_name == "temperature":
-            temp = state_manager.environment["air_temperature"]
-            if device_key == "air_sensor_2":
-                temp += 0.05
-            elif device_key == "air_sensor_3":
-                temp += 0.1
-            return round(temp, 2)
-        elif sensor_name == "humidity":
-            hum = state_manager.environment["air_humidity"]
-            if device_key == "air_sensor_2":
-                hum += 0.5
-            elif device_key == "air_sensor_3":
-                hum += 1.0
-            return round(hum, 2)
-        elif sensor_name == "temperature":
-            if device_key == "sensor_main":
-                return round(state_manager.environment["soil_temperature"], 2)
-            else:
-                return round(state_manager.environment.get("water_temperature", 0), 2)
-        elif sensor_name == "carbondioxide":
-            return round(state_manager.environment["co2_level"], 2)
-        elif sensor_name == "level":
-            return round(state_manager.environment["water_level"], 2)
+        if self._change_filter is not None:
+            if self._change_filter.published_at is None:
+                self._filter_reading()
+            return self._change_filter.value
         elif sensor_name == "intensity":
             entity_id = f"light.{self._device_config['device_id']}"
             light_state = self._hass.states.get(entity_id)
             if light_state:
                 return light_state.attributes.get("intensity", 0)
             return 0
-        elif sensor_name == "par":
-            entity_id = f"light.{self._device_config['device_id']}"
-            light_state = self._hass.states.get(entity_id)
-            if light_state:
-                intensity = light_state.attributes.get("intensity", 0)
-                return round(intensity * 5.3, 2)
-            return 0
         elif sensor_name == "duty":
             entity_id = f"fan.{self._device_config['device_id']}"
             fan_state = self._hass.states.get(entity_id)
             if fan_state:
                 return fan_state.attributes.get("duty", 0)
             return 0
-        elif sensor_name == "illuminance":
-            entity_id = "light.devmainlight"
-            light_state = self._hass.states.get(entity_id)
-            if light_state:
-                intensity = light_state.attributes.get("intensity", 0)
-                power = light_state.state == "on"
-                return intensity * 10 if power else 0
-            return 0
-        elif sensor_name in ["Far Red PPFD", "Red PPFD", "Blue PPFD", "UV Intensity"]:
-            entity_id = f"light.{self._device_config['device_id']}"
-            light_state = self._hass.states.get(entity_id)
-            if light_state:
-                return 100 if light_state.state == "on" else 0
-            return 0
-        elif sensor_name == "par":
-            entity_id = f"light.{self._device_config['device_id']}_light"
-            light_state = self._hass.states.get(entity_id)
-            if light_state:
-                intensity = light_state.attributes.get("intensity", 0)
-                return round(intensity * 5.3, 2)
-            return 0
         elif sensor_name == "duty":
             entity_id = f"fan.{self._device_config['device_id']}_fan"
             fan_state = self._hass.states.get(entity_id)
             if fan_state:
                 return fan_state.attributes.get("duty", 0)
             return 0
-        elif sensor_name == "moisture":
-            return round(55.0 + uniform(-5, 5), 2)
-        elif sensor_name == "conductivity":
-            return round(1200.0 + uniform(-50, 50), 2)
-        elif sensor_name == "soil_temperature":
-            return round(state_manager.environment["soil_temperature"], 2)
-        elif sensor_name == "illuminance":
-            entity_id = "light.devmainlight_light"
-            light_state = self._hass.states.get(entity_id)
-            if light_state:
-                intensity = light_state.attributes.get("intensity", 0)
-                power = light_state.state == "on"
-                return intensity * 10 if power else 0
-            return 0
-        elif sensor_name in ["Far Red PPFD", "Red PPFD", "Blue PPFD", "UV Intensity"]:
-            entity_id = f"light.{self._device_config['device_id']}_light"
-            light_state = self._hass.states.get(entity_id)
-            if light_state:
-                return 100 if light_state.state == "on" else 0
-            return 0
+        else:
+            return self._sensor_config.get("value", 0.0)
 
+
+class OGBDevEnvironmentSensor(SensorEntity):
+    """Sensor reporting a value the simulator derives every step."""
+
+    def __init__(self, hass, entry, key, name, unit, icon, state_class=SensorStateClass.MEASUREMENT):
+        self._hass = hass
+        self._entry = entry
+        self._key = key
+
+        data_entry = self._hass.data.get(DOMAIN, {}).get(self._entry.entry_id, {})
+        if isinstance(data_entry, dict):
+            self._state_manager = data_entry.get("state_manager")
+        else:
+            self._state_manager = data_entry
+
+        self._attr_unique_id = f"ogb_dev_env_{key}_{self._entry.entry_id}"
+        self._attr_name = f"OGB Dev {name}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+        self._attr_state_class = state_class
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "environment_control")},
+            "name": "Environment Control",
+            "manufacturer": "OpenGrowBox",
+            "model": "Dev Environment",
+        }
+
+    @property
+    def native_value(self):
+        """Return the current value."""
+        value = self._state_manager.environment.get(self._key)
+        return round(value, 2) if value is not None else None
+
+    @property
+    def last_reset(self):
+        """Return the start of the photoperiod a total accumulates over."""
+        period_start = self._state_manager.environment.get("photoperiod_start")
+        if self._attr_state_class != SensorStateClass.TOTAL or period_start is None:
+            return None
+        return dt_util.utc_from_timestamp(period_start)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the running photoperiod statistics."""
+        environment = self._state_manager.environment
+        attributes = {}
+        for stat in ("mean", "min", "max"):
+            value = environment.get(f"{self._key}_{stat}")
+            if value is not None:
+                attributes[f"period_{stat}"] = round(value, 2)
+        if environment.get("photoperiod_start") is not None:
+            attributes["period_start"] = dt_util.utc_from_timestamp(environment["photoperiod_start"]).isoformat()
+        return attributes
+
+
+class OGBDevPowerSensor(SensorEntity):
+    """Power draw of one simulated actuator."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass, entry, device_config, device_key):
+        self._hass = hass
+        self._entry = entry
+        self._device_key = device_key
+
+        data_entry = self._hass.data.get(DOMAIN, {}).get(self._entry.entry_id, {})
+        if isinstance(data_entry, dict):
+            self._state_manager = data_entry.get("state_manager")
         else:
-            return self._sensor_config.get("value", 0.0)
\ No newline at end of file
+            self._state_manager = data_entry
+
+        self._attr_unique_id = f"{device_config['device_id']}_power"
+        self._attr_name = f"{device_config['name']} power"
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, device_config["device_id"])},
+            "name": device_config["name"],
+            "manufacturer": device_config.get("manufacturer", "OpenGrowBox"),
+            "model": device_config.get("model", "Dev Environment"),
+        }
+
+    @property
+    def native_value(self):
+        """Return the power draw in W."""
+        value = self._state_manager.get_device_power(self._device_key)
+        return round(value, 1) if value is not None else None
+
+
+class OGBDevDeviceEnergySensor(OGBDevPowerSensor):
+    """Energy use of one simulated actuator."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, hass, entry, device_config, device_key):
+        super().__init__(hass, entry, device_config, device_key)
+        self._attr_unique_id = f"{device_config['device_id']}_energy"
+        self._attr_name = f"{device_config['name']} energy"
+
+    @property
+    def native_value(self):
+        """Return the energy used in kWh."""
+        value = self._state_manager.get_device_energy(self._device_key)
+        return round(value, 3) if value is not None else None
+
+
+class OGBDevEnergySensor(SensorEntity):
+    """Zone energy meter integrating every actuator's power draw."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:lightning-bolt"
+
+    def __init__(self, hass, entry):
+        self._hass = hass
+        self._entry = entry
+
+        data_entry = self._hass.data.get(DOMAIN, {}).get(self._entry.entry_id, {})
+        if isinstance(data_entry, dict):
+            self._state_manager = data_entry.get("state_manager")
+        else:
+            self._state_manager = data_entry
+
+        self._attr_unique_id = f"ogb_dev_env_energy_{self._entry.entry_id}"
+        self._attr_name = "OGB Dev Energy"
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "environment_control")},
+            "name": "Environment Control",
+            "manufacturer": "OpenGrowBox",
+            "model": "Dev Environment",
+        }
+
+    @property
+    def native_value(self):
+        """Return the energy used in kWh."""
+        value = self._state_manager.environment.get("energy")
+        return round(value, 3) if value is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the energy used in each tariff period."""
+        environment = self._state_manager.environment
+        return {
+            key: round(value, 3)
+            for key, value in environment.items()
+            if key.startswith("energy_") and key not in ("energy_cost", "energy_price")
+        }
+
+
+class OGBDevEnergyCostSensor(OGBDevEnergySensor):
+    """Zone energy cost under the configured tariff."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_icon = "mdi:cash"
+
+    def __init__(self, hass, entry):
+        super().__init__(hass, entry)
+        self._attr_unique_id = f"ogb_dev_env_energy_cost_{self._entry.entry_id}"
+        self._attr_name = "OGB Dev Energy Cost"
+        self._attr_native_unit_of_measurement = hass.config.currency
+
+    @property
+    def native_value(self):
+        """Return the energy cost so far."""
+        value = self._state_manager.environment.get("energy_cost")
+        return round(value, 2) if value is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the active tariff period."""
+        return {"tariff_period": self._state_manager.environment.get("tariff_period")}
+
+
+class OGBDevEnergyPriceSensor(SensorEntity):
+    """Current energy price of the active tariff period."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:currency-usd"
+
+    def __init__(self, hass, entry):
+        self._hass = hass
+        self._entry = entry
+
+        data_entry = self._hass.data.get(DOMAIN, {}).get(self._entry.entry_id, {})
+        if isinstance(data_entry, dict):
+            self._state_manager = data_entry.get("state_manager")
+        else:
+            self._state_manager = data_entry
+
+        self._attr_unique_id = f"ogb_dev_env_energy_price_{self._entry.entry_id}"
+        self._attr_name = "OGB Dev Energy Price"
+        self._attr_native_unit_of_measurement = f"{hass.config.currency}/{UnitOfEnergy.KILO_WATT_HOUR}"
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "environment_control")},
+            "name": "Environment Control",
+            "manufacturer": "OpenGrowBox",
+            "model": "Dev Environment",
+        }
+
+    @property
+    def native_value(self):
+        """Return the price per kWh."""
+        return self._state_manager.environment.get("energy_price")
+
+    @property
+    def extra_state_attributes(self):
+        """Return the active tariff period."""
+        return {"tariff_period": self._state_manager.environment.get("tariff_period")}
+
+
+class OGBDevLatencySensor(SensorEntity):
+    """Diagnostic sensor reporting command to sensor update latency."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, hass, entry, metric):
+        self._hass = hass
+        self._entry = entry
+        self._metric = metric
+
+        data_entry = self._hass.data.get(DOMAIN, {}).get(self._entry.entry_id, {})
+        if isinstance(data_entry, dict):
+            self._state_manager = data_entry.get("state_manager")
+        else:
+            self._state_manager = data_entry
+
+        self._attr_unique_id = f"ogb_dev_latency_{metric}_{self._entry.entry_id}"
+        self._attr_name = f"OGB Dev Command Latency {metric.replace('_', ' ').title()}"
+        self._summary = {}
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "environment_control")},
+            "name": "Environment Control",
+            "manufacturer": "OpenGrowBox",
+            "model": "Dev Environment",
+        }
+
+    async def async_update(self):
+        """Refresh the latency summary."""
+        self._summary = self._state_manager.latency.metric_summary(self._metric)
+
+    @property
+    def native_value(self):
+        """Return the 95th percentile latency."""
+        return self._summary.get("p95")
+
+    @property
+    def extra_state_attributes(self):
+        """Return the histogram summary and per-device paths."""
+        return self._summary
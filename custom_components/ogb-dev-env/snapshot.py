@@ -0,0 +1,114 @@
+"""Simulation checkpoints and branches for OGB Dev Environment."""
+import os
+import pickle
+
+from .sweep import SWEEP_DEFAULTS, run_steps
+
+BRANCH_DEFAULTS = {
+    "name": None,
+    "controllers": {},  # loop -> mode, target and gains
+    "commands": {},  # device -> state fields set at the fork
+}
+
+
+class Snapshot:
+    """Immutable checkpoint of a simulator and its device table.
+
+    Both are captured in one pickle, including every model's state and
+    the random generators, so a restore continues exactly where the
+    capture left off. The bytes are never modified: any number of
+    branches share one snapshot and each unpickles its own simulator
+    only when it runs, so forking costs nothing until then.
+    """
+
+    __slots__ = ("data", "clock")
+
+    def __init__(self, data, clock):
+        self.data = data
+        self.clock = clock
+
+    @classmethod
+    def capture(cls, simulator, device_states):
+        """Checkpoint a simulator and its device table."""
+        return cls(pickle.dumps((simulator, device_states), protocol=pickle.HIGHEST_PROTOCOL), simulator.clock)
+
+    def restore(self):
+        """Return a fresh (simulator, device_states) pair from the checkpoint."""
+        return pickle.loads(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def save(self, path):
+        """Write the checkpoint to a file, creating its directory."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(self.data)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a checkpoint written by save."""
+        with open(path, "rb") as file:
+            data = file.read()
+        simulator, _ = pickle.loads(data)
+        return cls(data, simulator.clock)
+
+
+class Branch:
+    """One line of exploration forked from a snapshot."""
+
+    __slots__ = ("snapshot", "name", "controllers", "commands")
+
+    def __init__(self, snapshot, name=None, controllers=None, commands=None):
+        self.snapshot = snapshot
+        self.name = name
+        self.controllers = controllers or {}
+        self.commands = commands or {}
+
+    def materialize(self):
+        """Return the branch's own simulator and device table, actions applied."""
+        simulator, device_states = self.snapshot.restore()
+        for loop, params in self.controllers.items():
+            if loop in simulator.controllers.controllers:
+                simulator.set_controller(loop, **params)
+        for device_key, state in self.commands.items():
+            if device_key in device_states:
+                device_states.view(device_key).update(state)
+        return simulator, device_states
+
+    def run(self, steps, dt, bands=None, policy=None, weather_data=None):
+        """Run the branch and return its summary statistics."""
+        simulator, device_states = self.materialize()
+        bands = SWEEP_DEFAULTS["bands"] if bands is None else bands
+        result = {"branch": self.name}
+        result.update(run_steps(simulator, device_states, steps, dt, bands, policy, weather_data))
+        result["clock"] = simulator.clock
+        return result
+
+
+def fork(snapshot, branches):
+    """Fork branches from a snapshot.
+
+    ``branches`` is a count of identical branches or a list of dicts
+    with the name, controllers and commands of each (see
+    BRANCH_DEFAULTS).
+    """
+    if isinstance(branches, int):
+        return [Branch(snapshot, name=str(index)) for index in range(branches)]
+    forked = []
+    for index, spec in enumerate(branches):
+        params = {**BRANCH_DEFAULTS, **spec}
+        forked.append(Branch(
+            snapshot,
+            name=params["name"] if params["name"] is not None else str(index),
+            controllers=params["controllers"],
+            commands=params["commands"],
+        ))
+    return forked
+
+
+def run_branches(branches, steps, dt, bands=None, weather_data=None):
+    """Run branches one after another; only one is materialized at a time."""
+    return [branch.run(steps, dt, bands, weather_data=weather_data) for branch in branches]
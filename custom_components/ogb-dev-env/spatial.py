@@ -0,0 +1,143 @@
+"""Spatial air model for OGB Dev Environment."""
+from math import exp
+
+SPATIAL_DEFAULTS = {
+    "cells": [],  # cell names; fewer than two leaves the tent well mixed
+    "links": [],  # [cell, cell] pairs exchanging air
+    "diffusion": 0.005,  # fraction of a difference equalised per s per link
+    "mixing": 0.00001,  # extra fraction per s per m³/h of mixing airflow
+    "canopy_cell": None,  # cell the canopy transpires into
+}
+
+
+def grid_cells(nx, ny, nz):
+    """Return the cells and face links of an nx by ny by nz grid."""
+    cells = [f"{x}_{y}_{z}" for z in range(nz) for y in range(ny) for x in range(nx)]
+    links = []
+    for z in range(nz):
+        for y in range(ny):
+            for x in range(nx):
+                if x + 1 < nx:
+                    links.append([f"{x}_{y}_{z}", f"{x + 1}_{y}_{z}"])
+                if y + 1 < ny:
+                    links.append([f"{x}_{y}_{z}", f"{x}_{y + 1}_{z}"])
+                if z + 1 < nz:
+                    links.append([f"{x}_{y}_{z}", f"{x}_{y}_{z + 1}"])
+    return cells, links
+
+
+class AirCells:
+    """Temperature and humidity gradients across cells of one tent.
+
+    The well-mixed model keeps the tent mean; each cell holds its
+    deviation from that mean. Devices placed in a cell (``"cell"`` in
+    the catalog) deposit their heat, moisture and intake air there
+    instead of evenly, and every link then relaxes the difference
+    between its two cells by diffusion plus the mixing fans' airflow.
+    Sources and links live in flat lists, so a step costs one pass over
+    the placed devices and one over the links.
+    """
+
+    def __init__(self, config, catalog, effect_devices, light_devices, factors):
+        params = {**SPATIAL_DEFAULTS, **(config or {})}
+        self.cells = list(params["cells"])
+        index = {cell: position for position, cell in enumerate(self.cells)}
+        self.links = [
+            (index[a], index[b]) for a, b in params["links"] if a in index and b in index
+        ]
+        self.diffusion = float(params["diffusion"])
+        self.mixing = float(params["mixing"])
+        self.canopy_cell = index.get(params["canopy_cell"])
+        # Simulator conversions per nominal step: °C per W, % RH per g/h, exchange per m³/h.
+        self.heat_per_watt, self.humidity_per_gram, self.exchange_per_m3h = factors
+
+        # Placed sources: (cell, effect column or None, light index or None, heat W, moisture g/h, intake m³/h).
+        self.sources = []
+        effect_columns = {key: column for column, key in enumerate(effect_devices)}
+        light_indices = {key: position for position, key in enumerate(light_devices)}
+        for device_key, device_config in catalog.items():
+            cell = index.get(device_config.get("cell"))
+            if cell is None:
+                continue
+            effects = device_config.get("effects") or {}
+            if device_key in effect_columns and any(effects.get(name) for name in ("heat", "moisture", "intake")):
+                self.sources.append((
+                    cell, effect_columns[device_key], None,
+                    float(effects.get("heat", 0.0)),
+                    float(effects.get("moisture", 0.0)),
+                    float(effects.get("intake", 0.0)),
+                ))
+            if device_key in light_indices:
+                fixture = device_config["fixture"]
+                self.sources.append((cell, None, light_indices[device_key], float(fixture.get("watts", 100.0)), 0.0, 0.0))
+
+        count = len(self.cells)
+        self.temperature = [0.0] * count
+        self.humidity = [0.0] * count
+        self.enabled = count > 1
+
+    def step(self, drive, light_drive, transpiration, mixing, air, outside, scale, dt):
+        """Deposit this step's placed sources and exchange air along the links.
+
+        ``air`` and ``outside`` are (temperature, humidity) pairs of the
+        tent mean and the intake air.
+        """
+        count = len(self.cells)
+        heat = [0.0] * count
+        moisture = [0.0] * count
+        cooling = [0.0] * count
+        mean_temp, mean_hum = air
+        outside_temp, outside_hum = outside
+        heat_per_watt = self.heat_per_watt * scale
+        humidity_per_gram = self.humidity_per_gram * scale
+        exchange = self.exchange_per_m3h * scale
+
+        for cell, column, light, watts, grams, airflow in self.sources:
+            level = drive[column] if column is not None else (light_drive[light] or 0.0)
+            if not level:
+                continue
+            heat[cell] += watts * level
+            moisture[cell] += grams * level
+            if airflow:
+                cooling[cell] += airflow * level * exchange
+        if self.canopy_cell is not None:
+            moisture[self.canopy_cell] += transpiration * 1000
+
+        mean_heat = sum(heat) / count
+        mean_moisture = sum(moisture) / count
+        mean_cooling = sum(cooling) / count
+        temperature = self.temperature
+        humidity = self.humidity
+        for cell in range(count):
+            warming = (heat[cell] - mean_heat) * heat_per_watt
+            intake = cooling[cell] - mean_cooling
+            temperature[cell] += warming - intake * (mean_temp + temperature[cell] - outside_temp)
+            humidity[cell] += (
+                (moisture[cell] - mean_moisture) * humidity_per_gram
+                - warming * 0.2
+                + intake * (outside_hum - mean_hum - humidity[cell])
+            )
+        # Keep the deviations centred on the well-mixed mean.
+        drift = sum(temperature) / count
+        wet = sum(humidity) / count
+        for cell in range(count):
+            temperature[cell] -= drift
+            humidity[cell] -= wet
+
+        # Pairwise exchange; exact for each link on its own and stable for any dt.
+        share = 0.5 * (1 - exp(-2 * (self.diffusion + self.mixing * mixing) * dt))
+        for a, b in self.links:
+            flow = (temperature[a] - temperature[b]) * share
+            temperature[a] -= flow
+            temperature[b] += flow
+            flow = (humidity[a] - humidity[b]) * share
+            humidity[a] -= flow
+            humidity[b] += flow
+
+    def publish(self, environment):
+        """Write every cell's temperature and humidity into the environment."""
+        mean_temp = environment["air_temperature"]
+        mean_hum = environment["air_humidity"]
+        for cell, name in enumerate(self.cells):
+            environment[f"air_temperature_{name}"] = mean_temp + self.temperature[cell]
+            environment[f"air_humidity_{name}"] = max(0.0, min(100.0, mean_hum + self.humidity[cell]))
@@ -0,0 +1,157 @@
+"""Compact device state storage for OGB Dev Environment."""
+from collections.abc import MutableMapping
+
+
+class DeviceStateTable:
+    """Struct-of-arrays table holding the state of every device.
+
+    Each state field is one column (a list indexed by device row). Device
+    rows and field columns are resolved once, so the simulation can read
+    fixed offsets instead of walking nested dicts. ``None`` marks a field
+    the device does not have.
+    """
+
+    __slots__ = ("keys", "index", "fields", "columns")
+
+    def __init__(self, catalog):
+        self.keys = list(catalog)
+        self.index = {key: row for row, key in enumerate(self.keys)}
+        self.fields = {}
+        self.columns = []
+        for row, key in enumerate(self.keys):
+            for field, value in catalog[key].get("state", {}).items():
+                self.column(field)[row] = value
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def field_id(self, field):
+        """Return the column id of a field, adding the column if needed."""
+        field_id = self.fields.get(field)
+        if field_id is None:
+            field_id = len(self.columns)
+            self.fields[field] = field_id
+            self.columns.append([None] * len(self.keys))
+        return field_id
+
+    def column(self, field):
+        """Return the column list of a field."""
+        return self.columns[self.field_id(field)]
+
+    def get(self, key, field, default=None):
+        """Return one field of a device."""
+        row = self.index.get(key)
+        field_id = self.fields.get(field)
+        if row is None or field_id is None:
+            return default
+        value = self.columns[field_id][row]
+        return default if value is None else value
+
+    def set(self, key, field, value):
+        """Set one field of a device."""
+        self.columns[self.field_id(field)][self.index[key]] = value
+
+    def view(self, key):
+        """Return a mapping view onto one device's state."""
+        return DeviceState(self, self.index[key])
+
+    def items(self):
+        """Iterate over device keys and their state views."""
+        for row, key in enumerate(self.keys):
+            yield key, DeviceState(self, row)
+
+    def copy(self):
+        """Return an independent copy of the table's values."""
+        table = DeviceStateTable.__new__(DeviceStateTable)
+        table.keys = self.keys
+        table.index = self.index
+        table.fields = dict(self.fields)
+        table.columns = [column[:] for column in self.columns]
+        return table
+
+    def values(self):
+        """Return a copy of every column by field name."""
+        return {field: self.columns[field_id][:] for field, field_id in self.fields.items()}
+
+    def load_values(self, values):
+        """Overwrite columns with values; the column lists stay the same objects."""
+        for field, column in values.items():
+            self.column(field)[:] = column
+
+    def changes(self, values):
+        """Return ``{field: {row: value}}`` for every cell that differs from values."""
+        changes = {}
+        for field, field_id in self.fields.items():
+            before = values.get(field)
+            if before is None:
+                cells = {row: value for row, value in enumerate(self.columns[field_id]) if value is not None}
+            else:
+                cells = {
+                    row: value
+                    for row, (value, old) in enumerate(zip(self.columns[field_id], before))
+                    if value != old
+                }
+            if cells:
+                changes[field] = cells
+        return changes
+
+    def apply_changes(self, changes):
+        """Write cells returned by changes."""
+        for field, cells in changes.items():
+            column = self.column(field)
+            for row, value in cells.items():
+                column[row] = value
+
+    def as_dict(self):
+        """Return the table as plain nested dicts for storage."""
+        return {key: dict(state) for key, state in self.items()}
+
+
+class DeviceState(MutableMapping):
+    """Mapping view onto one row of a DeviceStateTable."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, field):
+        field_id = self._table.fields.get(field)
+        if field_id is None:
+            raise KeyError(field)
+        value = self._table.columns[field_id][self._row]
+        if value is None:
+            raise KeyError(field)
+        return value
+
+    def get(self, field, default=None):
+        field_id = self._table.fields.get(field)
+        if field_id is None:
+            return default
+        value = self._table.columns[field_id][self._row]
+        return default if value is None else value
+
+    def __setitem__(self, field, value):
+        self._table.column(field)[self._row] = value
+
+    def __delitem__(self, field):
+        if field not in self:
+            raise KeyError(field)
+        self._table.columns[self._table.fields[field]][self._row] = None
+
+    def __iter__(self):
+        row = self._row
+        columns = self._table.columns
+        for field, field_id in self._table.fields.items():
+            if columns[field_id][row] is not None:
+                yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"DeviceState({dict(self)!r})"
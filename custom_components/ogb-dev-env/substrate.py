@@ -0,0 +1,160 @@
+"""Substrate water balance for OGB Dev Environment."""
+from math import exp
+
+SUBSTRATE_DEFAULTS = {
+    "volume": 11.0,  # L of growing medium
+    "moisture": 55.0,  # % volumetric water content at start
+    "ec": 1.2,  # mS/cm of the pore water at start
+    "saturation": 75.0,  # % where irrigation runs off
+    "field_capacity": 60.0,  # % above which water drains
+    "stress": 35.0,  # % below which uptake is limited
+    "wilting": 15.0,  # % where uptake stops
+    "drain_time": 900.0,  # s time constant of drainage above field capacity
+    "uptake_ratio": 0.7,  # pore water concentration taken up with water
+    "evaporation": 0.01,  # L/h per kPa of VPD from the surface
+    "prefix": "substrate",
+}
+
+IRRIGATION_DEFAULTS = {
+    "switch": "power",
+    "flow": 2.0,  # L/h while switched on
+    "reservoir": None,  # reservoir the emitter draws from
+    "ec": 0.0,  # mS/cm of the water when no reservoir feeds it
+}
+
+
+class Substrate:
+    """Water and salt balance of one substrate volume.
+
+    Water enters from irrigation, leaves through drainage above field
+    capacity, surface evaporation and plant uptake limited by water
+    stress. Salt is tracked as EC times litres, so pore water EC rises
+    during dry-back and is flushed by drain-to-waste.
+    """
+
+    __slots__ = (
+        "key", "prefix", "volume", "water", "salt", "saturation",
+        "field_capacity", "stress", "wilting", "drain_time", "uptake_ratio",
+        "evaporation", "emitters", "flows", "sources", "source_ec",
+        "drained", "_gates",
+    )
+
+    def __init__(self, key, config, catalog):
+        params = {**SUBSTRATE_DEFAULTS, **config}
+        self.key = key
+        self.prefix = params["prefix"]
+        self.volume = float(params["volume"])
+        self.water = self.volume * float(params["moisture"]) / 100
+        self.salt = self.water * float(params["ec"])
+        self.saturation = self.volume * float(params["saturation"]) / 100
+        self.field_capacity = self.volume * float(params["field_capacity"]) / 100
+        self.stress = self.volume * float(params["stress"]) / 100
+        self.wilting = self.volume * float(params["wilting"]) / 100
+        self.drain_time = float(params["drain_time"])
+        self.uptake_ratio = float(params["uptake_ratio"])
+        self.evaporation = float(params["evaporation"])
+        self.drained = 0.0
+
+        # Emitters: (device key, gating field) of catalog irrigation blocks.
+        self.emitters = []
+        self.flows = []
+        self.sources = []
+        self.source_ec = []
+        for device_key, device_config in catalog.items():
+            irrigation = device_config.get("irrigation")
+            if not irrigation or irrigation.get("substrate", key) != key:
+                continue
+            emitter = {**IRRIGATION_DEFAULTS, **irrigation}
+            self.emitters.append((device_key, emitter["switch"]))
+            self.flows.append(float(emitter["flow"]))
+            self.sources.append(emitter["reservoir"])
+            self.source_ec.append(float(emitter["ec"]))
+        self._gates = None
+
+    def __getstate__(self):
+        """Drop the device table binding when shipped to a worker."""
+        return {
+            slot: None if slot == "_gates" else getattr(self, slot)
+            for slot in self.__slots__
+        }
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def as_dict(self):
+        """Return the state that changes while simulating."""
+        return {"water": self.water, "salt": self.salt}
+
+    def restore(self, data):
+        """Restore state saved with as_dict."""
+        self.water = float(data.get("water", self.water))
+        self.salt = float(data.get("salt", self.salt))
+
+    def bind(self, device_states):
+        """Resolve the table cells gating each emitter."""
+        self._gates = [
+            (device_states.column(field), device_states.index.get(device_key))
+            for device_key, field in self.emitters
+        ]
+
+    @property
+    def moisture(self):
+        """Return the volumetric water content in %."""
+        return self.water / self.volume * 100
+
+    @property
+    def ec(self):
+        """Return the pore water EC in mS/cm."""
+        return self.salt / self.water if self.water > 0 else 0.0
+
+    def demand(self, dt):
+        """Yield (emitter index, reservoir key, litres) for running emitters."""
+        for index, (column, row) in enumerate(self._gates):
+            if row is not None and column[row]:
+                yield index, self.sources[index], self.flows[index] * dt / 3600
+
+    def irrigate(self, liters, ec):
+        """Add irrigation water; anything above saturation runs off."""
+        if liters <= 0:
+            return
+        self.water += liters
+        self.salt += liters * ec
+        if self.water > self.saturation:
+            self._remove(self.water - self.saturation, 1.0)
+
+    def _remove(self, liters, ratio):
+        """Remove water carrying a fraction of the pore water salt."""
+        liters = min(liters, self.water)
+        if liters <= 0:
+            return 0.0
+        self.salt -= self.salt * liters / self.water * ratio
+        self.water -= liters
+        return liters
+
+    def step(self, dt, vpd, uptake):
+        """Advance the substrate by dt seconds.
+
+        uptake is the unstressed plant water demand in L/h. Returns the
+        litres taken up.
+        """
+        self._remove(self.evaporation * vpd * dt / 3600, 0.0)
+
+        if self.water <= self.wilting:
+            factor = 0.0
+        elif self.water >= self.stress:
+            factor = 1.0
+        else:
+            factor = (self.water - self.wilting) / (self.stress - self.wilting)
+        taken = self._remove(min(max(0.0, uptake) * factor * dt / 3600, self.water - self.wilting), self.uptake_ratio)
+
+        self.drained = 0.0
+        excess = self.water - self.field_capacity
+        if excess > 0:
+            self.drained = self._remove(excess * (1 - exp(-dt / self.drain_time)), 1.0)
+        return taken
+
+    def publish(self, environment):
+        """Write the substrate readings into the environment."""
+        environment[f"{self.prefix}_moisture"] = self.moisture
+        environment[f"{self.prefix}_ec"] = self.ec * 1000
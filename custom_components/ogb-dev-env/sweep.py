@@ -0,0 +1,218 @@
+"""Headless parameter sweeps over OGB Dev Environment scenarios.
+
+Runs every combination of season, tent profile, seed and device set of a
+sweep spec through the simulator on all cores, without Home Assistant:
+
+    python custom_components/ogb-dev-env/sweep.py spec.json --output runs.csv
+"""
+import csv
+import itertools
+import json
+import os
+import sys
+
+HEADLESS_PACKAGE = "ogb_dev_env_headless"
+
+SWEEP_DEFAULTS = {
+    "seasons": ["summer"],
+    "profiles": [None],  # tent profile names, None for the default tent
+    "seeds": [0],  # seeds, or {"count": n} for 0..n-1
+    "catalog": None,  # YAML/JSON device catalog file (see catalog.py), None for the bundled one
+    "device_sets": {"all": {}},  # name -> {"include": [...]} or {"exclude": [...]}
+    "steps": 2880,
+    "dt": 30,
+    "controllers": {},  # loop -> mode, target and gains (the policy under test)
+    "commands": {},  # device -> state fields set before the first step
+    "bands": {"air_temperature": [22.0, 26.0], "air_humidity": [55.0, 65.0]},
+}
+
+RESULT_FIELDS = ["run", "season", "profile", "seed", "device_set", "energy", "energy_cost"]
+
+
+def device_set(catalog, selection):
+    """Return the catalog restricted by an include or exclude list."""
+    if "include" in selection:
+        return {key: catalog[key] for key in selection["include"] if key in catalog}
+    excluded = set(selection.get("exclude", []))
+    return {key: config for key, config in catalog.items() if key not in excluded}
+
+
+def scenarios(spec):
+    """Expand a sweep spec into one scenario dict per run."""
+    params = {**SWEEP_DEFAULTS, **spec}
+    seeds = params["seeds"]
+    if isinstance(seeds, dict):
+        seeds = range(int(seeds["count"]))
+    combinations = itertools.product(params["seasons"], params["profiles"], seeds, params["device_sets"].items())
+    for run, (season, profile, seed, (set_name, selection)) in enumerate(combinations):
+        yield {
+            "run": run,
+            "season": season,
+            "profile": profile,
+            "seed": seed,
+            "device_set": set_name,
+            "selection": selection,
+            "catalog": params["catalog"],
+            "steps": int(params["steps"]),
+            "dt": float(params["dt"]),
+            "controllers": params["controllers"],
+            "commands": params["commands"],
+            "bands": params["bands"],
+        }
+
+
+def run_scenario(scenario, policy=None):
+    """Run one scenario and return its summary statistics.
+
+    ``policy(environment, device_states, clock)`` may issue commands
+    before every step; see run_steps for the statistics.
+    """
+    from .catalog import load_catalog
+    from .devices import TEST_DEVICES
+    from .environment import EnvironmentSimulator
+    from .state import DeviceStateTable
+
+    catalog = TEST_DEVICES
+    if scenario["catalog"]:
+        catalog = load_catalog(scenario["catalog"])
+        if catalog is None:
+            raise ValueError(f"No device catalog at {scenario['catalog']}")
+    catalog = device_set(catalog, scenario["selection"])
+    simulator = EnvironmentSimulator(catalog, seed=scenario["seed"], profile=scenario["profile"])
+    simulator.set_season(scenario["season"])
+    for loop, params in scenario["controllers"].items():
+        if loop in simulator.controllers.controllers:
+            simulator.set_controller(loop, **params)
+    device_states = DeviceStateTable(catalog)
+    for device_key, state in scenario["commands"].items():
+        if device_key in device_states:
+            device_states.view(device_key).update(state)
+
+    result = {field: scenario[field] for field in RESULT_FIELDS[:5]}
+    result.update(run_steps(simulator, device_states, scenario["steps"], scenario["dt"], scenario["bands"], policy))
+    return result
+
+
+def run_steps(simulator, device_states, steps, dt, bands, policy=None, weather_data=None):
+    """Advance a simulator and score the run against bands.
+
+    Returns the energy use and cost and, per band key, the fraction of
+    time in band, the largest excursion outside it and the mean.
+    """
+    bands = [(key, float(low), float(high)) for key, (low, high) in bands.items()]
+    in_band = [0.0] * len(bands)
+    excursion = [0.0] * len(bands)
+    total = [0.0] * len(bands)
+    environment = simulator.environment
+    for _ in range(steps):
+        if policy is not None:
+            policy(environment, device_states, simulator.clock)
+        simulator.update_environment(device_states, weather_data, dt)
+        for index, (key, low, high) in enumerate(bands):
+            value = environment.get(key)
+            if value is None:
+                continue
+            total[index] += value
+            if value < low:
+                excursion[index] = max(excursion[index], low - value)
+            elif value > high:
+                excursion[index] = max(excursion[index], value - high)
+            else:
+                in_band[index] += 1
+
+    steps = max(1, steps)
+    result = {"energy": environment.get("energy"), "energy_cost": environment.get("energy_cost")}
+    for index, (key, _, _) in enumerate(bands):
+        result[f"{key}_in_band"] = in_band[index] / steps
+        result[f"{key}_max_excursion"] = excursion[index]
+        result[f"{key}_mean"] = total[index] / steps
+    return result
+
+
+def bootstrap_headless(directory):
+    """Make the simulator modules importable without the integration."""
+    import importlib.machinery
+    import importlib.util
+
+    # The directory itself must not shadow standard modules (select.py).
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path or os.curdir) != directory]
+    if HEADLESS_PACKAGE not in sys.modules:
+        package = importlib.util.module_from_spec(
+            importlib.machinery.ModuleSpec(HEADLESS_PACKAGE, None, is_package=True)
+        )
+        package.__path__ = [directory]
+        sys.modules[HEADLESS_PACKAGE] = package
+
+
+def run_sweep(spec, workers=None, policy=None):
+    """Fan a sweep out over worker processes; yields results as runs finish.
+
+    ``policy`` must be a module-level function so it can reach the
+    workers.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from .catalog import load_catalog
+
+    if spec.get("catalog"):
+        # Validate and compile once here; every worker then reads the cache.
+        load_catalog(spec["catalog"])
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, mp_context=context) as executor:
+        futures = [executor.submit(run_scenario, scenario, policy) for scenario in scenarios(spec)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(results):
+    """Return the mean of every numeric statistic over all runs."""
+    totals = {}
+    for result in results:
+        for key, value in result.items():
+            if key not in RESULT_FIELDS[:5] and isinstance(value, (int, float)):
+                totals.setdefault(key, []).append(value)
+    return {key: sum(values) / len(values) for key, values in totals.items()}
+
+
+def main(argv=None):
+    """Run a sweep spec (JSON) and stream one CSV row per run."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run an OGB Dev Environment parameter sweep.")
+    parser.add_argument("spec", help="JSON sweep spec")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default=None, help="CSV file for per-run results (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with open(args.spec, encoding="utf-8") as file:
+        spec = json.load(file)
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    results = []
+    try:
+        writer = None
+        for result in run_sweep(spec, workers=args.workers):
+            if writer is None:
+                writer = csv.DictWriter(output, fieldnames=list(result))
+                writer.writeheader()
+            writer.writerow(result)
+            output.flush()
+            results.append(result)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    for key, value in summarize(results).items():
+        print(f"{key}: {value:.4f}", file=sys.stderr)
+    return 0
+
+
+if not __package__:
+    # Run as a script (or re-run as __mp_main__ in a spawned worker): load
+    # this directory as a package, skipping the Home Assistant integration
+    # in __init__.py.
+    bootstrap_headless(os.path.dirname(os.path.abspath(__file__)))
+    if __name__ == "__main__":
+        import importlib
+
+        sys.exit(importlib.import_module(f"{HEADLESS_PACKAGE}.sweep").main())
@@ -5,11 +5,11 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from .const import DOMAIN
+from .writer import async_schedule_write
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
-from .devices import TEST_DEVICES
 from . import OGBDevRestoreEntity
 
 
@@ -17,7 +17,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     """Set up OGB Dev switches."""
     entities = []
 
-    for device_key, device_config in TEST_DEVICES.items():
+    for device_key, device_config in hass.data[DOMAIN][entry.entry_id]["devices"].items():
         if device_config.get("type") in ["Exhaust", "Intake", "Air Sensor"]:
             continue
         if device_config.get("type") == "Sensor" and device_config.get("device_id") != "devco2device":
@@ -47,6 +47,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             )
             entities.append(switch)
 
+    data_entry = hass.data[DOMAIN][entry.entry_id]
+    data_entry.setdefault("entities", []).extend(entities)
+
     if entities:
         async_add_entities(entities)
 
@@ -120,8 +123,7 @@ class OGBDevSwitch(OGBDevRestoreEntity, SwitchEntity):
             await self._state_manager.set_device_state(self._linked_light, "power", is_on)
         
         self._attr_is_on = is_on
-        self._hass.states.async_set(self.entity_id, "on" if is_on else "off")
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     @property
     def is_on(self):
@@ -132,24 +134,24 @@ class OGBDevSwitch(OGBDevRestoreEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
+        correlation_id = self._correlation_id()
         key = self._pump_key or "power"
-        await self._state_manager.set_device_state(self._device_key, key, True)
+        await self._state_manager.set_device_state(self._device_key, key, True, correlation_id)
         
         if self._linked_light:
-            await self._state_manager.set_device_state(self._linked_light, "power", True)
+            await self._state_manager.set_device_state(self._linked_light, "power", True, correlation_id)
         
         self._attr_is_on = True
-        self._hass.states.async_set(self.entity_id, "on")
-        self.async_write_ha_state()
+        async_schedule_write(self)
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
+        correlation_id = self._correlation_id()
         key = self._pump_key or "power"
-        await self._state_manager.set_device_state(self._device_key, key, False)
+        await self._state_manager.set_device_state(self._device_key, key, False, correlation_id)
         
         if self._linked_light:
-            await self._state_manager.set_device_state(self._linked_light, "power", False)
+            await self._state_manager.set_device_state(self._linked_light, "power", False, correlation_id)
         
         self._attr_is_on = False
-        self._hass.states.async_set(self.entity_id, "off")
-        self.async_write_ha_state()
+        async_schedule_write(self)
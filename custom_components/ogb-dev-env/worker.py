@@ -0,0 +1,107 @@
+"""Process pool for OGB Dev Environment simulation steps."""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+# Zones resident in this worker process: zone id -> (simulator, device table).
+_ZONES = {}
+
+
+def load_zone(zone_id, simulator, device_states):
+    """Make a zone's simulator and device table resident in the worker."""
+    _ZONES[zone_id] = (simulator, device_states)
+
+
+def fetch_zone(zone_id):
+    """Return a zone's resident simulator."""
+    return _ZONES[zone_id][0]
+
+
+def drop_zone(zone_id):
+    """Forget a zone's resident simulator."""
+    _ZONES.pop(zone_id, None)
+
+
+def run_simulation_steps(zone_id, values, weather_data, steps, dt):
+    """Advance a resident simulator on the given device states.
+
+    Returns the simulator's outputs and the table cells the steps
+    changed (actuator outputs, re-asserted stuck relays).
+    """
+    simulator, device_states = _ZONES[zone_id]
+    device_states.load_values(values)
+    for _ in range(steps):
+        simulator.update_environment(device_states, weather_data, dt)
+    return simulator.outputs(), device_states.changes(values)
+
+
+class SimulationWorkerPool:
+    """Shards zones across single-process executors.
+
+    Every zone is pinned to one shard, so its steps stay ordered while
+    different zones run on different cores. The simulator stays resident
+    in its shard: a step ships the device table's columns in and the
+    simulator's outputs and changed table cells back. The whole simulator
+    only travels when the event loop changes it (load) or needs all of
+    its state (fetch).
+    """
+
+    def __init__(self, workers=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        context = multiprocessing.get_context("spawn")
+        # Executors start their process lazily, so idle shards cost nothing.
+        self._shards = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context)
+            for _ in range(self.workers)
+        ]
+        self._zones = {}
+        self._load = [0] * self.workers
+
+    @property
+    def zones(self):
+        """Return the zones currently assigned to a shard."""
+        return list(self._zones)
+
+    def acquire(self, zone_id):
+        """Assign a zone to the least loaded shard."""
+        if zone_id not in self._zones:
+            shard = self._load.index(min(self._load))
+            self._zones[zone_id] = shard
+            self._load[shard] += 1
+            _LOGGER.debug(f"Assigned zone {zone_id} to simulation worker {shard}")
+        return self._zones[zone_id]
+
+    def release(self, zone_id):
+        """Remove a zone from its shard."""
+        shard = self._zones.pop(zone_id, None)
+        if shard is not None:
+            self._load[shard] -= 1
+            self._shards[shard].submit(drop_zone, zone_id)
+
+    async def async_load(self, hass, zone_id, simulator, device_states):
+        """Make a zone's simulator resident on its shard."""
+        shard = self._shards[self.acquire(zone_id)]
+        # The executor pickles its arguments later, on its own thread, while
+        # commands may still change the live table on the event loop.
+        await hass.loop.run_in_executor(shard, load_zone, zone_id, simulator, device_states.copy())
+
+    async def async_fetch(self, hass, zone_id):
+        """Return a copy of a zone's resident simulator."""
+        shard = self._shards[self.acquire(zone_id)]
+        return await hass.loop.run_in_executor(shard, fetch_zone, zone_id)
+
+    async def async_run(self, hass, zone_id, device_states, weather_data, steps, dt):
+        """Run simulation steps for a resident zone; returns its outputs and table changes."""
+        shard = self._shards[self.acquire(zone_id)]
+        return await hass.loop.run_in_executor(
+            shard, run_simulation_steps, zone_id, device_states.values(), weather_data, steps, dt
+        )
+
+    def shutdown(self):
+        """Stop all worker processes."""
+        for shard in self._shards:
+            shard.shutdown(wait=False, cancel_futures=True)
+        self._zones.clear()
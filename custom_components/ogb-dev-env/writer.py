@@ -0,0 +1,101 @@
+"""Coalesced entity state writes for OGB Dev Environment."""
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+
+class StateWriter:
+    """Single write path from a zone's entities to the state machine.
+
+    Entities queue themselves instead of writing; each flush window then
+    writes every queued entity once, however often it was queued, so a
+    burst of commands costs one state-changed event per entity. An
+    entity may also be limited to one write per ``interval`` seconds;
+    its latest state is written when the interval has passed, so no
+    final state is lost.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float = 0.0, interval: float = 0.0):
+        self.hass = hass
+        self.window = window
+        self.interval = interval
+        self.requested = 0
+        self.written = 0
+        self.dropped = 0  # queued for entities removed before the flush
+        self._pending = {}  # entity -> minimum seconds between its writes
+        self._last_write = {}
+        self._handle = None
+
+    @property
+    def coalesced(self):
+        """Return how many queued writes were merged into another write."""
+        return self.requested - self.written - self.dropped - len(self._pending)
+
+    @callback
+    def schedule(self, entity, interval: float | None = None):
+        """Queue a state write of an entity."""
+        self.requested += 1
+        self._pending[entity] = self.interval if interval is None else interval
+        if self._handle is None:
+            self._arm(self.window)
+
+    @callback
+    def _arm(self, delay):
+        """Schedule the next flush."""
+        if delay > 0:
+            self._handle = self.hass.loop.call_later(delay, self.flush)
+        else:
+            self._handle = self.hass.loop.call_soon(self.flush)
+
+    @callback
+    def flush(self, force: bool = False):
+        """Write every queued entity whose rate limit allows it."""
+        self._handle = None
+        now = time.monotonic()
+        pending = self._pending
+        self._pending = {}
+        wait = None
+        for entity, interval in pending.items():
+            if entity.hass is None:
+                self.dropped += 1
+                continue
+            due = self._last_write.get(entity, 0.0) + interval
+            if not force and due > now:
+                self._pending[entity] = interval
+                wait = due - now if wait is None else min(wait, due - now)
+                continue
+            self._last_write[entity] = now
+            self.written += 1
+            entity.async_write_ha_state()
+        if wait is not None:
+            self._arm(max(wait, self.window))
+
+    @callback
+    def async_shutdown(self):
+        """Write all queued states now and stop flushing."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self.flush(force=True)
+        self._last_write.clear()
+
+    def as_dict(self):
+        """Return the write counters."""
+        return {
+            "requested": self.requested,
+            "written": self.written,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+
+@callback
+def async_schedule_write(entity, interval: float | None = None):
+    """Queue an entity's state write through its zone's writer."""
+    data_entry = entity.hass.data.get(DOMAIN, {}).get(entity.platform.config_entry.entry_id)
+    writer = data_entry.get("state_writer") if isinstance(data_entry, dict) else None
+    if writer is None:
+        entity.async_write_ha_state()
+    else:
+        writer.schedule(entity, interval)
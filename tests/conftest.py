@@ -0,0 +1,22 @@
+"""Shared fixtures: the simulator modules, imported without Home Assistant."""
+import importlib
+import importlib.util
+import os
+
+import pytest
+
+COMPONENT = os.path.join(os.path.dirname(__file__), "..", "custom_components", "ogb-dev-env")
+
+
+def _headless(module):
+    """Import a simulator module without Home Assistant."""
+    spec = importlib.util.spec_from_file_location("ogb_dev_env_bootstrap", os.path.join(COMPONENT, "sweep.py"))
+    sweep = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sweep)
+    return importlib.import_module(f"{sweep.HEADLESS_PACKAGE}.{module}")
+
+
+@pytest.fixture(scope="session")
+def headless():
+    """Return a function importing a simulator module by name."""
+    return _headless
@@ -0,0 +1,68 @@
+"""Calibration against a synthetic grow log."""
+import random
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def synthetic_log(headless):
+    """Log 3000 steps of a 150x150x200 tent driven by random device states."""
+    devices = headless("devices")
+    environment = headless("environment")
+    state = headless("state")
+
+    table = state.DeviceStateTable(devices.TEST_DEVICES)
+    simulator = environment.EnvironmentSimulator(devices.TEST_DEVICES, seed=3, profile="150x150x200", spatial={})
+    rng = random.Random(1)
+    columns = [
+        "heater.power", "exhaust.power", "exhaust.percentage", "intake.power", "intake.percentage",
+        "humidifier.power", "light_main.power", "light_main.intensity",
+    ]
+    rows = []
+    for step in range(3000):
+        if step % 20 == 0:
+            for column in columns:
+                device_key, field = column.split(".")
+                table.set(device_key, field, rng.random() < 0.5 if field == "power" else rng.choice([30, 60, 100]))
+        env = simulator.environment
+        row = {
+            "timestamp": simulator.clock,
+            "air_temperature": env["air_temperature"],
+            "air_humidity": env["air_humidity"],
+            "outside_temperature": simulator.outside_temp,
+            "outside_humidity": simulator.outside_hum,
+            "room_temperature": simulator.room_temp,
+            "co2_level": env["co2_level"],
+        }
+        row.update({column: table.get(*column.split(".")) for column in columns})
+        rows.append({key: str(value) for key, value in row.items()})
+        simulator.update_environment(table, dt=30)
+    return rows
+
+
+def test_fit_recovers_tent_coefficients(headless, synthetic_log):
+    """Fitting from the default tent finds the logged tent's coefficients."""
+    calibration = headless("calibration")
+    truth = headless("profiles").tent_coefficients("150x150x200")
+
+    coefficients, report = calibration.fit(synthetic_log, "120x120x200")
+
+    for key in ("heat_per_watt", "insulation", "exchange_per_m3h", "drying_per_m3h", "humidity_per_gram"):
+        assert coefficients[key] == pytest.approx(truth[key], rel=0.06), key
+    assert report["temperature_rmse_after"] < report["temperature_rmse_before"]
+    assert report["humidity_rmse_after"] < report["humidity_rmse_before"]
+    assert report["skipped"] == 0
+
+
+def test_fit_skips_gaps(headless, synthetic_log):
+    """Rows with blank required cells are skipped and counted."""
+    calibration = headless("calibration")
+    rows = [dict(row) for row in synthetic_log]
+    rows[100]["air_temperature"] = ""
+    rows[200]["outside_humidity"] = ""
+
+    _, report = calibration.fit(rows, "120x120x200")
+
+    # Row 100 breaks the steps into and out of it; row 200 only its own.
+    assert report["skipped"] == 3
+    assert report["steps"] == len(rows) - 1 - 3
@@ -0,0 +1,54 @@
+"""Loading, validating and caching device catalog files."""
+import json
+
+import pytest
+
+
+def _write(tmp_path, spec, name="devices.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(spec) if not isinstance(spec, str) else spec, encoding="utf-8")
+    return str(path)
+
+
+def test_bundled_catalog_is_valid(headless):
+    catalog = headless("catalog")
+    catalog.validate(catalog.expand({"builtin": True}))
+
+
+@pytest.mark.parametrize("text", ["[]", "- a\n- b\n", "42"])
+def test_top_level_must_be_a_mapping(headless, tmp_path, text):
+    catalog = headless("catalog")
+    name = "devices.json" if text != "- a\n- b\n" else "devices.yaml"
+    with pytest.raises(ValueError, match="mapping"):
+        catalog.load_catalog(_write(tmp_path, text, name), str(tmp_path))
+
+
+@pytest.mark.parametrize("block, value, message", [
+    ("reservoir", {"capacity": "big"}, "reservoir.capacity"),
+    ("reservoir", {"substrate": "nowhere"}, "reservoir.substrate"),
+    ("reservoir", {"dosed": {"feedpump_a": "lots"}}, "reservoir.dosed"),
+    ("substrate", {"volme": 10}, "unknown key 'volme'"),
+    ("dosing", {"reservoir": "water_pump", "channels": {"feedpump_a": {"flw": 1}}}, "dosing.channels"),
+    ("dosing", {"channels": {}}, "dosing.reservoir"),
+    ("irrigation", {"substrate": "sensor_main", "reservoir": "feed"}, "irrigation.reservoir"),
+    ("irrigation", {"substrate": "sensor_main", "switch": 3}, "state field"),
+    ("cell", 3, "cell"),
+])
+def test_model_blocks_are_validated(headless, block, value, message):
+    catalog = headless("catalog")
+    devices = catalog.expand({"builtin": True})
+    devices["exhaust"][block] = value
+    with pytest.raises(ValueError, match=message):
+        catalog.validate(devices)
+
+
+def test_cache_follows_the_bundled_catalog(headless, tmp_path, monkeypatch):
+    """A builtin-based cache is rebuilt when the bundled devices change."""
+    catalog = headless("catalog")
+    path = _write(tmp_path, {"builtin": True})
+    assert "exhaust" in catalog.load_catalog(path, str(tmp_path))
+
+    bundled = {key: config for key, config in catalog.TEST_DEVICES.items() if key != "exhaust"}
+    monkeypatch.setattr(catalog, "TEST_DEVICES", bundled)
+    assert "exhaust" not in catalog.load_catalog(path, str(tmp_path))
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
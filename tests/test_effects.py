@@ -0,0 +1,54 @@
+"""The sparse device effect matrix."""
+import pytest
+
+CATALOG = {
+    "heater": {"state": {"power": False}, "effects": {"heat": 600}},
+    "light": {"state": {"power": False, "intensity": 50}, "effects": {"heat": 100, "co2": -1.5, "level": "intensity"}},
+    "pump": {"state": {"dripper": False}, "effects": {"water": 4.0, "switch": "dripper"}},
+    "fan": {"state": {"power": False}, "effects": {"exhaust": 200}, "actuator": {"watts": 40}},
+    "probe": {"state": {"power": True}},
+}
+
+
+@pytest.fixture
+def matrix(headless):
+    effects = headless("effects")
+    table = headless("state").DeviceStateTable(CATALOG)
+    matrix = effects.EffectMatrix(CATALOG)
+    matrix.bind(table)
+    return effects, matrix, table
+
+
+def test_columns(matrix):
+    _, matrix, _ = matrix
+    assert matrix.devices == ["heater", "light", "pump", "fan"]
+    assert [matrix.column(key) for key in ("heater", "fan", "probe")] == [0, 3, None]
+    assert matrix.switches == ["power", "power", "dripper", "output"]
+
+
+def test_product_matches_dense_sum(matrix):
+    effects, matrix, table = matrix
+    table.set("heater", "power", True)
+    table.set("light", "power", True)
+    table.set("pump", "dripper", True)
+    table.set("fan", "output", 25.0)
+    drive = matrix.update_drive()
+    assert list(drive) == [1.0, 0.5, 1.0, 25.0]
+
+    influence = matrix.multiply()
+    expected = [0.0] * len(effects.CHANNELS)
+    for column, key in enumerate(matrix.devices):
+        for name, value in CATALOG[key]["effects"].items():
+            if name in effects.CHANNELS:
+                expected[effects.CHANNELS[name]] += value * drive[column]
+    assert list(influence) == pytest.approx(expected)
+    assert matrix.value("light", effects.CO2) == -1.5
+    assert matrix.value("heater", effects.CO2) == 0.0
+
+
+def test_limits_cap_the_drive(matrix):
+    effects, matrix, table = matrix
+    table.set("heater", "power", True)
+    matrix.limits[matrix.column("heater")] = 0.0
+    matrix.update_drive()
+    assert matrix.multiply()[effects.HEAT] == 0.0
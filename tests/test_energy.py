@@ -0,0 +1,68 @@
+"""Fixed-point energy and tariff accounting."""
+from datetime import datetime, timezone
+
+TARIFF = {
+    "name": "standard",
+    "price": 0.30,
+    "periods": [
+        {"name": "peak", "price": 0.50, "start": "17:00", "end": "21:00", "days": [0, 1, 2, 3, 4]},
+        {"name": "night", "price": 0.10, "start": "22:00", "end": "06:00"},
+    ],
+}
+
+
+def _meter(headless, devices=("heater",)):
+    meter = headless("energy").EnergyMeter(devices, TARIFF)
+    meter.time_zone = timezone.utc
+    return meter
+
+
+def _clock(day, hour, minute=0):
+    """Return a timestamp in the week of Monday 2026-10-19, UTC."""
+    return datetime(2026, 10, 19 + day, hour, minute, tzinfo=timezone.utc).timestamp()
+
+
+def test_many_small_steps_add_up_exactly(headless):
+    """One kW for an hour in 0.1 s steps is exactly one kWh."""
+    meter = _meter(headless)
+    clock = _clock(0, 12)
+    for _ in range(36000):
+        meter.add([1000.0], 0.1, clock)
+    assert meter.energy == 1.0
+    assert meter.device_kwh("heater") == 1.0
+    assert meter.total_cost == 0.30
+
+
+def test_periods_follow_the_tariff(headless):
+    meter = _meter(headless)
+    for clock, name in (
+        (_clock(0, 18), "peak"),  # Monday evening
+        (_clock(5, 18), "standard"),  # Saturday evening is not peak
+        (_clock(1, 23, 30), "night"),
+        (_clock(2, 2), "night"),  # wraps past midnight
+        (_clock(2, 6), "standard"),
+    ):
+        meter.add([0.0], 1.0, clock)
+        assert meter.names[meter.period] == name, clock
+
+
+def test_cost_uses_the_price_of_each_period(headless):
+    meter = _meter(headless, ("heater", "light"))
+    meter.add([1000.0, 0.0], 3600.0, _clock(0, 18))
+    meter.add([0.0, 2000.0], 3600.0, _clock(0, 23))
+    environment = {}
+    meter.publish(environment)
+
+    assert environment["energy"] == 3.0
+    assert environment["energy_peak"] == 1.0 and environment["energy_night"] == 2.0
+    assert environment["energy_cost"] == 0.70
+    assert environment["energy_price"] == 0.10
+
+
+def test_restore_round_trips(headless):
+    meter = _meter(headless)
+    meter.add([123.4], 56.7, _clock(0, 18))
+    restored = _meter(headless)
+    restored.restore(meter.as_dict())
+    assert restored.as_dict() == meter.as_dict()
+    assert restored.total_cost == meter.total_cost
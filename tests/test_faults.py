@@ -0,0 +1,79 @@
+"""Fault scheduling and its effect on the bound models."""
+import pytest
+
+CATALOG = {
+    "heater": {"state": {"power": False}, "effects": {"heat": 600}},
+    "exhaust": {"state": {"power": False}, "effects": {"exhaust": 200}},
+    "probe": {"sensors": [{"name": "temperature", "source": "air_temperature", "model": {"sample_interval": 60}}]},
+}
+
+
+@pytest.fixture
+def models(headless):
+    effects = headless("effects").EffectMatrix(CATALOG)
+    sensors = headless("measurement").SensorBank(CATALOG, seed=1)
+    table = headless("state").DeviceStateTable(CATALOG)
+    engine = headless("faults").FaultEngine(CATALOG, effects, sensors, seed=1)
+    engine.bind(table)
+    return engine, effects, sensors, table
+
+
+def test_unknown_targets_are_rejected(models):
+    engine, *_ = models
+    with pytest.raises(ValueError, match="unknown device"):
+        engine.schedule(0.0, "stuck_relay", "nothing")
+    with pytest.raises(ValueError, match="unknown sensor"):
+        engine.schedule(0.0, "sensor_freeze", "probe.humidity")
+    with pytest.raises(ValueError, match="Unknown fault"):
+        engine.schedule(0.0, "meltdown", "heater")
+
+
+def test_heater_failure_needs_a_heat_effect(models):
+    engine, effects, _, _ = models
+    with pytest.raises(ValueError, match="heat effect"):
+        engine.schedule(0.0, "heater_failure", "exhaust")
+    engine.schedule(0.0, "heater_failure", "heater", duration=60)
+    engine.advance(0.0)
+    assert effects.limits == {effects.column("heater"): 0.0}
+    engine.advance(60.0)
+    assert effects.limits == {}
+
+
+def test_fault_starts_and_expires_on_the_clock(models):
+    engine, _, _, table = models
+    fault_id = engine.schedule(100.0, "stuck_relay", "heater", value=True, start=30, duration=60)
+    engine.advance(129.0)
+    assert not engine.is_stuck("heater", "power")
+
+    engine.advance(130.0)
+    assert engine.is_stuck("heater", "power")
+    assert table.get("heater", "power") is True
+    assert [fault["id"] for fault in engine.scheduled()["active"]] == [fault_id]
+
+    engine.advance(190.0)
+    assert not engine.is_stuck("heater", "power")
+    assert engine.scheduled() == {"active": [], "pending": []}
+
+
+def test_clear_removes_pending_and_active(models):
+    engine, *_ = models
+    active = engine.schedule(0.0, "stuck_relay", "heater")
+    pending = engine.schedule(0.0, "stuck_relay", "exhaust", start=600)
+    engine.advance(0.0)
+    engine.clear([active])
+    assert [fault["id"] for fault in engine.scheduled()["pending"]] == [pending]
+    assert engine.active == {}
+
+
+def test_spike_offsets_each_new_sample_once(models):
+    engine, _, sensors, _ = models
+    engine.schedule(0.0, "sensor_spike", "probe.temperature", value=5.0)
+    engine.advance(0.0)
+    published = []
+    for clock, temperature in ((0.0, 20.0), (30.0, 20.0), (60.0, 25.0), (90.0, 25.0)):
+        sensors.sample({"air_temperature": temperature}, 30.0, clock)
+        engine.apply_sensor_faults()
+        published.append(sensors.readings[0])
+
+    # The sample at 60 s equals the spiked value held before it and is still offset.
+    assert published == [25.0, 25.0, 30.0, 30.0]
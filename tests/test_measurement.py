@@ -0,0 +1,65 @@
+"""Significant-change filtering of sensor readings."""
+import random
+
+
+def _filter(headless, unit="°C", **significance):
+    measurement = headless("measurement")
+    return measurement.ChangeFilter(measurement.significance_rule({"unit": unit, "significance": significance}))
+
+
+def test_noise_is_suppressed(headless):
+    """A steady reading with noise below the threshold publishes at least 10x fewer states."""
+    change_filter = _filter(headless)
+    rng = random.Random(7)
+    samples = 720  # one hour at the 5 s poll interval
+    for index in range(samples):
+        change_filter.update(round(24.0 + rng.gauss(0, 0.05), 2), index * 5.0)
+
+    assert change_filter.published + change_filter.suppressed == samples
+    assert change_filter.published * 10 <= samples
+
+
+def test_significant_change_is_published(headless):
+    """A step larger than the threshold is published at once."""
+    change_filter = _filter(headless)
+    assert change_filter.update(24.0, 0.0) == 24.0
+    assert change_filter.update(24.1, 5.0) == 24.0
+    assert change_filter.update(24.5, 10.0) == 24.5
+    assert change_filter.published == 2
+
+
+def test_relative_threshold(headless):
+    """Relative rules scale with the last published value."""
+    change_filter = _filter(headless, unit="ppm")
+    change_filter.update(1000.0, 0.0)
+    assert change_filter.update(1015.0, 5.0) == 1000.0
+    assert change_filter.update(1025.0, 10.0) == 1025.0
+
+
+def test_heartbeat_republishes_unchanged_value(headless):
+    """After max_age the held value is published again, unchanged."""
+    change_filter = _filter(headless, max_age=60)
+    change_filter.update(24.0, 0.0)
+    change_filter.update(24.0, 59.0)
+    assert change_filter.published == 1
+
+    assert change_filter.update(24.0, 60.0) == 24.0
+    assert change_filter.published == 2
+    assert change_filter.published_at == 60.0
+
+
+def test_no_heartbeat_when_disabled(headless):
+    """A max_age of 0 never forces a publish."""
+    change_filter = _filter(headless, max_age=0)
+    change_filter.update(24.0, 0.0)
+    change_filter.update(24.0, 86400.0)
+    assert change_filter.published == 1
+
+
+def test_missing_readings_pass_through(headless):
+    """Dropouts and recoveries are always published."""
+    change_filter = _filter(headless)
+    change_filter.update(24.0, 0.0)
+    assert change_filter.update(None, 5.0) is None
+    assert change_filter.update(24.0, 10.0) == 24.0
+    assert change_filter.published == 3
@@ -0,0 +1,74 @@
+"""The struct-of-arrays device state table."""
+import pytest
+
+CATALOG = {
+    "light": {"state": {"power": False, "intensity": 20}},
+    "fan": {"state": {"power": True, "percentage": 50}},
+    "probe": {},
+}
+
+
+@pytest.fixture
+def table(headless):
+    return headless("state").DeviceStateTable(CATALOG)
+
+
+def test_rows_and_columns_come_from_the_catalog(table):
+    assert len(table) == 3
+    assert "fan" in table and "pump" not in table
+    assert table.get("light", "intensity") == 20
+    assert table.get("fan", "intensity") is None
+    assert table.get("probe", "power", default=False) is False
+    assert table.as_dict() == {
+        "light": {"power": False, "intensity": 20},
+        "fan": {"power": True, "percentage": 50},
+        "probe": {},
+    }
+
+
+def test_set_adds_columns(table):
+    table.set("probe", "output", 12.5)
+    assert table.get("probe", "output") == 12.5
+    assert table.column("output") == [None, None, 12.5]
+    with pytest.raises(KeyError):
+        table.set("pump", "power", True)
+
+
+def test_view_is_a_mapping_onto_one_row(table):
+    view = table.view("light")
+    assert dict(view) == {"power": False, "intensity": 20}
+    view["intensity"] = 80
+    view.update({"power": True})
+    assert table.get("light", "intensity") == 80 and table.get("light", "power") is True
+    del view["intensity"]
+    assert "intensity" not in view and len(view) == 1
+    with pytest.raises(KeyError):
+        view["percentage"]
+
+
+def test_copy_is_independent(table):
+    copy = table.copy()
+    copy.set("light", "power", True)
+    copy.set("fan", "output", 50.0)
+    assert table.get("light", "power") is False
+    assert "output" not in table.fields
+
+
+def test_load_values_keeps_bound_columns(table):
+    bound = table.column("intensity")
+    values = table.values()
+    values["intensity"][0] = 90
+    table.load_values(values)
+    assert bound[0] == 90 and table.column("intensity") is bound
+
+
+def test_changes_round_trip(table, headless):
+    shipped = table.values()
+    stepped = headless("state").DeviceStateTable(CATALOG)
+    stepped.load_values(shipped)
+    stepped.set("fan", "percentage", 75)
+    stepped.set("light", "output", 20.0)
+
+    assert stepped.changes(shipped) == {"percentage": {1: 75}, "output": {0: 20.0}}
+    table.apply_changes(stepped.changes(shipped))
+    assert table.as_dict() == stepped.as_dict()
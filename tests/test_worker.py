@@ -0,0 +1,61 @@
+"""Process-mode stepping against a simulator resident in the worker."""
+import pickle
+
+
+def _shipped(value):
+    """Return a value as it arrives on the other side of the executor pipe."""
+    return pickle.loads(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_resident_steps_match_local_steps(headless):
+    """Outputs and table changes returned per step reproduce a local run."""
+    devices = headless("devices")
+    environment = headless("environment")
+    state = headless("state")
+    worker = headless("worker")
+
+    local = environment.EnvironmentSimulator(devices.TEST_DEVICES, seed=5)
+    local_table = state.DeviceStateTable(devices.TEST_DEVICES)
+    mirror, table = _shipped(local), _shipped(local_table)
+    for simulator in (local, mirror):
+        simulator.inject_fault("stuck_relay", "heater", value=True)
+    worker.load_zone("zone", _shipped(mirror), _shipped(table.copy()))
+
+    for step in range(40):
+        if step == 10:
+            for device_states in (local_table, table):
+                device_states.set("light_main", "power", True)
+                device_states.set("exhaust", "power", True)
+                device_states.set("heater", "power", False)
+        local.update_environment(local_table, dt=30)
+        outputs, changes = _shipped(worker.run_simulation_steps("zone", _shipped(table.values()), None, 1, 30))
+        mirror.apply_outputs(outputs)
+        table.apply_changes(changes)
+
+    assert mirror.environment == local.environment
+    assert mirror.sensors.readings == local.sensors.readings
+    assert mirror.actuators.power == local.actuators.power
+    assert mirror.meter.device_energy == local.meter.device_energy
+    assert table.as_dict() == local_table.as_dict()
+    assert table.get("heater", "power") is True
+    assert table.get("exhaust", "output")
+
+    # A step ships the table's columns, not the simulator.
+    assert len(pickle.dumps(table.values())) * 10 < len(pickle.dumps(mirror))
+    worker.drop_zone("zone")
+
+
+def test_changes_keep_concurrent_commands(headless):
+    """Merging worker changes leaves cells the worker did not touch alone."""
+    devices = headless("devices")
+    state = headless("state")
+    table = state.DeviceStateTable(devices.TEST_DEVICES)
+    shipped = table.values()
+    stepped = table.copy()
+    stepped.set("exhaust", "output", 40.0)
+
+    table.set("light_main", "intensity", 80)  # a command during the step
+    table.apply_changes(stepped.changes(shipped))
+
+    assert table.get("exhaust", "output") == 40.0
+    assert table.get("light_main", "intensity") == 80